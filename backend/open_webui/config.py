@@ -4,6 +4,8 @@ import os
 import shutil
 import base64
 import redis
+import threading
+import time
 
 from datetime import datetime
 from pathlib import Path
@@ -224,10 +226,17 @@ class PersistentConfig(Generic[T]):
 
 
 class AppConfig:
+    """
+    Process-local config snapshot. When Redis is configured, writes are
+    published on a pub/sub channel and every node refreshes the changed key
+    from a background listener, so reads never touch Redis.
+    """
+
     _redis: Union[redis.Redis, redis.cluster.RedisCluster] = None
     _redis_key_prefix: str
 
     _state: dict[str, PersistentConfig]
+    _listener: Optional[threading.Thread] = None
 
     def __init__(
         self,
@@ -260,29 +269,73 @@ class AppConfig:
             if self._redis:
                 redis_key = f"{self._redis_key_prefix}:config:{key}"
                 self._redis.set(redis_key, json.dumps(self._state[key].value))
+                self._redis.publish(f"{self._redis_key_prefix}:config:updates", key)
 
     def __getattr__(self, key):
         if key not in self._state:
             raise AttributeError(f"Config key '{key}' not found")
 
-        # If Redis is available, check for an updated value
-        if self._redis:
-            redis_key = f"{self._redis_key_prefix}:config:{key}"
-            redis_value = self._redis.get(redis_key)
+        # Keys are registered before the first read, so the initial sync from
+        # Redis happens here and later changes arrive through the listener
+        if self._redis and self._listener is None:
+            self._start_listener()
 
-            if redis_value is not None:
-                try:
-                    decoded_value = json.loads(redis_value)
+        return self._state[key].value
+
+    def _start_listener(self):
+        listener = threading.Thread(
+            target=self._listen, name="app-config-listener", daemon=True
+        )
+        super().__setattr__("_listener", listener)
 
-                    # Update the in-memory value if different
-                    if self._state[key].value != decoded_value:
-                        self._state[key].value = decoded_value
-                        log.info(f"Updated {key} from Redis: {decoded_value}")
+        self._sync_from_redis()
+        listener.start()
 
-                except json.JSONDecodeError:
-                    log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+    def _listen(self):
+        channel = f"{self._redis_key_prefix}:config:updates"
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(channel)
 
-        return self._state[key].value
+                # Catch up on anything published while (re)connecting
+                self._sync_from_redis()
+
+                for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._sync_from_redis([message["data"]])
+            except Exception as e:
+                log.warning(f"Config update listener disconnected: {e}")
+                time.sleep(5)
+
+    def _sync_from_redis(self, keys: Optional[list[str]] = None):
+        keys = [key for key in (keys or list(self._state.keys())) if key in self._state]
+        if not keys:
+            return
+
+        try:
+            pipe = self._redis.pipeline()
+            for key in keys:
+                pipe.get(f"{self._redis_key_prefix}:config:{key}")
+            redis_values = pipe.execute()
+        except Exception as e:
+            log.error(f"Error loading config from Redis: {e}")
+            return
+
+        for key, redis_value in zip(keys, redis_values):
+            if redis_value is None:
+                continue
+
+            try:
+                decoded_value = json.loads(redis_value)
+
+                # Update the in-memory value if different
+                if self._state[key].value != decoded_value:
+                    self._state[key].value = decoded_value
+                    log.info(f"Updated {key} from Redis: {decoded_value}")
+
+            except json.JSONDecodeError:
+                log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
 
 
 ####################################
@@ -1029,6 +1082,28 @@ OLLAMA_API_CONFIGS = PersistentConfig(
     {},
 )
 
+# How requests are spread over Ollama connections serving the same model:
+# "least_outstanding", "weighted_round_robin" (uses "weight" from each
+# connection's API config), "latency" (EWMA of response time) or "random"
+OLLAMA_LOAD_BALANCING_POLICY = os.environ.get(
+    "OLLAMA_LOAD_BALANCING_POLICY", "least_outstanding"
+).lower()
+
+# Connections failing this many times in a row are skipped for a while
+try:
+    OLLAMA_BACKEND_MAX_FAILURES = int(
+        os.environ.get("OLLAMA_BACKEND_MAX_FAILURES", "3")
+    )
+except ValueError:
+    OLLAMA_BACKEND_MAX_FAILURES = 3
+
+try:
+    OLLAMA_BACKEND_EJECTION_TIME = float(
+        os.environ.get("OLLAMA_BACKEND_EJECTION_TIME", "30")
+    )
+except ValueError:
+    OLLAMA_BACKEND_EJECTION_TIME = 30.0
+
 ####################################
 # OPENAI_API
 ####################################
@@ -2736,6 +2811,53 @@ ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS = PersistentConfig(
     == "true",
 )
 
+# Keep a persistent BM25 index per collection on disk for hybrid search instead of
+# fetching every chunk from the vector database and rebuilding BM25 on each query.
+ENABLE_RAG_BM25_INDEX = (
+    os.environ.get("ENABLE_RAG_BM25_INDEX", "False").lower() == "true"
+)
+
+RAG_BM25_INDEX_DIR = os.environ.get("RAG_BM25_INDEX_DIR", f"{CACHE_DIR}/bm25")
+
+# Keep embeddings on disk keyed by engine, model, prefix and text hash so that
+# re-embedding unchanged chunks (reindexing, shared files, repeated queries) is
+# served from the cache. Once it holds more than the max entries, the oldest go
+# first; the default of 100000 is about 600 MB for 1536-dimension vectors. Set 0
+# for no limit.
+ENABLE_RAG_EMBEDDING_CACHE = (
+    os.environ.get("ENABLE_RAG_EMBEDDING_CACHE", "True").lower() == "true"
+)
+
+RAG_EMBEDDING_CACHE_DIR = os.environ.get(
+    "RAG_EMBEDDING_CACHE_DIR", f"{CACHE_DIR}/embeddings"
+)
+
+try:
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES = int(
+        os.environ.get("RAG_EMBEDDING_CACHE_MAX_ENTRIES", "100000")
+    )
+except ValueError:
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES = 100000
+
+# Knowledge reindex jobs checkpoint their progress and staged chunks here so that
+# an interrupted job can be resumed; each pipeline stage runs this many workers.
+RAG_REINDEX_DIR = os.environ.get("RAG_REINDEX_DIR", f"{CACHE_DIR}/reindex")
+
+RAG_REINDEX_CONCURRENCY = os.environ.get("RAG_REINDEX_CONCURRENCY", "4")
+try:
+    RAG_REINDEX_CONCURRENCY = max(int(RAG_REINDEX_CONCURRENCY), 1)
+except ValueError:
+    RAG_REINDEX_CONCURRENCY = 4
+
+# Maximum number of attached knowledge sources searched at the same time per request
+RAG_COLLECTION_SEARCH_CONCURRENCY = os.environ.get(
+    "RAG_COLLECTION_SEARCH_CONCURRENCY", "4"
+)
+try:
+    RAG_COLLECTION_SEARCH_CONCURRENCY = max(int(RAG_COLLECTION_SEARCH_CONCURRENCY), 1)
+except ValueError:
+    RAG_COLLECTION_SEARCH_CONCURRENCY = 4
+
 RAG_FULL_CONTEXT = PersistentConfig(
     "RAG_FULL_CONTEXT",
     "rag.full_context",
@@ -3089,6 +3211,29 @@ WEB_SEARCH_CONCURRENT_REQUESTS = PersistentConfig(
 )
 
 
+# Search engine responses are reused for WEB_SEARCH_CACHE_TTL seconds per engine
+# and query. Loaded pages are reused for WEB_LOADER_CACHE_TTL seconds, and are
+# revalidated with ETag/Last-Modified after that. A TTL of 0 disables the cache.
+RAG_WEB_CACHE_DIR = os.environ.get("RAG_WEB_CACHE_DIR", f"{CACHE_DIR}/web")
+
+try:
+    WEB_SEARCH_CACHE_TTL = int(os.environ.get("WEB_SEARCH_CACHE_TTL", "600"))
+except ValueError:
+    WEB_SEARCH_CACHE_TTL = 600
+
+try:
+    WEB_LOADER_CACHE_TTL = int(os.environ.get("WEB_LOADER_CACHE_TTL", "3600"))
+except ValueError:
+    WEB_LOADER_CACHE_TTL = 3600
+
+try:
+    WEB_LOADER_CACHE_MAX_ENTRIES = int(
+        os.environ.get("WEB_LOADER_CACHE_MAX_ENTRIES", "10000")
+    )
+except ValueError:
+    WEB_LOADER_CACHE_MAX_ENTRIES = 10000
+
+
 WEB_LOADER_ENGINE = PersistentConfig(
     "WEB_LOADER_ENGINE",
     "rag.web.loader.engine",
@@ -3750,6 +3895,22 @@ WHISPER_MULTILINGUAL = os.getenv("WHISPER_MULTILINGUAL", "False").lower() == "tr
 
 WHISPER_LANGUAGE = os.getenv("WHISPER_LANGUAGE", "").lower() or None
 
+# Streaming transcriptions decode the audio in chunks of this many seconds and
+# transcribe up to AUDIO_STT_STREAM_CONCURRENCY chunks at the same time.
+try:
+    AUDIO_STT_STREAM_CHUNK_SECONDS = max(
+        int(os.getenv("AUDIO_STT_STREAM_CHUNK_SECONDS", "60")), 5
+    )
+except ValueError:
+    AUDIO_STT_STREAM_CHUNK_SECONDS = 60
+
+try:
+    AUDIO_STT_STREAM_CONCURRENCY = max(
+        int(os.getenv("AUDIO_STT_STREAM_CONCURRENCY", "4")), 1
+    )
+except ValueError:
+    AUDIO_STT_STREAM_CONCURRENCY = 4
+
 # Add Deepgram configuration
 DEEPGRAM_API_KEY = PersistentConfig(
     "DEEPGRAM_API_KEY",
@@ -3921,6 +4082,24 @@ AUDIO_TTS_AZURE_SPEECH_OUTPUT_FORMAT = PersistentConfig(
     ),
 )
 
+# Generated speech is cached on disk up to AUDIO_TTS_CACHE_MAX_BYTES (0 means no
+# limit), evicting the least recently ("lru") or least frequently ("lfu") used
+# entries. With AUDIO_TTS_CACHE_SHARED, entries are also kept in the configured
+# storage provider so that other nodes can reuse them.
+try:
+    AUDIO_TTS_CACHE_MAX_BYTES = int(
+        os.getenv("AUDIO_TTS_CACHE_MAX_BYTES", str(1024 * 1024 * 1024))
+    )
+except ValueError:
+    AUDIO_TTS_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
+AUDIO_TTS_CACHE_EVICTION = os.getenv("AUDIO_TTS_CACHE_EVICTION", "lru").lower()
+
+AUDIO_TTS_CACHE_SHARED = (
+    os.getenv("AUDIO_TTS_CACHE_SHARED", "False").lower() == "true"
+    and STORAGE_PROVIDER != "local"
+)
+
 
 ####################################
 # LDAP
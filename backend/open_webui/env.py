@@ -341,6 +341,19 @@ if DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL is not None:
     except Exception:
         DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL = 0.0
 
+# Last active timestamps from authenticated requests are collected in memory and
+# written in one batch per interval (seconds). Set to 0 to write on every request.
+DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL = os.environ.get(
+    "DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL", "10"
+)
+
+try:
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL = float(
+        DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL
+    )
+except Exception:
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL = 10.0
+
 # When enabled, get_db_context reuses existing sessions; set to False to always create new sessions
 DATABASE_ENABLE_SESSION_SHARING = (
     os.environ.get("DATABASE_ENABLE_SESSION_SHARING", "False").lower() == "true"
@@ -361,6 +374,13 @@ ENABLE_REALTIME_CHAT_SAVE = (
 
 ENABLE_QUERIES_CACHE = os.environ.get("ENABLE_QUERIES_CACHE", "False").lower() == "true"
 
+# Store chat history messages as rows in the chat_message table instead of inline in
+# the chat JSON, so a single message update is a single-row write. Existing chats are
+# moved over lazily on their next write; reads work regardless of this setting.
+ENABLE_CHAT_MESSAGE_TABLE = (
+    os.environ.get("ENABLE_CHAT_MESSAGE_TABLE", "False").lower() == "true"
+)
+
 RAG_SYSTEM_CONTEXT = os.environ.get("RAG_SYSTEM_CONTEXT", "False").lower() == "true"
 
 ####################################
@@ -464,6 +484,23 @@ WEBUI_AUTH_SIGNOUT_REDIRECT_URL = os.environ.get(
     "WEBUI_AUTH_SIGNOUT_REDIRECT_URL", None
 )
 
+# Users resolved from tokens and API keys are cached per worker for this many
+# seconds (0 disables the cache). Changes to users, API keys and groups evict
+# entries right away, on other workers too when Redis is configured.
+AUTH_USER_CACHE_TTL = os.environ.get("AUTH_USER_CACHE_TTL", "30")
+
+try:
+    AUTH_USER_CACHE_TTL = float(AUTH_USER_CACHE_TTL)
+except Exception:
+    AUTH_USER_CACHE_TTL = 30.0
+
+AUTH_USER_CACHE_SIZE = os.environ.get("AUTH_USER_CACHE_SIZE", "10000")
+
+try:
+    AUTH_USER_CACHE_SIZE = int(AUTH_USER_CACHE_SIZE)
+except Exception:
+    AUTH_USER_CACHE_SIZE = 10000
+
 ####################################
 # WEBUI_SECRET_KEY
 ####################################
@@ -626,6 +663,50 @@ else:
         CHAT_STREAM_RESPONSE_CHUNK_MAX_BUFFER_SIZE = None
 
 
+# Event emitter updates (status, message, embeds, files, sources) are merged in memory
+# and written to the chat at most once per interval (seconds) or every N events.
+# Set the interval to 0 to write every event immediately.
+CHAT_EVENT_FLUSH_INTERVAL = os.environ.get("CHAT_EVENT_FLUSH_INTERVAL", "1")
+
+try:
+    CHAT_EVENT_FLUSH_INTERVAL = float(CHAT_EVENT_FLUSH_INTERVAL)
+except Exception:
+    CHAT_EVENT_FLUSH_INTERVAL = 1.0
+
+CHAT_EVENT_FLUSH_MAX_EVENTS = os.environ.get("CHAT_EVENT_FLUSH_MAX_EVENTS", "100")
+
+try:
+    CHAT_EVENT_FLUSH_MAX_EVENTS = int(CHAT_EVENT_FLUSH_MAX_EVENTS)
+except Exception:
+    CHAT_EVENT_FLUSH_MAX_EVENTS = 100
+
+# Note revisions from collaborative edits are inserted in batches once per interval
+# (seconds) or every N revisions. When the coalesce window (seconds) is set, edits
+# by the same author on the same note within the window are stored as one revision.
+NOTE_REVISION_FLUSH_INTERVAL = os.environ.get("NOTE_REVISION_FLUSH_INTERVAL", "1")
+
+try:
+    NOTE_REVISION_FLUSH_INTERVAL = float(NOTE_REVISION_FLUSH_INTERVAL)
+except Exception:
+    NOTE_REVISION_FLUSH_INTERVAL = 1.0
+
+NOTE_REVISION_FLUSH_MAX_REVISIONS = os.environ.get(
+    "NOTE_REVISION_FLUSH_MAX_REVISIONS", "100"
+)
+
+try:
+    NOTE_REVISION_FLUSH_MAX_REVISIONS = int(NOTE_REVISION_FLUSH_MAX_REVISIONS)
+except Exception:
+    NOTE_REVISION_FLUSH_MAX_REVISIONS = 100
+
+NOTE_REVISION_COALESCE_WINDOW = os.environ.get("NOTE_REVISION_COALESCE_WINDOW", "0")
+
+try:
+    NOTE_REVISION_COALESCE_WINDOW = float(NOTE_REVISION_COALESCE_WINDOW)
+except Exception:
+    NOTE_REVISION_COALESCE_WINDOW = 0.0
+
+
 ####################################
 # WEBSOCKET SUPPORT
 ####################################
@@ -667,6 +748,14 @@ try:
 except ValueError:
     WEBSOCKET_REDIS_LOCK_TIMEOUT = 60
 
+# Sessions of other workers read from Redis are cached locally for this many seconds
+WEBSOCKET_SESSION_CACHE_TTL = os.environ.get("WEBSOCKET_SESSION_CACHE_TTL", "30")
+
+try:
+    WEBSOCKET_SESSION_CACHE_TTL = float(WEBSOCKET_SESSION_CACHE_TTL)
+except ValueError:
+    WEBSOCKET_SESSION_CACHE_TTL = 30.0
+
 WEBSOCKET_SENTINEL_HOSTS = os.environ.get("WEBSOCKET_SENTINEL_HOSTS", "")
 WEBSOCKET_SENTINEL_PORT = os.environ.get("WEBSOCKET_SENTINEL_PORT", "26379")
 WEBSOCKET_SERVER_LOGGING = (
@@ -738,6 +827,42 @@ AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL", "True").lower() == "true"
 )
 
+# Tool server specs are fetched in the background and revalidated this often
+TOOL_SERVER_SPEC_REFRESH_INTERVAL = os.environ.get(
+    "TOOL_SERVER_SPEC_REFRESH_INTERVAL", "300"
+)
+
+try:
+    TOOL_SERVER_SPEC_REFRESH_INTERVAL = int(TOOL_SERVER_SPEC_REFRESH_INTERVAL)
+except ValueError:
+    TOOL_SERVER_SPEC_REFRESH_INTERVAL = 300
+
+# Pooled sessions for upstream model backends (Ollama, OpenAI, audio)
+ENABLE_AIOHTTP_CLIENT_SESSION_POOL = (
+    os.environ.get("ENABLE_AIOHTTP_CLIENT_SESSION_POOL", "True").lower() == "true"
+)
+
+try:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = int(
+        os.environ.get("AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST", "100")
+    )
+except Exception:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = 100
+
+try:
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT = float(
+        os.environ.get("AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT", "30")
+    )
+except Exception:
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT = 30.0
+
+try:
+    AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL = int(
+        os.environ.get("AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL", "300")
+    )
+except Exception:
+    AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL = 300
+
 
 ####################################
 # SENTENCE TRANSFORMERS
@@ -65,7 +65,10 @@ from open_webui.socket.main import (
     app as socket_app,
     periodic_usage_pool_cleanup,
     get_event_emitter,
+    flush_event_emitter,
     get_models_in_use,
+    CHAT_EVENT_BUFFER,
+    NOTE_REVISION_BUFFER,
 )
 from open_webui.routers import (
     audio,
@@ -449,6 +452,7 @@ from open_webui.config import (
     reset_config,
 )
 from open_webui.env import (
+    ENABLE_AIOHTTP_CLIENT_SESSION_POOL,
     ENABLE_CUSTOM_MODEL_FALLBACK,
     LICENSE_KEY,
     AUDIT_EXCLUDED_PATHS,
@@ -486,6 +490,7 @@ from open_webui.env import (
     AIOHTTP_CLIENT_SESSION_SSL,
     ENABLE_STAR_SESSIONS_MIDDLEWARE,
     ENABLE_PUBLIC_ACTIVE_USERS_COUNT,
+    TOOL_SERVER_SPEC_REFRESH_INTERVAL,
     # Admin Account Runtime Creation
     WEBUI_ADMIN_EMAIL,
     WEBUI_ADMIN_PASSWORD,
@@ -505,6 +510,8 @@ from open_webui.utils.chat import (
     chat_action as chat_action_handler,
 )
 from open_webui.utils.embeddings import generate_embeddings
+from open_webui.utils.filter import FilterChainCache
+from open_webui.utils.tools import ToolServerSpecRegistry
 from open_webui.utils.middleware import process_chat_payload, process_chat_response
 from open_webui.utils.access_control import has_access
 
@@ -516,7 +523,12 @@ from open_webui.utils.auth import (
     get_verified_user,
     create_admin_user,
 )
-from open_webui.utils.plugin import install_tool_and_function_dependencies
+from open_webui.utils.plugin import (
+    install_tool_and_function_dependencies,
+    redis_plugin_update_listener,
+)
+from open_webui.utils.session_pool import CLIENT_SESSION_POOL
+from open_webui.utils.user_cache import USER_ACTIVITY_BUFFER, redis_user_cache_listener
 from open_webui.utils.oauth import (
     get_oauth_client_info_with_dynamic_client_registration,
     encrypt_data,
@@ -617,12 +629,30 @@ async def lifespan(app: FastAPI):
         app.state.redis_task_command_listener = asyncio.create_task(
             redis_task_command_listener(app)
         )
+        app.state.redis_plugin_update_listener = asyncio.create_task(
+            redis_plugin_update_listener(app)
+        )
+        app.state.redis_user_cache_listener = asyncio.create_task(
+            redis_user_cache_listener(app)
+        )
 
     if THREAD_POOL_SIZE and THREAD_POOL_SIZE > 0:
         limiter = anyio.to_thread.current_default_thread_limiter()
         limiter.total_tokens = THREAD_POOL_SIZE
 
     asyncio.create_task(periodic_usage_pool_cleanup())
+    app.state.user_activity_flush = asyncio.create_task(USER_ACTIVITY_BUFFER.run())
+
+    if ENABLE_AIOHTTP_CLIENT_SESSION_POOL:
+        # Open long-lived sessions for the configured model backends up front
+        for url in [
+            *app.state.config.OLLAMA_BASE_URLS,
+            *app.state.config.OPENAI_API_BASE_URLS,
+        ]:
+            CLIENT_SESSION_POOL.get(url)
+
+    # Start loading tool server specs so the first chats find them ready
+    app.state.TOOL_SERVER_SPECS.get_servers(app.state.config.TOOL_SERVER_CONNECTIONS)
 
     if app.state.config.ENABLE_BASE_MODELS_CACHE:
         await get_all_models(
@@ -647,9 +677,23 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    await CHAT_EVENT_BUFFER.flush_all()
+    await NOTE_REVISION_BUFFER.flush_all()
+
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    if hasattr(app.state, "redis_plugin_update_listener"):
+        app.state.redis_plugin_update_listener.cancel()
+
+    if hasattr(app.state, "redis_user_cache_listener"):
+        app.state.redis_user_cache_listener.cancel()
+
+    app.state.user_activity_flush.cancel()
+    USER_ACTIVITY_BUFFER.flush()
+
+    await CLIENT_SESSION_POOL.close()
+
 
 app = FastAPI(
     title="Open WebUI",
@@ -726,6 +770,9 @@ app.state.OPENAI_MODELS = {}
 
 app.state.config.TOOL_SERVER_CONNECTIONS = TOOL_SERVER_CONNECTIONS
 app.state.TOOL_SERVERS = []
+app.state.TOOL_SERVER_SPECS = ToolServerSpecRegistry(
+    refresh_interval=TOOL_SERVER_SPEC_REFRESH_INTERVAL
+)
 
 ########################################
 #
@@ -844,10 +891,12 @@ app.state.EXTERNAL_PWA_MANIFEST_URL = EXTERNAL_PWA_MANIFEST_URL
 app.state.USER_COUNT = None
 
 app.state.TOOLS = {}
-app.state.TOOL_CONTENTS = {}
+app.state.TOOL_CACHE_KEYS = {}
+app.state.RESOLVED_TOOLS = {}
 
 app.state.FUNCTIONS = {}
-app.state.FUNCTION_CONTENTS = {}
+app.state.FUNCTION_CACHE_KEYS = {}
+app.state.FILTER_CHAINS = FilterChainCache()
 
 ########################################
 #
@@ -1668,9 +1717,10 @@ async def chat_completion(
                 "local:"
             ):  # temporary chats are not stored
 
-                # Verify chat ownership
-                chat = Chats.get_chat_by_id_and_user_id(metadata["chat_id"], user.id)
-                if chat is None and user.role != "admin":  # admins can access any chat
+                # Verify chat ownership, admins can access any chat
+                if user.role != "admin" and not Chats.is_chat_owned_by_user(
+                    metadata["chat_id"], user.id
+                ):
                     raise HTTPException(
                         status_code=status.HTTP_404_NOT_FOUND,
                         detail=ERROR_MESSAGES.DEFAULT(),
@@ -1771,6 +1821,11 @@ async def chat_completion(
                 except:
                     pass
         finally:
+            try:
+                await flush_event_emitter(metadata)
+            except Exception as e:
+                log.debug(f"Error flushing chat events: {e}")
+
             try:
                 if mcp_clients := metadata.get("mcp_clients"):
                     for client in reversed(mcp_clients.values()):
@@ -1858,8 +1913,7 @@ async def list_tasks_endpoint(request: Request, user=Depends(get_verified_user))
 async def list_tasks_by_chat_id_endpoint(
     request: Request, chat_id: str, user=Depends(get_verified_user)
 ):
-    chat = Chats.get_chat_by_id(chat_id)
-    if chat is None or chat.user_id != user.id:
+    if not Chats.is_chat_owned_by_user(chat_id, user.id):
         return {"task_ids": []}
 
     task_ids = await list_task_ids_by_item_id(request.app.state.redis, chat_id)
@@ -2117,7 +2171,7 @@ async def get_current_usage(user=Depends(get_verified_user)):
             )
 
         return {
-            "model_ids": get_models_in_use(),
+            "model_ids": await get_models_in_use(),
             "user_count": Users.get_active_user_count(),
         }
     except HTTPException:
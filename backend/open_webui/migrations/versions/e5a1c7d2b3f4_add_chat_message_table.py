@@ -0,0 +1,43 @@
+"""Add chat_message table
+
+Revision ID: e5a1c7d2b3f4
+Revises: c440947495f3
+Create Date: 2026-01-08 10:12:31.418207
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a1c7d2b3f4"
+down_revision: Union[str, None] = "c440947495f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing chats keep their inline history and are moved into this table
+    # on their next write when ENABLE_CHAT_MESSAGE_TABLE is set.
+    op.create_table(
+        "chat_message",
+        sa.Column(
+            "chat_id",
+            sa.Text(),
+            sa.ForeignKey("chat.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("message_id", sa.Text(), primary_key=True),
+        sa.Column("message", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.BigInteger(), nullable=False),
+    )
+    pass
+
+
+def downgrade() -> None:
+    op.drop_table("chat_message")
+    pass
@@ -0,0 +1,100 @@
+"""Add note_revision table
+
+Revision ID: f2b8d4c6a9e1
+Revises: e5a1c7d2b3f4
+Create Date: 2026-01-09 14:27:05.913344
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b8d4c6a9e1"
+down_revision: Union[str, None] = "e5a1c7d2b3f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "note_revision",
+        sa.Column("id", sa.Text(), primary_key=True),
+        sa.Column(
+            "note_id",
+            sa.Text(),
+            sa.ForeignKey("note.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("author_id", sa.Text(), nullable=True),
+        sa.Column("author_name", sa.Text(), nullable=True),
+        sa.Column("update", sa.LargeBinary(), nullable=True),
+        sa.Column("content", sa.JSON(), nullable=True),
+        sa.Column("status", sa.Text(), nullable=False),
+        sa.Column("timestamp", sa.BigInteger(), nullable=False),
+        sa.Column("reviewed_at", sa.BigInteger(), nullable=True),
+    )
+    op.create_index(
+        "note_revision_note_id_timestamp_idx",
+        "note_revision",
+        ["note_id", "timestamp"],
+    )
+
+    # Move revisions stored inline in note.data into the new table
+    conn = op.get_bind()
+    note_table = sa.table(
+        "note",
+        sa.column("id", sa.Text()),
+        sa.column("data", sa.JSON()),
+    )
+    note_revision_table = sa.table(
+        "note_revision",
+        sa.column("id", sa.Text()),
+        sa.column("note_id", sa.Text()),
+        sa.column("author_id", sa.Text()),
+        sa.column("author_name", sa.Text()),
+        sa.column("update", sa.LargeBinary()),
+        sa.column("content", sa.JSON()),
+        sa.column("status", sa.Text()),
+        sa.column("timestamp", sa.BigInteger()),
+        sa.column("reviewed_at", sa.BigInteger()),
+    )
+
+    notes = conn.execute(sa.select(note_table.c.id, note_table.c.data)).fetchall()
+    for note_id, data in notes:
+        if not isinstance(data, dict) or not data.get("revisions"):
+            continue
+
+        rows = []
+        for revision in data["revisions"]:
+            if not isinstance(revision, dict) or not revision.get("id"):
+                continue
+            rows.append(
+                {
+                    "id": revision["id"],
+                    "note_id": note_id,
+                    "author_id": revision.get("author_id"),
+                    "author_name": revision.get("author_name"),
+                    "update": bytes(revision.get("update") or []),
+                    "content": revision.get("content") or {},
+                    "status": revision.get("status") or "pending",
+                    "timestamp": revision.get("timestamp") or 0,
+                    "reviewed_at": revision.get("reviewed_at"),
+                }
+            )
+
+        if rows:
+            conn.execute(note_revision_table.insert(), rows)
+
+        data = {k: v for k, v in data.items() if k != "revisions"}
+        conn.execute(
+            note_table.update().where(note_table.c.id == note_id).values(data=data)
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("note_revision_note_id_timestamp_idx", table_name="note_revision")
+    op.drop_table("note_revision")
@@ -5,6 +5,7 @@ import uuid
 from typing import Optional
 
 from sqlalchemy.orm import Session
+from open_webui.env import ENABLE_CHAT_MESSAGE_TABLE
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.folders import Folders
@@ -22,7 +23,8 @@ from sqlalchemy import (
     Index,
     UniqueConstraint,
 )
-from sqlalchemy import or_, func, select, and_, text
+from sqlalchemy import or_, func, select, and_, text, cast
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import exists
 from sqlalchemy.sql.expression import bindparam
 
@@ -85,6 +87,23 @@ class ChatModel(BaseModel):
     folder_id: Optional[str] = None
 
 
+class ChatMessage(Base):
+    __tablename__ = "chat_message"
+
+    chat_id = Column(Text, ForeignKey("chat.id", ondelete="CASCADE"), primary_key=True)
+    message_id = Column(Text, primary_key=True)
+    message = Column(JSON, nullable=False)
+
+    created_at = Column(BigInteger, nullable=False)
+    updated_at = Column(BigInteger, nullable=False)
+
+
+# Set on chat["history"] when its messages live in the chat_message table
+# instead of history["messages"]; never returned to callers.
+MESSAGE_STORAGE_KEY = "messageStorage"
+MESSAGE_STORAGE_TABLE = "chat_message"
+
+
 class ChatFile(Base):
     __tablename__ = "chat_file"
 
@@ -281,6 +300,171 @@ class ChatTable:
 
         return changed
 
+    ####################
+    # Message storage
+    ####################
+
+    def _is_message_table_chat(self, chat: Optional[dict]) -> bool:
+        history = (chat or {}).get("history")
+        return (
+            isinstance(history, dict)
+            and history.get(MESSAGE_STORAGE_KEY) == MESSAGE_STORAGE_TABLE
+        )
+
+    def _split_chat_messages(self, chat: dict) -> tuple[dict, Optional[dict]]:
+        """
+        Split history["messages"] out of a chat JSON and mark the remaining
+        history as table-backed. Returns (chat, None) when there is no history.
+        """
+        history = chat.get("history")
+        if not isinstance(history, dict) or "messages" not in history:
+            return chat, None
+
+        messages = history.get("messages") or {}
+        history = {k: v for k, v in history.items() if k != "messages"}
+        history[MESSAGE_STORAGE_KEY] = MESSAGE_STORAGE_TABLE
+        return {**chat, "history": history}, messages
+
+    def _get_message_rows_by_chat_ids(
+        self, db: Session, chat_ids: list[str]
+    ) -> dict[str, dict]:
+        messages_by_chat_id = {chat_id: {} for chat_id in chat_ids}
+        if not chat_ids:
+            return messages_by_chat_id
+
+        rows = (
+            db.query(ChatMessage.chat_id, ChatMessage.message_id, ChatMessage.message)
+            .filter(ChatMessage.chat_id.in_(chat_ids))
+            .order_by(ChatMessage.created_at.asc())
+            .all()
+        )
+        for chat_id, message_id, message in rows:
+            messages_by_chat_id[chat_id][message_id] = message
+        return messages_by_chat_id
+
+    def _sync_chat_messages(
+        self, db: Session, chat_id: str, messages: dict, existing: bool = True
+    ):
+        """
+        Make the chat_message rows of a chat match `messages`, writing only the
+        rows that were added or changed.
+        """
+        rows = (
+            {
+                row.message_id: row
+                for row in db.query(ChatMessage).filter_by(chat_id=chat_id).all()
+            }
+            if existing
+            else {}
+        )
+
+        now = int(time.time())
+        for message_id, message in messages.items():
+            row = rows.pop(message_id, None)
+            if row is None:
+                db.add(
+                    ChatMessage(
+                        chat_id=chat_id,
+                        message_id=message_id,
+                        message=message,
+                        created_at=now,
+                        updated_at=now,
+                    )
+                )
+            elif row.message != message:
+                row.message = message
+                row.updated_at = now
+
+        for row in rows.values():
+            db.delete(row)
+
+    def _move_messages_to_table(self, db: Session, chat_item: Chat) -> None:
+        """Move an inline chat history into the chat_message table."""
+        chat = self._clean_null_bytes(chat_item.chat or {})
+        history = chat.get("history")
+        if not isinstance(history, dict):
+            history = {}
+
+        chat, messages = self._split_chat_messages(
+            {**chat, "history": {"messages": {}, **history}}
+        )
+        chat_item.chat = chat
+        self._sync_chat_messages(db, chat_item.id, messages, existing=False)
+
+    def _to_chat_models(self, db: Session, chat_items: list[Chat]) -> list[ChatModel]:
+        """
+        Build ChatModels with the full chat JSON, merging table-backed messages
+        back into history["messages"] with a single query for all chats.
+        """
+        chat_items = list(chat_items)
+        messages_by_chat_id = self._get_message_rows_by_chat_ids(
+            db,
+            [
+                chat_item.id
+                for chat_item in chat_items
+                if self._is_message_table_chat(chat_item.chat)
+            ],
+        )
+
+        chats = []
+        for chat_item in chat_items:
+            chat = ChatModel.model_validate(chat_item)
+            if chat_item.id in messages_by_chat_id:
+                history = {
+                    k: v
+                    for k, v in chat.chat["history"].items()
+                    if k != MESSAGE_STORAGE_KEY
+                }
+                history["messages"] = messages_by_chat_id[chat_item.id]
+                chat.chat = {**chat.chat, "history": history}
+            chats.append(chat)
+        return chats
+
+    def _to_chat_model(self, db: Session, chat_item: Chat) -> ChatModel:
+        return self._to_chat_models(db, [chat_item])[0]
+
+    def _get_message_row(
+        self, db: Session, chat_item: Chat, message_id: str
+    ) -> Optional[ChatMessage]:
+        """
+        Load a single chat_message row for writing, moving the chat over to
+        table storage first if it is still stored inline.
+        """
+        if not self._is_message_table_chat(chat_item.chat):
+            self._move_messages_to_table(db, chat_item)
+            db.flush()
+
+        return db.get(ChatMessage, (chat_item.id, message_id))
+
+    def _set_current_message_id(
+        self, db: Session, id: str, message_id: str, updated_at: int
+    ) -> None:
+        """Set history.currentId with an in-database JSON update where supported."""
+        dialect_name = db.bind.dialect.name
+        if dialect_name == "sqlite":
+            chat = func.json_set(Chat.chat, "$.history.currentId", message_id)
+        elif dialect_name == "postgresql":
+            chat = cast(
+                func.jsonb_set(
+                    cast(Chat.chat, JSONB),
+                    "{history,currentId}",
+                    func.to_jsonb(cast(message_id, Text)),
+                ),
+                JSON,
+            )
+        else:
+            chat_item = db.get(Chat, id)
+            chat_item.chat = {
+                **chat_item.chat,
+                "history": {**chat_item.chat["history"], "currentId": message_id},
+            }
+            chat_item.updated_at = updated_at
+            return
+
+        db.query(Chat).filter(Chat.id == id).update(
+            {"chat": chat, "updated_at": updated_at}, synchronize_session=False
+        )
+
     def insert_new_chat(
         self, user_id: str, form_data: ChatForm, db: Optional[Session] = None
     ) -> Optional[ChatModel]:
@@ -304,9 +488,14 @@ class ChatTable:
 
             chat_item = Chat(**chat.model_dump())
             db.add(chat_item)
+
+            if ENABLE_CHAT_MESSAGE_TABLE:
+                db.flush()
+                self._move_messages_to_table(db, chat_item)
+
             db.commit()
             db.refresh(chat_item)
-            return ChatModel.model_validate(chat_item) if chat_item else None
+            return self._to_chat_model(db, chat_item) if chat_item else None
 
     def _chat_import_form_to_chat_model(
         self, user_id: str, form_data: ChatImportForm
@@ -356,7 +545,19 @@ class ChatTable:
         try:
             with get_db_context(db) as db:
                 chat_item = db.get(Chat, id)
-                chat_item.chat = self._clean_null_bytes(chat)
+                chat = self._clean_null_bytes(chat)
+                is_message_table_chat = self._is_message_table_chat(chat_item.chat)
+
+                if ENABLE_CHAT_MESSAGE_TABLE:
+                    chat, messages = self._split_chat_messages(chat)
+                    self._sync_chat_messages(
+                        db, id, messages or {}, existing=is_message_table_chat
+                    )
+                elif is_message_table_chat:
+                    # Messages are inline again, drop the table-backed copies
+                    db.query(ChatMessage).filter_by(chat_id=id).delete()
+
+                chat_item.chat = chat
                 chat_item.title = (
                     self._clean_null_bytes(chat["title"])
                     if "title" in chat
@@ -368,7 +569,7 @@ class ChatTable:
                 db.commit()
                 db.refresh(chat_item)
 
-                return ChatModel.model_validate(chat_item)
+                return self._to_chat_model(db, chat_item)
         except Exception:
             return None
 
@@ -419,77 +620,172 @@ class ChatTable:
     def get_message_by_id_and_message_id(
         self, id: str, message_id: str
     ) -> Optional[dict]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+        with get_db_context() as db:
+            chat_item = db.get(Chat, id)
+            if chat_item is None:
+                return None
 
-        return chat.chat.get("history", {}).get("messages", {}).get(message_id, {})
+            if self._is_message_table_chat(chat_item.chat):
+                row = db.get(ChatMessage, (id, message_id))
+                return row.message if row else {}
 
-    def upsert_message_to_chat_by_id_and_message_id(
-        self, id: str, message_id: str, message: dict
-    ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+            chat = chat_item.chat or {}
+            return chat.get("history", {}).get("messages", {}).get(message_id, {})
 
+    def upsert_message_to_chat_by_id_and_message_id(
+        self,
+        id: str,
+        message_id: str,
+        message: dict,
+        db: Optional[Session] = None,
+    ) -> Optional[dict]:
         # Sanitize message content for null characters before upserting
         if isinstance(message.get("content"), str):
             message["content"] = sanitize_text_for_db(message["content"])
 
-        chat = chat.chat
-        history = chat.get("history", {})
+        if not ENABLE_CHAT_MESSAGE_TABLE:
+            chat = self.get_chat_by_id(id, db=db)
+            if chat is None:
+                return None
 
-        if message_id in history.get("messages", {}):
-            history["messages"][message_id] = {
-                **history["messages"][message_id],
-                **message,
-            }
-        else:
-            history["messages"][message_id] = message
+            chat = chat.chat
+            history = chat.get("history", {})
+
+            if message_id in history.get("messages", {}):
+                history["messages"][message_id] = {
+                    **history["messages"][message_id],
+                    **message,
+                }
+            else:
+                history["messages"][message_id] = message
 
-        history["currentId"] = message_id
+            history["currentId"] = message_id
 
-        chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+            chat["history"] = history
+            self.update_chat_by_id(id, chat, db=db)
+            return history["messages"][message_id]
+
+        try:
+            with get_db_context(db) as db:
+                storage = (
+                    db.query(Chat.chat["history"][MESSAGE_STORAGE_KEY].as_string())
+                    .filter(Chat.id == id)
+                    .first()
+                )
+                if storage is None:
+                    return None
+
+                now = int(time.time())
+                if storage[0] == MESSAGE_STORAGE_TABLE:
+                    row = db.get(ChatMessage, (id, message_id))
+                    # Leaves the chat JSON, including the top-level messages
+                    # list, in place instead of rewriting it from Python
+                    self._set_current_message_id(db, id, message_id, now)
+                else:
+                    chat_item = db.get(Chat, id)
+                    row = self._get_message_row(db, chat_item, message_id)
+                    chat_item.chat = {
+                        **chat_item.chat,
+                        "history": {
+                            **chat_item.chat["history"],
+                            "currentId": message_id,
+                        },
+                    }
+                    chat_item.updated_at = now
+
+                if row is None:
+                    row = ChatMessage(
+                        chat_id=id,
+                        message_id=message_id,
+                        message=message,
+                        created_at=now,
+                        updated_at=now,
+                    )
+                    db.add(row)
+                else:
+                    row.message = {**row.message, **message}
+                    row.updated_at = now
+
+                db.commit()
+                return row.message
+        except Exception as e:
+            log.exception(f"Error upserting message {message_id} to chat {id}: {e}")
+            return None
 
     def add_message_status_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, status: dict
-    ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+    ) -> Optional[dict]:
+        if not ENABLE_CHAT_MESSAGE_TABLE:
+            chat = self.get_chat_by_id(id)
+            if chat is None:
+                return None
 
-        chat = chat.chat
-        history = chat.get("history", {})
+            chat = chat.chat
+            history = chat.get("history", {})
 
-        if message_id in history.get("messages", {}):
-            status_history = history["messages"][message_id].get("statusHistory", [])
-            status_history.append(status)
-            history["messages"][message_id]["statusHistory"] = status_history
+            if message_id not in history.get("messages", {}):
+                return None
 
-        chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+            message = history["messages"][message_id]
+            message["statusHistory"] = message.get("statusHistory", []) + [status]
+
+            self.update_chat_by_id(id, chat)
+            return message
+
+        with get_db_context() as db:
+            chat_item = db.get(Chat, id)
+            if chat_item is None:
+                return None
+
+            row = self._get_message_row(db, chat_item, message_id)
+            if row is None:
+                db.commit()
+                return None
+
+            row.message = {
+                **row.message,
+                "statusHistory": row.message.get("statusHistory", []) + [status],
+            }
+            row.updated_at = int(time.time())
+            db.commit()
+            return row.message
 
     def add_message_files_by_id_and_message_id(
         self, id: str, message_id: str, files: list[dict]
     ) -> list[dict]:
         with get_db_context() as db:
-            chat = self.get_chat_by_id(id, db=db)
-            if chat is None:
-                return None
+            if not ENABLE_CHAT_MESSAGE_TABLE:
+                chat = self.get_chat_by_id(id, db=db)
+                if chat is None:
+                    return None
 
-            chat = chat.chat
-            history = chat.get("history", {})
+                chat = chat.chat
+                history = chat.get("history", {})
+
+                message_files = []
+
+                if message_id in history.get("messages", {}):
+                    message_files = history["messages"][message_id].get("files", [])
+                    message_files = message_files + files
+                    history["messages"][message_id]["files"] = message_files
+
+                chat["history"] = history
+                self.update_chat_by_id(id, chat, db=db)
+                return message_files
+
+            chat_item = db.get(Chat, id)
+            if chat_item is None:
+                return None
 
             message_files = []
 
-            if message_id in history.get("messages", {}):
-                message_files = history["messages"][message_id].get("files", [])
-                message_files = message_files + files
-                history["messages"][message_id]["files"] = message_files
+            row = self._get_message_row(db, chat_item, message_id)
+            if row is not None:
+                message_files = row.message.get("files", []) + files
+                row.message = {**row.message, "files": message_files}
+                row.updated_at = int(time.time())
 
-            chat["history"] = history
-            self.update_chat_by_id(id, chat, db=db)
+            db.commit()
             return message_files
 
     def insert_shared_chat_by_chat_id(
@@ -505,12 +801,13 @@ class ChatTable:
             if chat.share_id:
                 return self.get_chat_by_id_and_user_id(chat.share_id, "shared", db=db)
             # Create a new chat with the same data, but with a new ID
+            # (shared snapshots always keep their messages inline)
             shared_chat = ChatModel(
                 **{
                     "id": str(uuid.uuid4()),
                     "user_id": f"shared-{chat_id}",
                     "title": chat.title,
-                    "chat": chat.chat,
+                    "chat": self._to_chat_model(db, chat).chat,
                     "meta": chat.meta,
                     "pinned": chat.pinned,
                     "folder_id": chat.folder_id,
@@ -546,7 +843,7 @@ class ChatTable:
                     return self.insert_shared_chat_by_chat_id(chat_id, db=db)
 
                 shared_chat.title = chat.title
-                shared_chat.chat = chat.chat
+                shared_chat.chat = self._to_chat_model(db, chat).chat
                 shared_chat.meta = chat.meta
                 shared_chat.pinned = chat.pinned
                 shared_chat.folder_id = chat.folder_id
@@ -590,7 +887,7 @@ class ChatTable:
                 chat.share_id = share_id
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(db, chat)
         except Exception:
             return None
 
@@ -604,7 +901,7 @@ class ChatTable:
                 chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(db, chat)
         except Exception:
             return None
 
@@ -619,7 +916,7 @@ class ChatTable:
                 chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(db, chat)
         except Exception:
             return None
 
@@ -673,7 +970,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chat_list_by_user_id(
         self,
@@ -713,7 +1010,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chat_title_id_list_by_user_id(
         self,
@@ -776,7 +1073,7 @@ class ChatTable:
                 .order_by(Chat.updated_at.desc())
                 .all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chat_by_id(
         self, id: str, db: Optional[Session] = None
@@ -791,7 +1088,7 @@ class ChatTable:
                     db.commit()
                     db.refresh(chat_item)
 
-                return ChatModel.model_validate(chat_item)
+                return self._to_chat_model(db, chat_item)
         except Exception:
             return None
 
@@ -817,7 +1114,43 @@ class ChatTable:
         try:
             with get_db_context(db) as db:
                 chat = db.query(Chat).filter_by(id=id, user_id=user_id).first()
-                return ChatModel.model_validate(chat)
+                if chat is None:
+                    return None
+
+                return self._to_chat_model(db, chat)
+        except Exception:
+            return None
+
+    def get_chat_user_id_by_id(
+        self, id: str, db: Optional[Session] = None
+    ) -> Optional[str]:
+        """Owner of a chat, without loading its history."""
+        try:
+            with get_db_context(db) as db:
+                return db.query(Chat.user_id).filter_by(id=id).scalar()
+        except Exception:
+            return None
+
+    def is_chat_owned_by_user(
+        self, id: str, user_id: str, db: Optional[Session] = None
+    ) -> bool:
+        """Whether the chat exists and belongs to the user, without loading it."""
+        try:
+            with get_db_context(db) as db:
+                return db.query(
+                    db.query(Chat.id).filter_by(id=id, user_id=user_id).exists()
+                ).scalar()
+        except Exception:
+            return False
+
+    def get_chat_folder_id_by_id_and_user_id(
+        self, id: str, user_id: str, db: Optional[Session] = None
+    ) -> Optional[str]:
+        try:
+            with get_db_context(db) as db:
+                return (
+                    db.query(Chat.folder_id).filter_by(id=id, user_id=user_id).scalar()
+                )
         except Exception:
             return None
 
@@ -830,7 +1163,7 @@ class ChatTable:
                 # .limit(limit).offset(skip)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chats_by_user_id(
         self,
@@ -873,7 +1206,7 @@ class ChatTable:
 
             return ChatListResponse(
                 **{
-                    "items": [ChatModel.model_validate(chat) for chat in all_chats],
+                    "items": self._to_chat_models(db, all_chats),
                     "total": total,
                 }
             )
@@ -887,7 +1220,7 @@ class ChatTable:
                 .filter_by(user_id=user_id, pinned=True, archived=False)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_archived_chats_by_user_id(
         self, user_id: str, db: Optional[Session] = None
@@ -898,7 +1231,7 @@ class ChatTable:
                 .filter_by(user_id=user_id, archived=True)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chats_by_user_id_and_search_text(
         self,
@@ -1109,7 +1442,7 @@ class ChatTable:
             log.info(f"The number of chats: {len(all_chats)}")
 
             # Validate and return chats
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chats_by_folder_id_and_user_id(
         self,
@@ -1132,7 +1465,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def get_chats_by_folder_ids_and_user_id(
         self, folder_ids: list[str], user_id: str, db: Optional[Session] = None
@@ -1147,7 +1480,7 @@ class ChatTable:
             query = query.order_by(Chat.updated_at.desc())
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def update_chat_folder_id_by_id_and_user_id(
         self, id: str, user_id: str, folder_id: str, db: Optional[Session] = None
@@ -1160,7 +1493,7 @@ class ChatTable:
                 chat.pinned = False
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(db, chat)
         except Exception:
             return None
 
@@ -1206,7 +1539,7 @@ class ChatTable:
 
             all_chats = query.all()
             log.debug(f"all_chats: {all_chats}")
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
     def add_chat_tag_by_id_and_user_id_and_tag_name(
         self, id: str, user_id: str, tag_name: str, db: Optional[Session] = None
@@ -1227,7 +1560,7 @@ class ChatTable:
 
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(db, chat)
         except Exception:
             return None
 
@@ -1319,6 +1652,7 @@ class ChatTable:
     def delete_chat_by_id(self, id: str, db: Optional[Session] = None) -> bool:
         try:
             with get_db_context(db) as db:
+                db.query(ChatMessage).filter_by(chat_id=id).delete()
                 db.query(Chat).filter_by(id=id).delete()
                 db.commit()
 
@@ -1331,6 +1665,10 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db_context(db) as db:
+                chat_ids = select(Chat.id).filter_by(id=id, user_id=user_id)
+                db.query(ChatMessage).filter(ChatMessage.chat_id.in_(chat_ids)).delete(
+                    synchronize_session=False
+                )
                 db.query(Chat).filter_by(id=id, user_id=user_id).delete()
                 db.commit()
 
@@ -1345,6 +1683,10 @@ class ChatTable:
             with get_db_context(db) as db:
                 self.delete_shared_chats_by_user_id(user_id, db=db)
 
+                chat_ids = select(Chat.id).filter_by(user_id=user_id)
+                db.query(ChatMessage).filter(ChatMessage.chat_id.in_(chat_ids)).delete(
+                    synchronize_session=False
+                )
                 db.query(Chat).filter_by(user_id=user_id).delete()
                 db.commit()
 
@@ -1357,6 +1699,12 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db_context(db) as db:
+                chat_ids = select(Chat.id).filter_by(
+                    user_id=user_id, folder_id=folder_id
+                )
+                db.query(ChatMessage).filter(ChatMessage.chat_id.in_(chat_ids)).delete(
+                    synchronize_session=False
+                )
                 db.query(Chat).filter_by(user_id=user_id, folder_id=folder_id).delete()
                 db.commit()
 
@@ -1492,7 +1840,7 @@ class ChatTable:
                 .all()
             )
 
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(db, all_chats)
 
 
 Chats = ChatTable()
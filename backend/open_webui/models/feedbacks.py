@@ -8,7 +8,7 @@ from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.users import User
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, Text, JSON, Boolean
+from sqlalchemy import BigInteger, Column, Text, JSON, Boolean, func
 
 log = logging.getLogger(__name__)
 
@@ -73,6 +73,8 @@ class LeaderboardFeedbackData(BaseModel):
 
     id: str
     data: Optional[dict] = None
+    created_at: Optional[int] = None
+    updated_at: Optional[int] = None
 
 
 class RatingData(BaseModel):
@@ -290,15 +292,40 @@ class FeedbackTable:
             ]
 
     def get_feedbacks_for_leaderboard(
-        self, db: Optional[Session] = None
+        self, updated_since: Optional[int] = None, db: Optional[Session] = None
     ) -> list[LeaderboardFeedbackData]:
-        """Fetch only id and data for leaderboard computation (excludes snapshot/meta)."""
+        """
+        Fetch only id, data and timestamps for leaderboard computation (excludes
+        snapshot/meta), in creation order. With updated_since, only feedbacks
+        updated at or after that time are returned.
+        """
         with get_db_context(db) as db:
+            query = db.query(
+                Feedback.id, Feedback.data, Feedback.created_at, Feedback.updated_at
+            )
+            if updated_since is not None:
+                query = query.filter(Feedback.updated_at >= updated_since)
             return [
-                LeaderboardFeedbackData(id=row.id, data=row.data)
-                for row in db.query(Feedback.id, Feedback.data).all()
+                LeaderboardFeedbackData(
+                    id=row.id,
+                    data=row.data,
+                    created_at=row.created_at,
+                    updated_at=row.updated_at,
+                )
+                for row in query.order_by(Feedback.created_at, Feedback.id).all()
             ]
 
+    def get_feedbacks_version(self, db: Optional[Session] = None) -> tuple[int, int]:
+        """
+        Feedback count and latest updated_at, which together change on any
+        insert, update or delete.
+        """
+        with get_db_context(db) as db:
+            count, updated_at = db.query(
+                func.count(Feedback.id), func.max(Feedback.updated_at)
+            ).one()
+            return count, updated_at or 0
+
     def get_model_evaluation_history(
         self, model_id: str, days: int = 30, db: Optional[Session] = None
     ) -> list[ModelHistoryEntry]:
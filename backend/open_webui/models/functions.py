@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.users import Users, UserModel
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, Index
+from sqlalchemy import BigInteger, Boolean, Column, String, Text, Index, func
 
 log = logging.getLogger(__name__)
 
@@ -195,6 +195,15 @@ class FunctionsTable:
         except Exception:
             return None
 
+    def get_function_updated_at_by_id(
+        self, id: str, db: Optional[Session] = None
+    ) -> Optional[int]:
+        try:
+            with get_db_context(db) as db:
+                return db.query(Function.updated_at).filter_by(id=id).scalar()
+        except Exception:
+            return None
+
     def get_functions(
         self, active_only=False, include_valves=False, db: Optional[Session] = None
     ) -> list[FunctionModel | FunctionWithValvesModel]:
@@ -256,6 +265,33 @@ class FunctionsTable:
                     for function in db.query(Function).filter_by(type=type).all()
                 ]
 
+    def get_functions_with_valves_by_type(
+        self, type: str, active_only=False, db: Optional[Session] = None
+    ) -> list[FunctionWithValvesModel]:
+        with get_db_context(db) as db:
+            query = db.query(Function).filter_by(type=type)
+            if active_only:
+                query = query.filter_by(is_active=True)
+            return [
+                FunctionWithValvesModel.model_validate(function)
+                for function in query.all()
+            ]
+
+    def get_functions_version_by_type(
+        self, type: str, db: Optional[Session] = None
+    ) -> tuple[int, int]:
+        """
+        Function count and latest updated_at for a type, which together change
+        on any insert, update or delete, including valves and toggles.
+        """
+        with get_db_context(db) as db:
+            count, updated_at = (
+                db.query(func.count(Function.id), func.max(Function.updated_at))
+                .filter_by(type=type)
+                .one()
+            )
+            return count, updated_at or 0
+
     def get_global_filter_functions(
         self, db: Optional[Session] = None
     ) -> list[FunctionModel]:
@@ -6,6 +6,8 @@ import uuid
 
 from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
+from open_webui.utils.access_version import bump_access_version
+from open_webui.utils.user_cache import invalidate_user_cache
 
 from open_webui.models.files import FileMetadataResponse
 
@@ -258,6 +260,25 @@ class GroupTable:
                 "total": total,
             }
 
+    def get_groups_version(self, db: Optional[Session] = None) -> tuple[int, ...]:
+        """
+        Group and membership counts and latest updated_at values, which change
+        on any write to groups or their members.
+        """
+        with get_db_context(db) as db:
+            group_count, group_updated_at = db.query(
+                func.count(Group.id), func.max(Group.updated_at)
+            ).one()
+            member_count, member_updated_at = db.query(
+                func.count(GroupMember.id), func.max(GroupMember.updated_at)
+            ).one()
+            return (
+                group_count,
+                group_updated_at or 0,
+                member_count,
+                member_updated_at or 0,
+            )
+
     def get_groups_by_member_id(
         self, user_id: str, db: Optional[Session] = None
     ) -> list[GroupModel]:
@@ -356,6 +377,8 @@ class GroupTable:
 
             db.add_all(new_members)
             db.commit()
+            bump_access_version()
+            invalidate_user_cache()
 
     def get_group_member_count_by_id(
         self, id: str, db: Optional[Session] = None
@@ -384,6 +407,8 @@ class GroupTable:
                     }
                 )
                 db.commit()
+                # Group permissions feed the cached permission checks
+                invalidate_user_cache()
                 return self.get_group_by_id(id=id, db=db)
         except Exception as e:
             log.exception(e)
@@ -394,6 +419,8 @@ class GroupTable:
             with get_db_context(db) as db:
                 db.query(Group).filter_by(id=id).delete()
                 db.commit()
+                bump_access_version()
+                invalidate_user_cache()
                 return True
         except Exception:
             return False
@@ -403,6 +430,8 @@ class GroupTable:
             try:
                 db.query(Group).delete()
                 db.commit()
+                bump_access_version()
+                invalidate_user_cache()
 
                 return True
             except Exception:
@@ -432,6 +461,8 @@ class GroupTable:
                     )
 
                 db.commit()
+                bump_access_version()
+                invalidate_user_cache()
                 return True
 
             except Exception:
@@ -525,6 +556,8 @@ class GroupTable:
                     )
 
                 db.commit()
+                bump_access_version()
+                invalidate_user_cache()
                 return True
 
             except Exception as e:
@@ -565,6 +598,8 @@ class GroupTable:
 
                 group.updated_at = now
                 db.commit()
+                bump_access_version()
+                invalidate_user_cache()
                 db.refresh(group)
 
                 return GroupModel.model_validate(group)
@@ -598,6 +633,8 @@ class GroupTable:
                 group.updated_at = int(time.time())
 
                 db.commit()
+                bump_access_version()
+                invalidate_user_cache()
                 db.refresh(group)
                 return GroupModel.model_validate(group)
 
@@ -19,6 +19,7 @@ from sqlalchemy import BigInteger, Column, Text, JSON, Boolean
 
 
 from open_webui.utils.access_control import has_access
+from open_webui.utils.access_version import bump_access_version
 
 
 log = logging.getLogger(__name__)
@@ -175,6 +176,7 @@ class ModelsTable:
                 result = Model(**model.model_dump())
                 db.add(result)
                 db.commit()
+                bump_access_version()
                 db.refresh(result)
 
                 if result:
@@ -185,6 +187,14 @@ class ModelsTable:
             log.exception(f"Failed to insert a new model: {e}")
             return None
 
+    def get_models_version(self, db: Optional[Session] = None) -> tuple[int, int]:
+        """Model count and latest updated_at, which change on any write."""
+        with get_db_context(db) as db:
+            count, updated_at = db.query(
+                func.count(Model.id), func.max(Model.updated_at)
+            ).one()
+            return count, updated_at or 0
+
     def get_all_models(self, db: Optional[Session] = None) -> list[ModelModel]:
         with get_db_context(db) as db:
             return [ModelModel.model_validate(model) for model in db.query(Model).all()]
@@ -415,6 +425,7 @@ class ModelsTable:
                 result = db.query(Model).filter_by(id=id).update(data)
 
                 db.commit()
+                bump_access_version()
 
                 model = db.get(Model, id)
                 db.refresh(model)
@@ -428,6 +439,7 @@ class ModelsTable:
             with get_db_context(db) as db:
                 db.query(Model).filter_by(id=id).delete()
                 db.commit()
+                bump_access_version()
 
                 return True
         except Exception:
@@ -438,6 +450,7 @@ class ModelsTable:
             with get_db_context(db) as db:
                 db.query(Model).delete()
                 db.commit()
+                bump_access_version()
 
                 return True
         except Exception:
@@ -481,6 +494,7 @@ class ModelsTable:
                         db.delete(model)
 
                 db.commit()
+                bump_access_version()
 
                 return [
                     ModelModel.model_validate(model) for model in db.query(Model).all()
@@ -11,8 +11,18 @@ from open_webui.utils.access_control import has_access
 from open_webui.models.users import User, UserModel, Users, UserResponse
 
 
-from pydantic import BaseModel, ConfigDict, Field, model_validator
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    String,
+    Text,
+    JSON,
+)
 from sqlalchemy.dialects.postgresql import JSONB
 
 
@@ -40,6 +50,28 @@ class Note(Base):
     updated_at = Column(BigInteger)
 
 
+class NoteRevision(Base):
+    __tablename__ = "note_revision"
+
+    id = Column(Text, primary_key=True, unique=True)
+    note_id = Column(Text, ForeignKey("note.id", ondelete="CASCADE"), nullable=False)
+
+    author_id = Column(Text, nullable=True)
+    author_name = Column(Text, nullable=True)
+
+    update = Column(LargeBinary, nullable=True)
+    content = Column(JSON, nullable=True)
+
+    status = Column(Text, nullable=False, default="pending")
+
+    timestamp = Column(BigInteger, nullable=False)
+    reviewed_at = Column(BigInteger, nullable=True)
+
+    __table_args__ = (
+        Index("note_revision_note_id_timestamp_idx", "note_id", "timestamp"),
+    )
+
+
 DOCUMENT_SCHEMA_VERSION = 2
 
 
@@ -72,6 +104,34 @@ class NoteRevisionModel(BaseModel):
     delta: Optional[dict[str, Any]] = None
 
 
+class NoteRevisionEventModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    note_id: str
+    author_id: Optional[str] = None
+    author_name: Optional[str] = None
+    update: list[int] = Field(default_factory=list)
+    content: dict = Field(default_factory=dict)
+    status: str = "pending"
+    timestamp: int
+    reviewed_at: Optional[int] = None
+
+    @field_validator("update", mode="before")
+    @classmethod
+    def update_to_list(cls, value: Any):
+        if value is None:
+            return []
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return list(bytes(value))
+        return value
+
+    @field_validator("content", mode="before")
+    @classmethod
+    def content_to_dict(cls, value: Any):
+        return value or {}
+
+
 class NoteFootnoteModel(BaseModel):
     id: str
     content: Optional[str] = None
@@ -620,6 +680,7 @@ class NoteTable:
     def delete_note_by_id(self, id: str, db: Optional[Session] = None) -> bool:
         try:
             with get_db_context(db) as db:
+                db.query(NoteRevision).filter(NoteRevision.note_id == id).delete()
                 db.query(Note).filter(Note.id == id).delete()
                 db.commit()
                 return True
@@ -635,62 +696,97 @@ class NoteTable:
         content: Optional[dict] = None,
         db: Optional[Session] = None,
     ) -> Optional[dict]:
-        with get_db_context(db) as db:
-            note = db.query(Note).filter(Note.id == note_id).first()
-            if not note:
-                return None
+        revision = {
+            "id": str(uuid.uuid4()),
+            "note_id": note_id,
+            "author_id": user_id,
+            "author_name": user_name,
+            "timestamp": int(time.time_ns()),
+            "update": update,
+            "content": content or {},
+            "status": "pending",
+        }
+        revisions = self.insert_revision_events([revision], db=db)
+        return revisions[0] if revisions else None
 
-            data = note.data or {}
-            revisions = data.get("revisions") or []
-            revision = {
-                "id": str(uuid.uuid4()),
-                "author_id": user_id,
-                "author_name": user_name,
-                "timestamp": int(time.time_ns()),
-                "update": update,
-                "content": content or {},
-                "status": "pending",
+    def insert_revision_events(
+        self, revisions: list[dict], db: Optional[Session] = None
+    ) -> list[dict]:
+        """Append revisions in a single transaction, skipping deleted notes."""
+        if not revisions:
+            return []
+
+        with get_db_context(db) as db:
+            note_ids = {revision["note_id"] for revision in revisions}
+            existing_ids = {
+                row[0] for row in db.query(Note.id).filter(Note.id.in_(note_ids)).all()
             }
-            revisions.append(revision)
-            data["revisions"] = revisions
-            note.data = data
-            note.updated_at = int(time.time_ns())
+
+            rows = [
+                NoteRevision(
+                    **{
+                        "id": revision.get("id") or str(uuid.uuid4()),
+                        "note_id": revision["note_id"],
+                        "author_id": revision.get("author_id"),
+                        "author_name": revision.get("author_name"),
+                        "update": bytes(revision.get("update") or []),
+                        "content": revision.get("content") or {},
+                        "status": revision.get("status") or "pending",
+                        "timestamp": revision.get("timestamp") or int(time.time_ns()),
+                    }
+                )
+                for revision in revisions
+                if revision["note_id"] in existing_ids
+            ]
+            if not rows:
+                return []
+
+            db.add_all(rows)
             db.commit()
-            return revision
+            return [
+                NoteRevisionEventModel.model_validate(row).model_dump() for row in rows
+            ]
 
-    def get_note_revisions(self, note_id: str, db: Optional[Session] = None) -> list[dict]:
+    def get_note_revisions(
+        self,
+        note_id: str,
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        db: Optional[Session] = None,
+    ) -> list[dict]:
         with get_db_context(db) as db:
-            note = db.query(Note).filter(Note.id == note_id).first()
-            if not note:
-                return []
-            return (note.data or {}).get("revisions") or []
+            query = (
+                db.query(NoteRevision)
+                .filter(NoteRevision.note_id == note_id)
+                .order_by(NoteRevision.timestamp.desc(), NoteRevision.id.desc())
+            )
+
+            if skip is not None:
+                query = query.offset(skip)
+            if limit is not None:
+                query = query.limit(limit)
+
+            return [
+                NoteRevisionEventModel.model_validate(revision).model_dump()
+                for revision in query.all()
+            ]
 
     def update_revision_status(
         self, note_id: str, revision_id: str, status: str, db: Optional[Session] = None
     ) -> Optional[dict]:
         with get_db_context(db) as db:
-            note = db.query(Note).filter(Note.id == note_id).first()
-            if not note:
-                return None
-
-            data = note.data or {}
-            revisions = data.get("revisions") or []
-            updated_revision = None
-            for revision in revisions:
-                if revision.get("id") == revision_id:
-                    revision["status"] = status
-                    revision["reviewed_at"] = int(time.time_ns())
-                    updated_revision = revision
-                    break
-
-            if not updated_revision:
+            revision = (
+                db.query(NoteRevision)
+                .filter(NoteRevision.note_id == note_id, NoteRevision.id == revision_id)
+                .first()
+            )
+            if not revision:
                 return None
 
-            data["revisions"] = revisions
-            note.data = data
-            note.updated_at = int(time.time_ns())
+            revision.status = status
+            revision.reviewed_at = int(time.time_ns())
             db.commit()
-            return updated_revision
+            return NoteRevisionEventModel.model_validate(revision).model_dump()
 
     def get_note_comments(self, note_id: str, db: Optional[Session] = None) -> list[dict]:
         with get_db_context(db) as db:
@@ -155,6 +155,26 @@ class ToolsTable:
         except Exception:
             return None
 
+    def get_tool_updated_at_by_id(
+        self, id: str, db: Optional[Session] = None
+    ) -> Optional[int]:
+        try:
+            with get_db_context(db) as db:
+                return db.query(Tool.updated_at).filter_by(id=id).scalar()
+        except Exception:
+            return None
+
+    def get_tool_updated_at_by_ids(
+        self, ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, int]:
+        with get_db_context(db) as db:
+            return {
+                id: updated_at
+                for id, updated_at in db.query(Tool.id, Tool.updated_at)
+                .filter(Tool.id.in_(ids))
+                .all()
+            }
+
     def get_tools(self, db: Optional[Session] = None) -> list[ToolUserModel]:
         with get_db_context(db) as db:
             all_tools = db.query(Tool).order_by(Tool.updated_at.desc()).all()
@@ -12,6 +12,7 @@ from open_webui.models.groups import Groups, GroupMember
 from open_webui.models.channels import ChannelMember
 
 from open_webui.utils.misc import throttle
+from open_webui.utils.user_cache import invalidate_user_cache
 
 
 from pydantic import BaseModel, ConfigDict
@@ -532,6 +533,7 @@ class UsersTable:
             with get_db_context(db) as db:
                 db.query(User).filter_by(id=id).update({"role": role})
                 db.commit()
+                invalidate_user_cache(id)
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
         except Exception:
@@ -546,6 +548,7 @@ class UsersTable:
                     {**form_data.model_dump(exclude_none=True)}
                 )
                 db.commit()
+                invalidate_user_cache(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -561,6 +564,7 @@ class UsersTable:
                     {"profile_image_url": profile_image_url}
                 )
                 db.commit()
+                invalidate_user_cache(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -583,6 +587,15 @@ class UsersTable:
         except Exception:
             return None
 
+    def update_last_active_by_ids(
+        self, ids: list[str], last_active_at: int, db: Optional[Session] = None
+    ) -> None:
+        with get_db_context(db) as db:
+            db.query(User).filter(User.id.in_(ids)).update(
+                {"last_active_at": last_active_at}, synchronize_session=False
+            )
+            db.commit()
+
     def update_user_oauth_by_id(
         self, id: str, provider: str, sub: str, db: Optional[Session] = None
     ) -> Optional[UserModel]:
@@ -609,6 +622,7 @@ class UsersTable:
                 # Persist updated JSON
                 db.query(User).filter_by(id=id).update({"oauth": oauth})
                 db.commit()
+                invalidate_user_cache(id)
 
                 return UserModel.model_validate(user)
 
@@ -622,6 +636,7 @@ class UsersTable:
             with get_db_context(db) as db:
                 db.query(User).filter_by(id=id).update(updated)
                 db.commit()
+                invalidate_user_cache(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -648,6 +663,7 @@ class UsersTable:
 
                 db.query(User).filter_by(id=id).update({"settings": user_settings})
                 db.commit()
+                invalidate_user_cache(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -666,6 +682,7 @@ class UsersTable:
                     # Delete User
                     db.query(User).filter_by(id=id).delete()
                     db.commit()
+                    invalidate_user_cache(id)
 
                 return True
             else:
@@ -690,6 +707,7 @@ class UsersTable:
             with get_db_context(db) as db:
                 db.query(ApiKey).filter_by(user_id=id).delete()
                 db.commit()
+                invalidate_user_cache(id)
 
                 now = int(time.time())
                 new_api_key = ApiKey(
@@ -712,6 +730,7 @@ class UsersTable:
             with get_db_context(db) as db:
                 db.query(ApiKey).filter_by(user_id=id).delete()
                 db.commit()
+                invalidate_user_cache(id)
                 return True
         except Exception:
             return False
@@ -0,0 +1,377 @@
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import sqlite3
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Optional
+from urllib.request import pathname2url
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from open_webui.config import RAG_BM25_INDEX_DIR
+
+log = logging.getLogger(__name__)
+
+
+def get_metadata_text(metadata: dict) -> str:
+    """Metadata that is appended to a chunk when enriched texts are enabled."""
+    metadata_parts = []
+
+    # Add filename (repeat twice for extra weight in BM25 scoring)
+    if metadata.get("name"):
+        filename = metadata["name"]
+        filename_tokens = filename.replace("_", " ").replace("-", " ").replace(".", " ")
+        metadata_parts.append(
+            f"Filename: {filename} {filename_tokens} {filename_tokens}"
+        )
+
+    # Add title if available
+    if metadata.get("title"):
+        metadata_parts.append(f"Title: {metadata['title']}")
+
+    # Add document section headings if available (from markdown splitter)
+    if metadata.get("headings") and isinstance(metadata["headings"], list):
+        headings = " > ".join(str(h) for h in metadata["headings"])
+        metadata_parts.append(f"Section: {headings}")
+
+    # Add source URL/path if available
+    if metadata.get("source"):
+        metadata_parts.append(f"Source: {metadata['source']}")
+
+    # Add snippet for web search results
+    if metadata.get("snippet"):
+        metadata_parts.append(f"Snippet: {metadata['snippet']}")
+
+    return " ".join(metadata_parts)
+
+
+def tokenize(text: str) -> list[str]:
+    # Same whitespace tokenization as BM25Retriever.from_texts
+    return text.split()
+
+
+class BM25Index:
+    """
+    Okapi BM25 index for a single collection, stored in SQLite so that it can be
+    updated incrementally and queried without loading the whole collection.
+
+    Chunk text and enriched metadata text are indexed as separate postings, so
+    the same index serves queries with and without enriched texts.
+
+    Only an index created with create=True makes its file; others fail to
+    connect once their file is gone, instead of silently starting empty.
+    """
+
+    def __init__(
+        self, path: str, k1: float = 1.5, b: float = 0.75, create: bool = False
+    ):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.create = create
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    @contextmanager
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(
+            f"file:{pathname2url(self.path)}?mode={'rwc' if self.create else 'rw'}",
+            timeout=30,
+            uri=True,
+        )
+        try:
+            with conn:
+                self._create_tables(conn)
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _create_tables(conn: sqlite3.Connection):
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS doc (
+                id TEXT PRIMARY KEY,
+                text TEXT,
+                metadata TEXT,
+                length INTEGER NOT NULL,
+                metadata_length INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS posting (
+                term TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                tf INTEGER NOT NULL,
+                metadata_tf INTEGER NOT NULL,
+                PRIMARY KEY (term, doc_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS posting_doc_id_idx ON posting (doc_id);
+            """
+        )
+
+    def add(self, ids: list[str], texts: list[str], metadatas: list[Optional[dict]]):
+        """Insert or replace documents in the index."""
+        with self._connect() as conn:
+            self._delete_ids(conn, ids)
+
+            for doc_id, text, metadata in zip(ids, texts, metadatas):
+                metadata = metadata or {}
+                text = text or ""
+                tokens = Counter(tokenize(text))
+                metadata_tokens = Counter(tokenize(get_metadata_text(metadata)))
+
+                conn.execute(
+                    "INSERT INTO doc (id, text, metadata, length, metadata_length) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        doc_id,
+                        text,
+                        json.dumps(metadata, default=str),
+                        sum(tokens.values()),
+                        sum(metadata_tokens.values()),
+                    ),
+                )
+                conn.executemany(
+                    "INSERT INTO posting (term, doc_id, tf, metadata_tf) VALUES (?, ?, ?, ?)",
+                    [
+                        (
+                            term,
+                            doc_id,
+                            tokens.get(term, 0),
+                            metadata_tokens.get(term, 0),
+                        )
+                        for term in tokens.keys() | metadata_tokens.keys()
+                    ],
+                )
+
+    def delete(self, ids: Optional[list[str]] = None, filter: Optional[dict] = None):
+        with self._connect() as conn:
+            if filter:
+                clauses = " AND ".join(["json_extract(metadata, ?) = ?"] * len(filter))
+                params = []
+                for key, value in filter.items():
+                    params.extend([f'$."{key}"', value])
+                matched = [
+                    row[0]
+                    for row in conn.execute(
+                        f"SELECT id FROM doc WHERE {clauses}", params
+                    ).fetchall()
+                ]
+                ids = [doc_id for doc_id in matched if ids is None or doc_id in ids]
+
+            if ids:
+                self._delete_ids(conn, ids)
+
+    @staticmethod
+    def _delete_ids(conn: sqlite3.Connection, ids: list[str]):
+        conn.executemany("DELETE FROM posting WHERE doc_id = ?", [(i,) for i in ids])
+        conn.executemany("DELETE FROM doc WHERE id = ?", [(i,) for i in ids])
+
+    def count(self) -> int:
+        if not self.exists():
+            return 0
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM doc").fetchone()[0]
+
+    def get_ids(self) -> list[str]:
+        if not self.exists():
+            return []
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT id FROM doc")]
+
+    def search(
+        self, query: str, k: int, enriched: bool = False
+    ) -> list[tuple[float, str, dict]]:
+        """Return up to k (score, text, metadata) tuples, best match first."""
+        query_terms = Counter(tokenize(query))
+        if not query_terms or not self.exists():
+            return []
+
+        tf_expr = "p.tf + p.metadata_tf" if enriched else "p.tf"
+        length_expr = "d.length + d.metadata_length" if enriched else "d.length"
+
+        with self._connect() as conn:
+            total, total_length = conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM({length_expr}), 0) FROM doc d"
+            ).fetchone()
+            if total == 0:
+                return []
+            avg_length = total_length / total or 1
+
+            postings = {}
+            for term, doc_id, tf, length in conn.execute(
+                f"SELECT p.term, p.doc_id, {tf_expr}, {length_expr} "
+                "FROM posting p JOIN doc d ON d.id = p.doc_id "
+                f"WHERE p.term IN ({','.join('?' * len(query_terms))}) AND {tf_expr} > 0",
+                list(query_terms.keys()),
+            ):
+                postings.setdefault(term, []).append((doc_id, tf, length))
+
+            scores = {}
+            for term, term_postings in postings.items():
+                df = len(term_postings)
+                idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+                for doc_id, tf, length in term_postings:
+                    score = idf * (
+                        tf
+                        * (self.k1 + 1)
+                        / (tf + self.k1 * (1 - self.b + self.b * length / avg_length))
+                    )
+                    scores[doc_id] = scores.get(doc_id, 0) + score * query_terms[term]
+
+            top = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:k]
+            if not top:
+                return []
+
+            docs = {
+                doc_id: (text, json.loads(metadata) if metadata else {})
+                for doc_id, text, metadata in conn.execute(
+                    f"SELECT id, text, metadata FROM doc WHERE id IN ({','.join('?' * len(top))})",
+                    [doc_id for doc_id, _ in top],
+                )
+            }
+
+        return [
+            (score, docs[doc_id][0], docs[doc_id][1])
+            for doc_id, score in top
+            if doc_id in docs
+        ]
+
+
+class BM25IndexRetriever(BaseRetriever):
+    index: Any
+    k: int
+    enriched: bool = False
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        return [
+            Document(page_content=text, metadata=metadata)
+            for _, text, metadata in self.index.search(
+                query, self.k, enriched=self.enriched
+            )
+        ]
+
+
+def get_bm25_index_dir(collection_name: str) -> str:
+    return os.path.join(
+        RAG_BM25_INDEX_DIR, re.sub(r"[^A-Za-z0-9_.-]", "_", collection_name)
+    )
+
+
+def _read_bm25_index_versions(index_dir: str) -> list[str]:
+    """The current index version, followed by the one it replaced, if any."""
+    try:
+        with open(os.path.join(index_dir, "current")) as f:
+            return f.read().split()
+    except FileNotFoundError:
+        return []
+
+
+def get_bm25_index(collection_name: str) -> Optional[BM25Index]:
+    """
+    The current index of a collection, or None if none has been built.
+
+    Each build is written to a new file and published by switching the
+    "current" pointer, so a SQLite file (and its WAL) is never replaced
+    under a connection that has it open.
+    """
+    index_dir = get_bm25_index_dir(collection_name)
+    versions = _read_bm25_index_versions(index_dir)
+    if not versions:
+        return None
+    return BM25Index(os.path.join(index_dir, f"{versions[0]}.db"))
+
+
+def build_bm25_index(
+    collection_name: str,
+    ids: list[str],
+    texts: list[str],
+    metadatas: list[Optional[dict]],
+) -> BM25Index:
+    """
+    Build a new index for a collection and make it the current one. The
+    index it replaces is kept until the next build, for queries that opened
+    it just before the switch.
+    """
+    index_dir = get_bm25_index_dir(collection_name)
+    version = uuid.uuid4().hex
+    index = BM25Index(os.path.join(index_dir, f"{version}.db"), create=True)
+    try:
+        index.add(ids, texts, metadatas)
+    except Exception:
+        _remove_bm25_index_files(index_dir, version)
+        raise
+
+    previous = _read_bm25_index_versions(index_dir)
+    pointer_path = os.path.join(index_dir, f"current.{version}.tmp")
+    with open(pointer_path, "w") as f:
+        f.write(" ".join([version, *previous[:1]]))
+    os.replace(pointer_path, os.path.join(index_dir, "current"))
+
+    for stale_version in previous[1:]:
+        _remove_bm25_index_files(index_dir, stale_version)
+
+    return BM25Index(index.path)
+
+
+def _remove_bm25_index_files(index_dir: str, version: str):
+    path = os.path.join(index_dir, f"{version}.db")
+    for suffix in ["", "-wal", "-shm"]:
+        try:
+            os.remove(f"{path}{suffix}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            log.warning(f"Error removing BM25 index {path}{suffix}: {e}")
+
+
+def add_to_bm25_index(collection_name: str, items: list[dict]):
+    """Add vector DB items to the collection index, if one has been built."""
+    index = get_bm25_index(collection_name)
+    if index is None:
+        # Built from the vector DB on first hybrid query
+        return
+
+    try:
+        index.add(
+            [item["id"] for item in items],
+            [item["text"] for item in items],
+            [item.get("metadata") for item in items],
+        )
+    except Exception as e:
+        log.exception(f"Error updating BM25 index for {collection_name}: {e}")
+        delete_bm25_index(collection_name)
+
+
+def delete_from_bm25_index(
+    collection_name: str,
+    ids: Optional[list[str]] = None,
+    filter: Optional[dict] = None,
+):
+    index = get_bm25_index(collection_name)
+    if index is None:
+        return
+
+    try:
+        index.delete(ids=ids, filter=filter)
+    except Exception as e:
+        log.exception(f"Error updating BM25 index for {collection_name}: {e}")
+        delete_bm25_index(collection_name)
+
+
+def delete_bm25_index(collection_name: str):
+    shutil.rmtree(get_bm25_index_dir(collection_name), ignore_errors=True)
+
+
+def reset_bm25_indexes():
+    shutil.rmtree(RAG_BM25_INDEX_DIR, ignore_errors=True)
@@ -0,0 +1,202 @@
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from array import array
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Optional
+
+from open_webui.config import (
+    ENABLE_RAG_EMBEDDING_CACHE,
+    RAG_EMBEDDING_CACHE_DIR,
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES,
+)
+
+log = logging.getLogger(__name__)
+
+# SQLite limits the number of parameters per statement
+LOOKUP_BATCH_SIZE = 500
+
+# Number of vectors written between checks against max_entries
+PRUNE_INTERVAL = 1000
+
+
+def get_text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding store in SQLite, keyed by engine, model, prefix
+    and the SHA-256 of the embedded text. Vectors are stored as float32.
+    """
+
+    def __init__(self, path: str, max_entries: int = 0):
+        self.path = path
+        self.max_entries = max_entries
+        # Written since the last check; starts full so the first write checks
+        self._unpruned = PRUNE_INTERVAL
+
+    @contextmanager
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS embedding (
+                        engine TEXT NOT NULL,
+                        model TEXT NOT NULL,
+                        prefix TEXT NOT NULL,
+                        text_hash TEXT NOT NULL,
+                        vector BLOB NOT NULL,
+                        created_at INTEGER NOT NULL,
+                        PRIMARY KEY (engine, model, prefix, text_hash)
+                    ) WITHOUT ROWID
+                    """
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS embedding_created_at_idx "
+                    "ON embedding (created_at)"
+                )
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(
+        self, engine: str, model: str, prefix: Optional[str], text_hashes: list[str]
+    ) -> dict[str, list[float]]:
+        """Cached vectors by text hash; hashes that are not cached are left out."""
+        vectors = {}
+        if not text_hashes:
+            return vectors
+
+        with self._connect() as conn:
+            for i in range(0, len(text_hashes), LOOKUP_BATCH_SIZE):
+                batch = text_hashes[i : i + LOOKUP_BATCH_SIZE]
+                for text_hash, vector in conn.execute(
+                    "SELECT text_hash, vector FROM embedding "
+                    "WHERE engine = ? AND model = ? AND prefix = ? "
+                    f"AND text_hash IN ({','.join('?' * len(batch))})",
+                    [engine, model, prefix or "", *batch],
+                ):
+                    vectors[text_hash] = array("f", vector).tolist()
+
+        return vectors
+
+    def set_many(
+        self,
+        engine: str,
+        model: str,
+        prefix: Optional[str],
+        vectors: dict[str, list[float]],
+    ):
+        if not vectors:
+            return
+
+        now = int(time.time())
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embedding "
+                "(engine, model, prefix, text_hash, vector, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        engine,
+                        model,
+                        prefix or "",
+                        text_hash,
+                        array("f", vector).tobytes(),
+                        now,
+                    )
+                    for text_hash, vector in vectors.items()
+                ],
+            )
+
+            self._unpruned += len(vectors)
+            if self.max_entries > 0 and self._unpruned >= PRUNE_INTERVAL:
+                self._unpruned = 0
+                overflow = (
+                    conn.execute("SELECT COUNT(*) FROM embedding").fetchone()[0]
+                    - self.max_entries
+                )
+                if overflow > 0:
+                    # Oldest entries go first
+                    conn.execute(
+                        "DELETE FROM embedding WHERE (engine, model, prefix, text_hash) IN "
+                        "(SELECT engine, model, prefix, text_hash FROM embedding "
+                        "ORDER BY created_at LIMIT ?)",
+                        (overflow,),
+                    )
+
+
+EMBEDDING_CACHE = EmbeddingCache(
+    os.path.join(RAG_EMBEDDING_CACHE_DIR, "embeddings.db"),
+    max_entries=RAG_EMBEDDING_CACHE_MAX_ENTRIES,
+)
+
+
+def get_persistent_embedding_function(
+    embedding_function, engine: str, model: str
+) -> Callable[..., Awaitable]:
+    """
+    Wrap an embedding function so that texts embedded before by the same engine,
+    model and prefix are read from EMBEDDING_CACHE. Only the remaining texts are
+    sent to the embedding backend, and their vectors are stored for next time.
+    """
+    if not ENABLE_RAG_EMBEDDING_CACHE:
+        return embedding_function
+
+    async def cached_embedding_function(query, prefix=None, user=None):
+        texts = query if isinstance(query, list) else [query]
+        text_hashes = [get_text_hash(text) for text in texts]
+
+        try:
+            cached = await asyncio.to_thread(
+                EMBEDDING_CACHE.get_many, engine, model, prefix, text_hashes
+            )
+        except Exception as e:
+            log.warning(f"Failed to read embedding cache: {e}")
+            cached = {}
+
+        missing = {}
+        for text, text_hash in zip(texts, text_hashes):
+            if text_hash not in cached and text_hash not in missing:
+                missing[text_hash] = text
+
+        if missing:
+            log.debug(
+                f"Embedding cache: {len(texts) - len(missing)} cached, {len(missing)} to embed"
+            )
+            vectors = await embedding_function(
+                list(missing.values()), prefix=prefix, user=user
+            )
+            if not vectors or len(vectors) != len(missing):
+                if not cached:
+                    # Leave error handling to the caller, as without the cache
+                    return (
+                        vectors
+                        if isinstance(query, list) or not vectors
+                        else vectors[0]
+                    )
+                raise ValueError(
+                    f"Expected {len(missing)} embeddings, got {len(vectors or [])}"
+                )
+
+            new_vectors = dict(zip(missing.keys(), vectors))
+            try:
+                await asyncio.to_thread(
+                    EMBEDDING_CACHE.set_many, engine, model, prefix, new_vectors
+                )
+            except Exception as e:
+                log.warning(f"Failed to write embedding cache: {e}")
+            cached.update(new_vectors)
+
+        vectors = [cached[text_hash] for text_hash in text_hashes]
+        return vectors if isinstance(query, list) else vectors[0]
+
+    return cached_embedding_function
@@ -0,0 +1,580 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from array import array
+from contextlib import contextmanager
+from typing import Optional
+
+from fastapi import Request
+
+from open_webui.config import (
+    RAG_EMBEDDING_CONTENT_PREFIX,
+    RAG_REINDEX_CONCURRENCY,
+    RAG_REINDEX_DIR,
+)
+from open_webui.models.files import Files
+from open_webui.models.knowledge import Knowledges
+from open_webui.retrieval.bm25 import delete_bm25_index
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.routers.retrieval import get_processed_file_docs, split_docs
+from open_webui.utils.misc import calculate_sha256_string, sanitize_text_for_db
+
+log = logging.getLogger(__name__)
+
+# Staged chunks are copied into the live collection in batches of this size
+SWAP_BATCH_SIZE = 500
+
+# A running job refreshes its heartbeat this often; a job that has not done so
+# for STALE_AFTER seconds is assumed to have died with its worker.
+HEARTBEAT_INTERVAL = 10
+STALE_AFTER = 60
+
+
+class ReindexStore:
+    """
+    Checkpoint of knowledge reindex jobs in SQLite: the files each job has to
+    process, the chunks it has embedded so far, and which knowledge bases have
+    been swapped over to their rebuilt chunks.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @contextmanager
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(
+                    """
+                    CREATE TABLE IF NOT EXISTS job (
+                        id TEXT PRIMARY KEY,
+                        user_id TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        error TEXT,
+                        created_at INTEGER NOT NULL,
+                        updated_at INTEGER NOT NULL
+                    );
+                    CREATE TABLE IF NOT EXISTS job_knowledge (
+                        job_id TEXT NOT NULL,
+                        knowledge_id TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        PRIMARY KEY (job_id, knowledge_id)
+                    );
+                    CREATE TABLE IF NOT EXISTS job_file (
+                        job_id TEXT NOT NULL,
+                        knowledge_id TEXT NOT NULL,
+                        file_id TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        error TEXT,
+                        PRIMARY KEY (job_id, knowledge_id, file_id)
+                    );
+                    CREATE TABLE IF NOT EXISTS chunk (
+                        job_id TEXT NOT NULL,
+                        knowledge_id TEXT NOT NULL,
+                        file_id TEXT NOT NULL,
+                        id TEXT NOT NULL,
+                        text TEXT NOT NULL,
+                        metadata TEXT NOT NULL,
+                        vector BLOB NOT NULL,
+                        PRIMARY KEY (job_id, knowledge_id, id)
+                    );
+                    """
+                )
+                yield conn
+        finally:
+            conn.close()
+
+    def create_job(self, user_id: str, files: dict[str, list[str]]) -> str:
+        job_id = str(uuid.uuid4())
+        now = int(time.time())
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO job (id, user_id, status, created_at, updated_at) "
+                "VALUES (?, ?, 'running', ?, ?)",
+                (job_id, user_id, now, now),
+            )
+            conn.executemany(
+                "INSERT INTO job_knowledge (job_id, knowledge_id, status) "
+                "VALUES (?, ?, 'pending')",
+                [(job_id, knowledge_id) for knowledge_id in files],
+            )
+            conn.executemany(
+                "INSERT INTO job_file (job_id, knowledge_id, file_id, status) "
+                "VALUES (?, ?, ?, 'pending')",
+                [
+                    (job_id, knowledge_id, file_id)
+                    for knowledge_id, file_ids in files.items()
+                    for file_id in file_ids
+                ],
+            )
+        return job_id
+
+    def get_latest_job(self) -> Optional[dict]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, user_id, status, error, created_at, updated_at FROM job "
+                "ORDER BY created_at DESC LIMIT 1"
+            ).fetchone()
+
+        if row is None:
+            return None
+        return dict(
+            zip(["id", "user_id", "status", "error", "created_at", "updated_at"], row)
+        )
+
+    def update_job(self, job_id: str, status: Optional[str] = None, error=None):
+        with self._connect() as conn:
+            if status:
+                conn.execute(
+                    "UPDATE job SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                    (status, error, int(time.time()), job_id),
+                )
+            else:
+                conn.execute(
+                    "UPDATE job SET updated_at = ? WHERE id = ?",
+                    (int(time.time()), job_id),
+                )
+
+    def get_pending_files(self, job_id: str) -> list[tuple[str, str]]:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT knowledge_id, file_id FROM job_file "
+                "WHERE job_id = ? AND status = 'pending'",
+                (job_id,),
+            ).fetchall()
+
+    def get_pending_knowledge(self, job_id: str) -> dict[str, int]:
+        """Knowledge bases that have not been swapped, by number of pending files."""
+        with self._connect() as conn:
+            return dict(
+                conn.execute(
+                    "SELECT k.knowledge_id, COUNT(f.file_id) FROM job_knowledge k "
+                    "LEFT JOIN job_file f ON f.job_id = k.job_id "
+                    "AND f.knowledge_id = k.knowledge_id AND f.status = 'pending' "
+                    "WHERE k.job_id = ? AND k.status = 'pending' "
+                    "GROUP BY k.knowledge_id",
+                    (job_id,),
+                ).fetchall()
+            )
+
+    def get_file_ids(self, job_id: str, knowledge_id: str) -> set[str]:
+        with self._connect() as conn:
+            return {
+                file_id
+                for (file_id,) in conn.execute(
+                    "SELECT file_id FROM job_file WHERE job_id = ? AND knowledge_id = ?",
+                    (job_id, knowledge_id),
+                )
+            }
+
+    def add_files(self, job_id: str, knowledge_id: str, file_ids: list[str]):
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO job_file (job_id, knowledge_id, file_id, status) "
+                "VALUES (?, ?, ?, 'pending')",
+                [(job_id, knowledge_id, file_id) for file_id in file_ids],
+            )
+
+    def stage_file(self, job_id: str, knowledge_id: str, file_id: str, items):
+        """Store the embedded chunks of a file and mark it as done, atomically."""
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM chunk WHERE job_id = ? AND knowledge_id = ? AND file_id = ?",
+                (job_id, knowledge_id, file_id),
+            )
+            conn.executemany(
+                "INSERT INTO chunk "
+                "(job_id, knowledge_id, file_id, id, text, metadata, vector) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        job_id,
+                        knowledge_id,
+                        file_id,
+                        item["id"],
+                        item["text"],
+                        json.dumps(item["metadata"]),
+                        array("f", item["vector"]).tobytes(),
+                    )
+                    for item in items
+                ],
+            )
+            conn.execute(
+                "UPDATE job_file SET status = 'staged' "
+                "WHERE job_id = ? AND knowledge_id = ? AND file_id = ?",
+                (job_id, knowledge_id, file_id),
+            )
+
+    def fail_file(self, job_id: str, knowledge_id: str, file_id: str, error: str):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE job_file SET status = 'failed', error = ? "
+                "WHERE job_id = ? AND knowledge_id = ? AND file_id = ?",
+                (error, job_id, knowledge_id, file_id),
+            )
+
+    def iter_chunks(self, job_id: str, knowledge_id: str, file_ids: set[str]):
+        """Staged chunks of the given files, in batches of vector DB items."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "SELECT file_id, id, text, metadata, vector FROM chunk "
+                "WHERE job_id = ? AND knowledge_id = ?",
+                (job_id, knowledge_id),
+            )
+            while rows := cursor.fetchmany(SWAP_BATCH_SIZE):
+                items = [
+                    {
+                        "id": id,
+                        "text": text,
+                        "vector": array("f", vector).tolist(),
+                        "metadata": json.loads(metadata),
+                    }
+                    for file_id, id, text, metadata, vector in rows
+                    if file_id in file_ids
+                ]
+                if items:
+                    yield items
+
+    def finish_knowledge(self, job_id: str, knowledge_id: str):
+        """Mark a knowledge base as swapped and drop its staged chunks."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE job_knowledge SET status = 'swapped' "
+                "WHERE job_id = ? AND knowledge_id = ?",
+                (job_id, knowledge_id),
+            )
+            conn.execute(
+                "DELETE FROM chunk WHERE job_id = ? AND knowledge_id = ?",
+                (job_id, knowledge_id),
+            )
+
+    def get_status(self, job_id: str) -> dict:
+        with self._connect() as conn:
+            knowledge = dict(
+                conn.execute(
+                    "SELECT status, COUNT(*) FROM job_knowledge WHERE job_id = ? "
+                    "GROUP BY status",
+                    (job_id,),
+                ).fetchall()
+            )
+            files = dict(
+                conn.execute(
+                    "SELECT status, COUNT(*) FROM job_file WHERE job_id = ? "
+                    "GROUP BY status",
+                    (job_id,),
+                ).fetchall()
+            )
+            failed_files = [
+                {"knowledge_id": knowledge_id, "file_id": file_id, "error": error}
+                for knowledge_id, file_id, error in conn.execute(
+                    "SELECT knowledge_id, file_id, error FROM job_file "
+                    "WHERE job_id = ? AND status = 'failed'",
+                    (job_id,),
+                )
+            ]
+
+        return {
+            "knowledge_bases": {
+                "total": sum(knowledge.values()),
+                "completed": knowledge.get("swapped", 0),
+                "pending": knowledge.get("pending", 0),
+            },
+            "files": {
+                "total": sum(files.values()),
+                "completed": files.get("staged", 0),
+                "failed": files.get("failed", 0),
+            },
+            "failed_files": failed_files,
+        }
+
+
+REINDEX_STORE = ReindexStore(os.path.join(RAG_REINDEX_DIR, "reindex.db"))
+
+
+class ReindexJob:
+    """
+    Rebuilds the collection of every knowledge base from its files.
+
+    Files flow through loading, splitting, embedding and staging stages that run
+    concurrently, each with its own workers. Embedded chunks are checkpointed in
+    REINDEX_STORE rather than written to the vector DB, so the live collection
+    keeps serving searches while the job runs. Once every file of a knowledge
+    base is staged, its collection is replaced with the staged chunks.
+    """
+
+    def __init__(self, request: Request, user, job_id: str):
+        self.request = request
+        self.user = user
+        self.job_id = job_id
+        self.concurrency = RAG_REINDEX_CONCURRENCY
+
+    async def _load(self, knowledge_id: str, file_id: str):
+        file = await asyncio.to_thread(Files.get_file_by_id, file_id)
+        if file is None:
+            raise ValueError("File not found")
+
+        docs = await asyncio.to_thread(get_processed_file_docs, file)
+        metadata = {
+            "file_id": file.id,
+            "name": file.filename,
+            "hash": calculate_sha256_string(file.data.get("content", "")),
+        }
+        return docs, metadata
+
+    async def _split(self, knowledge_id: str, file_id: str, docs_metadata):
+        docs, metadata = docs_metadata
+        docs = await asyncio.to_thread(split_docs, self.request, docs)
+        if len(docs) == 0:
+            raise ValueError("Empty content")
+
+        config = self.request.app.state.config
+        return [
+            {
+                "id": str(uuid.uuid4()),
+                "text": sanitize_text_for_db(doc.page_content),
+                "metadata": {
+                    **doc.metadata,
+                    **metadata,
+                    "embedding_config": {
+                        "engine": config.RAG_EMBEDDING_ENGINE,
+                        "model": config.RAG_EMBEDDING_MODEL,
+                    },
+                },
+            }
+            for doc in docs
+        ]
+
+    async def _embed(self, knowledge_id: str, file_id: str, items: list[dict]):
+        embeddings = await self.request.app.state.EMBEDDING_FUNCTION(
+            [item["text"].replace("\n", " ") for item in items],
+            prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+            user=self.user,
+        )
+        if not embeddings or len(embeddings) != len(items):
+            raise ValueError("Failed to generate embeddings")
+
+        return [
+            {**item, "vector": embedding} for item, embedding in zip(items, embeddings)
+        ]
+
+    async def _stage(self, in_queue: asyncio.Queue, out_queue: asyncio.Queue, fn):
+        while (entry := await in_queue.get()) is not None:
+            knowledge_id, file_id, value = entry
+            if not isinstance(value, Exception):
+                try:
+                    value = await fn(knowledge_id, file_id, value)
+                except Exception as e:
+                    log.error(
+                        f"Error reindexing file {file_id} in knowledge base {knowledge_id}: {e}"
+                    )
+                    value = e
+            await out_queue.put((knowledge_id, file_id, value))
+
+    def _swap(self, knowledge_id: str) -> bool:
+        """
+        Replace the live collection with the staged chunks. Files that have left
+        the knowledge base since the job started are dropped.
+
+        If this fails partway, the staged chunks are kept and the knowledge base
+        stays pending, so resuming the job replaces the collection again.
+        """
+        file_ids = {
+            file.id for file in Knowledges.get_files_by_id(knowledge_id=knowledge_id)
+        }
+        try:
+            if VECTOR_DB_CLIENT.has_collection(collection_name=knowledge_id):
+                VECTOR_DB_CLIENT.delete_collection(collection_name=knowledge_id)
+            delete_bm25_index(knowledge_id)
+
+            for items in REINDEX_STORE.iter_chunks(self.job_id, knowledge_id, file_ids):
+                VECTOR_DB_CLIENT.insert(collection_name=knowledge_id, items=items)
+        except Exception as e:
+            log.exception(f"Error swapping collection {knowledge_id}: {e}")
+            return False
+
+        REINDEX_STORE.finish_knowledge(self.job_id, knowledge_id)
+        return True
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            await asyncio.to_thread(REINDEX_STORE.update_job, self.job_id)
+
+    async def run(self):
+        heartbeat = asyncio.create_task(self._heartbeat())
+        try:
+            await self._run()
+            await asyncio.to_thread(REINDEX_STORE.update_job, self.job_id, "completed")
+            log.info(f"Reindex job {self.job_id} completed")
+        except asyncio.CancelledError:
+            # Left as running, so that it is resumed once its heartbeat is stale
+            raise
+        except Exception as e:
+            log.exception(f"Reindex job {self.job_id} failed: {e}")
+            await asyncio.to_thread(
+                REINDEX_STORE.update_job, self.job_id, "failed", str(e)
+            )
+        finally:
+            heartbeat.cancel()
+
+    async def _run(self):
+        remaining = await asyncio.to_thread(
+            REINDEX_STORE.get_pending_knowledge, self.job_id
+        )
+        pending_files = await asyncio.to_thread(
+            REINDEX_STORE.get_pending_files, self.job_id
+        )
+        log.info(
+            f"Reindex job {self.job_id}: {len(pending_files)} files in {len(remaining)} knowledge bases"
+        )
+
+        # Only file ids are queued for loading, so that queue is unbounded and new
+        # files can be fed back into it; later stages hold documents and vectors.
+        load_queue = asyncio.Queue()
+        split_queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        embed_queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        stage_queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        stages = [
+            (load_queue, split_queue, lambda k, f, _: self._load(k, f)),
+            (split_queue, embed_queue, self._split),
+            (embed_queue, stage_queue, self._embed),
+        ]
+        failed_swaps = []
+        workers = {
+            in_queue: [
+                asyncio.create_task(self._stage(in_queue, out_queue, fn))
+                for _ in range(self.concurrency)
+            ]
+            for in_queue, out_queue, fn in stages
+        }
+
+        async def complete(knowledge_id: str):
+            # Files added to the knowledge base in the meantime are indexed
+            # before its collection is replaced
+            current = {
+                file.id
+                for file in await asyncio.to_thread(
+                    Knowledges.get_files_by_id, knowledge_id
+                )
+            }
+            known = await asyncio.to_thread(
+                REINDEX_STORE.get_file_ids, self.job_id, knowledge_id
+            )
+            added = list(current - known)
+            if added:
+                await asyncio.to_thread(
+                    REINDEX_STORE.add_files, self.job_id, knowledge_id, added
+                )
+                remaining[knowledge_id] = len(added)
+                for file_id in added:
+                    load_queue.put_nowait((knowledge_id, file_id, None))
+                return
+
+            if await asyncio.to_thread(self._swap, knowledge_id):
+                log.info(
+                    f"Reindex job {self.job_id}: knowledge base {knowledge_id} swapped"
+                )
+            else:
+                failed_swaps.append(knowledge_id)
+            remaining.pop(knowledge_id, None)
+
+        try:
+            for knowledge_id, file_id in pending_files:
+                load_queue.put_nowait((knowledge_id, file_id, None))
+
+            # Knowledge bases without pending files, e.g. staged before a restart
+            for knowledge_id in [k for k, count in remaining.items() if count == 0]:
+                await complete(knowledge_id)
+
+            while remaining:
+                knowledge_id, file_id, value = await stage_queue.get()
+                if isinstance(value, Exception):
+                    await asyncio.to_thread(
+                        REINDEX_STORE.fail_file,
+                        self.job_id,
+                        knowledge_id,
+                        file_id,
+                        str(value),
+                    )
+                else:
+                    await asyncio.to_thread(
+                        REINDEX_STORE.stage_file,
+                        self.job_id,
+                        knowledge_id,
+                        file_id,
+                        value,
+                    )
+
+                remaining[knowledge_id] -= 1
+                if remaining[knowledge_id] == 0:
+                    await complete(knowledge_id)
+
+            if failed_swaps:
+                raise RuntimeError(
+                    f"Failed to replace the collections of knowledge bases "
+                    f"{', '.join(failed_swaps)}, run the reindex again to retry"
+                )
+        finally:
+            for tasks in workers.values():
+                for task in tasks:
+                    task.cancel()
+            await asyncio.gather(
+                *[task for tasks in workers.values() for task in tasks],
+                return_exceptions=True,
+            )
+
+
+# Job running in this worker, if any
+reindex_task: Optional[asyncio.Task] = None
+
+
+def get_reindex_status() -> Optional[dict]:
+    job = REINDEX_STORE.get_latest_job()
+    if job is None:
+        return None
+    return {**job, **REINDEX_STORE.get_status(job["id"])}
+
+
+async def start_reindex(request: Request, user) -> dict:
+    """
+    Start a reindex job in the background, or resume the last one if it was
+    interrupted or left knowledge bases pending. A job that is still running is
+    left alone.
+    """
+    global reindex_task
+
+    job = await asyncio.to_thread(REINDEX_STORE.get_latest_job)
+    if job and job["status"] == "running":
+        running_here = reindex_task is not None and not reindex_task.done()
+        if running_here or time.time() - job["updated_at"] < STALE_AFTER:
+            return await asyncio.to_thread(get_reindex_status)
+
+    if job and (
+        job["status"] == "running"
+        or await asyncio.to_thread(REINDEX_STORE.get_pending_knowledge, job["id"])
+    ):
+        log.info(f"Resuming reindex job {job['id']}")
+        job_id = job["id"]
+        await asyncio.to_thread(REINDEX_STORE.update_job, job_id, "running")
+    else:
+        files = {}
+        for knowledge_base in await asyncio.to_thread(Knowledges.get_knowledge_bases):
+            files[knowledge_base.id] = [
+                file.id
+                for file in await asyncio.to_thread(
+                    Knowledges.get_files_by_id, knowledge_base.id
+                )
+            ]
+        job_id = await asyncio.to_thread(REINDEX_STORE.create_job, user.id, files)
+        log.info(f"Starting reindex job {job_id} for {len(files)} knowledge bases")
+
+    reindex_task = asyncio.create_task(ReindexJob(request, user, job_id).run())
+    return await asyncio.to_thread(get_reindex_status)
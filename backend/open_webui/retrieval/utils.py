@@ -1,12 +1,12 @@
 import logging
 import os
-from typing import Awaitable, Optional, Union
+from typing import Awaitable, Callable, Optional, Union
 
 import requests
 import aiohttp
 import asyncio
 import hashlib
-from concurrent.futures import ThreadPoolExecutor
+import threading
 import time
 import re
 
@@ -19,8 +19,20 @@ from langchain_classic.retrievers import (
 from langchain_community.retrievers import BM25Retriever
 from langchain_core.documents import Document
 
-from open_webui.config import VECTOR_DB
+from open_webui.config import (
+    VECTOR_DB,
+    ENABLE_RAG_BM25_INDEX,
+    RAG_COLLECTION_SEARCH_CONCURRENCY,
+)
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import (
+    BM25Index,
+    BM25IndexRetriever,
+    build_bm25_index,
+    get_bm25_index,
+    get_metadata_text,
+)
+from open_webui.retrieval.embedding_cache import get_persistent_embedding_function
 
 
 from open_webui.models.users import UserModel
@@ -114,7 +126,8 @@ class VectorSearchRetriever(BaseRetriever):
         run_manager: CallbackManagerForRetrieverRun,
     ) -> list[Document]:
         embedding = await self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
-        result = VECTOR_DB_CLIENT.search(
+        result = await asyncio.to_thread(
+            VECTOR_DB_CLIENT.search,
             collection_name=self.collection_name,
             vectors=[embedding],
             limit=self.top_k,
@@ -172,37 +185,8 @@ def get_doc(collection_name: str, user: UserModel = None):
 def get_enriched_texts(collection_result: GetResult) -> list[str]:
     enriched_texts = []
     for idx, text in enumerate(collection_result.documents[0]):
-        metadata = collection_result.metadatas[0][idx]
-        metadata_parts = [text]
-
-        # Add filename (repeat twice for extra weight in BM25 scoring)
-        if metadata.get("name"):
-            filename = metadata["name"]
-            filename_tokens = (
-                filename.replace("_", " ").replace("-", " ").replace(".", " ")
-            )
-            metadata_parts.append(
-                f"Filename: {filename} {filename_tokens} {filename_tokens}"
-            )
-
-        # Add title if available
-        if metadata.get("title"):
-            metadata_parts.append(f"Title: {metadata['title']}")
-
-        # Add document section headings if available (from markdown splitter)
-        if metadata.get("headings") and isinstance(metadata["headings"], list):
-            headings = " > ".join(str(h) for h in metadata["headings"])
-            metadata_parts.append(f"Section: {headings}")
-
-        # Add source URL/path if available
-        if metadata.get("source"):
-            metadata_parts.append(f"Source: {metadata['source']}")
-
-        # Add snippet for web search results
-        if metadata.get("snippet"):
-            metadata_parts.append(f"Snippet: {metadata['snippet']}")
-
-        enriched_texts.append(" ".join(metadata_parts))
+        metadata_text = get_metadata_text(collection_result.metadatas[0][idx])
+        enriched_texts.append(f"{text} {metadata_text}" if metadata_text else text)
 
     return enriched_texts
 
@@ -218,39 +202,50 @@ async def query_doc_with_hybrid_search(
     r: float,
     hybrid_bm25_weight: float,
     enable_enriched_texts: bool = False,
+    bm25_index: Optional[BM25Index] = None,
 ) -> dict:
     try:
-        # First check if collection_result has the required attributes
-        if (
-            not collection_result
-            or not hasattr(collection_result, "documents")
-            or not hasattr(collection_result, "metadatas")
-        ):
-            log.warning(f"query_doc_with_hybrid_search:no_docs {collection_name}")
-            return {"documents": [], "metadatas": [], "distances": []}
+        if bm25_index is not None:
+            if bm25_index.count() == 0:
+                log.warning(f"query_doc_with_hybrid_search:no_docs {collection_name}")
+                return {"documents": [], "metadatas": [], "distances": []}
+        else:
+            # First check if collection_result has the required attributes
+            if (
+                not collection_result
+                or not hasattr(collection_result, "documents")
+                or not hasattr(collection_result, "metadatas")
+            ):
+                log.warning(f"query_doc_with_hybrid_search:no_docs {collection_name}")
+                return {"documents": [], "metadatas": [], "distances": []}
 
-        # Now safely check the documents content after confirming attributes exist
-        if (
-            not collection_result.documents
-            or len(collection_result.documents) == 0
-            or not collection_result.documents[0]
-        ):
-            log.warning(f"query_doc_with_hybrid_search:no_docs {collection_name}")
-            return {"documents": [], "metadatas": [], "distances": []}
+            # Now safely check the documents content after confirming attributes exist
+            if (
+                not collection_result.documents
+                or len(collection_result.documents) == 0
+                or not collection_result.documents[0]
+            ):
+                log.warning(f"query_doc_with_hybrid_search:no_docs {collection_name}")
+                return {"documents": [], "metadatas": [], "distances": []}
 
         log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
 
-        bm25_texts = (
-            get_enriched_texts(collection_result)
-            if enable_enriched_texts
-            else collection_result.documents[0]
-        )
+        if bm25_index is not None:
+            bm25_retriever = BM25IndexRetriever(
+                index=bm25_index, k=k, enriched=enable_enriched_texts
+            )
+        else:
+            bm25_texts = (
+                get_enriched_texts(collection_result)
+                if enable_enriched_texts
+                else collection_result.documents[0]
+            )
 
-        bm25_retriever = BM25Retriever.from_texts(
-            texts=bm25_texts,
-            metadatas=collection_result.metadatas[0],
-        )
-        bm25_retriever.k = k
+            bm25_retriever = BM25Retriever.from_texts(
+                texts=bm25_texts,
+                metadatas=collection_result.metadatas[0],
+            )
+            bm25_retriever.k = k
 
         vector_search_retriever = VectorSearchRetriever(
             collection_name=collection_name,
@@ -385,6 +380,91 @@ def merge_and_sort_query_results(query_results: list[dict], k: int) -> dict:
     }
 
 
+# Seconds between comparing an index's chunk ids with the vector DB
+BM25_INDEX_VERIFY_INTERVAL = 60
+
+_bm25_index_verified_at = {}
+_bm25_index_build_locks = {}
+_bm25_index_build_locks_lock = threading.Lock()
+
+
+def _get_bm25_index_build_lock(collection_name: str) -> threading.Lock:
+    with _bm25_index_build_locks_lock:
+        return _bm25_index_build_locks.setdefault(collection_name, threading.Lock())
+
+
+def _is_bm25_index_current(collection_name: str, index: BM25Index) -> bool:
+    """
+    Whether an index still holds what the vector DB does. Chunks added on
+    another node change the count; a file re-processed on another node can
+    keep the count but replaces the chunk ids, which are compared at most
+    every BM25_INDEX_VERIFY_INTERVAL seconds.
+    """
+    try:
+        count = VECTOR_DB_CLIENT.count(collection_name=collection_name)
+    except Exception as e:
+        log.warning(f"Error counting items of {collection_name}: {e}")
+        return True
+
+    if count is not None:
+        index_count = index.count()
+        if count != index_count:
+            log.info(
+                f"BM25 index for {collection_name} is out of date "
+                f"({index_count} of {count} items), rebuilding"
+            )
+            return False
+
+    now = time.time()
+    if now - _bm25_index_verified_at.get(collection_name, 0) < (
+        BM25_INDEX_VERIFY_INTERVAL
+    ):
+        return True
+
+    try:
+        ids = VECTOR_DB_CLIENT.get_ids(collection_name=collection_name)
+    except Exception as e:
+        log.warning(f"Error listing items of {collection_name}: {e}")
+        return True
+
+    if ids is not None and set(ids) != set(index.get_ids()):
+        log.info(f"BM25 index for {collection_name} has changed items, rebuilding")
+        return False
+
+    _bm25_index_verified_at[collection_name] = now
+    return True
+
+
+def get_collection_bm25_index(collection_name: str) -> Optional[BM25Index]:
+    """
+    Return the BM25 index for a collection, building it on first use and
+    rebuilding it when it no longer matches the vector DB, e.g. after chunks
+    were added during a build or changed on another node.
+    """
+    index = get_bm25_index(collection_name)
+    if index is not None and _is_bm25_index_current(collection_name, index):
+        return index
+
+    with _get_bm25_index_build_lock(collection_name):
+        current = get_bm25_index(collection_name)
+        if current is not None and (index is None or current.path != index.path):
+            # Built by another thread while waiting for the lock
+            return current
+
+        result = VECTOR_DB_CLIENT.get(collection_name=collection_name)
+        if result is None:
+            return None
+
+        # Queries keep using the previous index until the new one is complete
+        index = build_bm25_index(
+            collection_name, result.ids[0], result.documents[0], result.metadatas[0]
+        )
+        _bm25_index_verified_at[collection_name] = time.time()
+
+    log.info(f"Built BM25 index for {collection_name} ({len(result.ids[0])} items)")
+    return index
+
+
 def get_all_items_from_collections(collection_names: list[str]) -> dict:
     results = []
 
@@ -434,15 +514,15 @@ async def query_collection(
         f"query_collection: processing {len(queries)} queries across {len(collection_names)} collections"
     )
 
-    with ThreadPoolExecutor() as executor:
-        future_results = []
-        for query_embedding in query_embeddings:
-            for collection_name in collection_names:
-                result = executor.submit(
-                    process_query_collection, collection_name, query_embedding
-                )
-                future_results.append(result)
-        task_results = [future.result() for future in future_results]
+    task_results = await asyncio.gather(
+        *[
+            asyncio.to_thread(
+                process_query_collection, collection_name, query_embedding
+            )
+            for query_embedding in query_embeddings
+            for collection_name in collection_names
+        ]
+    )
 
     for result, err in task_results:
         if err is not None:
@@ -472,13 +552,22 @@ async def query_collection_with_hybrid_search(
     # Fetch collection data once per collection sequentially
     # Avoid fetching the same data multiple times later
     collection_results = {}
+    bm25_indexes = {}
     for collection_name in collection_names:
         try:
+            if ENABLE_RAG_BM25_INDEX:
+                # Query the persistent BM25 index instead of fetching every chunk
+                collection_results[collection_name] = None
+                bm25_indexes[collection_name] = await asyncio.to_thread(
+                    get_collection_bm25_index, collection_name
+                )
+                continue
+
             log.debug(
                 f"query_collection_with_hybrid_search:VECTOR_DB_CLIENT.get:collection {collection_name}"
             )
-            collection_results[collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=collection_name
+            collection_results[collection_name] = await asyncio.to_thread(
+                VECTOR_DB_CLIENT.get, collection_name=collection_name
             )
         except Exception as e:
             log.exception(f"Failed to fetch collection {collection_name}: {e}")
@@ -501,6 +590,7 @@ async def query_collection_with_hybrid_search(
                 r=r,
                 hybrid_bm25_weight=hybrid_bm25_weight,
                 enable_enriched_texts=enable_enriched_texts,
+                bm25_index=bm25_indexes.get(collection_name),
             )
             return result, None
         except Exception as e:
@@ -512,7 +602,8 @@ async def query_collection_with_hybrid_search(
     tasks = [
         (collection_name, query)
         for collection_name in collection_names
-        if collection_results[collection_name] is not None
+        if collection_results.get(collection_name) is not None
+        or bm25_indexes.get(collection_name) is not None
         for query in queries
     ]
 
@@ -811,7 +902,9 @@ def get_embedding_function(
                 prefix,
             )
 
-        return async_embedding_function
+        return get_persistent_embedding_function(
+            async_embedding_function, embedding_engine, embedding_model
+        )
     elif embedding_engine in ["ollama", "openai", "azure_openai"]:
         embedding_function = lambda query, prefix=None, user=None: generate_embeddings(
             engine=embedding_engine,
@@ -865,11 +958,56 @@ def get_embedding_function(
             else:
                 return await embedding_function(query, prefix, user)
 
-        return async_embedding_function
+        return get_persistent_embedding_function(
+            async_embedding_function, embedding_engine, embedding_model
+        )
     else:
         raise ValueError(f"Unknown embedding engine: {embedding_engine}")
 
 
+def get_cached_embedding_function(embedding_function) -> Callable[..., Awaitable]:
+    """
+    Wrap an embedding function so that each distinct text is embedded once.
+    Texts that are not cached yet are embedded together in a single call, and
+    concurrent callers asking for the same text wait for the same result.
+    """
+    embeddings = {}
+
+    async def cached_embedding_function(query, prefix=None):
+        texts = query if isinstance(query, list) else [query]
+
+        missing = list(dict.fromkeys(t for t in texts if (prefix, t) not in embeddings))
+        if missing:
+            loop = asyncio.get_running_loop()
+            futures = {text: loop.create_future() for text in missing}
+            for text, future in futures.items():
+                embeddings[(prefix, text)] = future
+
+            try:
+                vectors = await embedding_function(missing, prefix=prefix)
+                if not vectors or len(vectors) != len(missing):
+                    raise ValueError(
+                        f"Expected {len(missing)} embeddings, got {len(vectors or [])}"
+                    )
+                for text, vector in zip(missing, vectors):
+                    futures[text].set_result(vector)
+            except (Exception, asyncio.CancelledError) as e:
+                # Let the next caller try again
+                for text, future in futures.items():
+                    embeddings.pop((prefix, text), None)
+                    if isinstance(e, asyncio.CancelledError):
+                        future.cancel()
+                    else:
+                        future.set_exception(e)
+                        future.exception()
+                raise
+
+        vectors = [await embeddings[(prefix, text)] for text in texts]
+        return vectors if isinstance(query, list) else vectors[0]
+
+    return cached_embedding_function
+
+
 async def generate_embeddings(
     engine: str,
     model: str,
@@ -951,6 +1089,11 @@ async def get_sources_from_items(
 
     extracted_collections = []
     query_results = []
+    collection_searches = []
+
+    # Each distinct query is embedded once and reused for every collection
+    if embedding_function is not None:
+        embedding_function = get_cached_embedding_function(embedding_function)
 
     for item in items:
         query_result = None
@@ -1148,49 +1291,89 @@ async def get_sources_from_items(
                 log.debug(f"skipping {item} as it has already been extracted")
                 continue
 
-            try:
-                if full_context:
-                    query_result = get_all_items_from_collections(collection_names)
-                else:
-                    query_result = None  # Initialize to None
-                    if hybrid_search:
-                        try:
-                            query_result = await query_collection_with_hybrid_search(
-                                collection_names=collection_names,
-                                queries=queries,
-                                embedding_function=embedding_function,
-                                k=k,
-                                reranking_function=reranking_function,
-                                k_reranker=k_reranker,
-                                r=r,
-                                hybrid_bm25_weight=hybrid_bm25_weight,
-                                enable_enriched_texts=request.app.state.config.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS,
-                            )
-                        except Exception as e:
-                            log.debug(
-                                "Error when using hybrid search, using non hybrid search as fallback."
-                            )
-
-                    # fallback to non-hybrid search
-                    if not hybrid_search and query_result is None:
-                        query_result = await query_collection(
-                            collection_names=collection_names,
-                            queries=queries,
-                            embedding_function=embedding_function,
-                            k=k,
-                        )
-            except Exception as e:
-                log.exception(e)
-
+            # Searched below, once all items have been resolved
+            collection_searches.append((len(query_results), item, collection_names))
+            query_results.append(None)
             extracted_collections.extend(collection_names)
+            continue
 
         if query_result:
             if "data" in item:
                 del item["data"]
             query_results.append({**query_result, "file": item})
 
+    async def search_collections(collection_names):
+        try:
+            if full_context:
+                return await asyncio.to_thread(
+                    get_all_items_from_collections, collection_names
+                )
+
+            query_result = None  # Initialize to None
+            if hybrid_search:
+                try:
+                    query_result = await query_collection_with_hybrid_search(
+                        collection_names=collection_names,
+                        queries=queries,
+                        embedding_function=embedding_function,
+                        k=k,
+                        reranking_function=reranking_function,
+                        k_reranker=k_reranker,
+                        r=r,
+                        hybrid_bm25_weight=hybrid_bm25_weight,
+                        enable_enriched_texts=request.app.state.config.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS,
+                    )
+                except Exception as e:
+                    log.debug(
+                        "Error when using hybrid search, using non hybrid search as fallback."
+                    )
+
+            # fallback to non-hybrid search
+            if not hybrid_search and query_result is None:
+                query_result = await query_collection(
+                    collection_names=collection_names,
+                    queries=queries,
+                    embedding_function=embedding_function,
+                    k=k,
+                )
+            return query_result
+        except Exception as e:
+            log.exception(e)
+            return None
+
+    if collection_searches:
+        if not full_context and (
+            not hybrid_search or hybrid_bm25_weight < 1 or reranking_function is None
+        ):
+            # Embed all queries in one batch before the searches fan out
+            try:
+                await embedding_function(queries, prefix=RAG_EMBEDDING_QUERY_PREFIX)
+            except Exception as e:
+                log.exception(f"Error embedding queries: {e}")
+
+        semaphore = asyncio.Semaphore(RAG_COLLECTION_SEARCH_CONCURRENCY)
+
+        async def search_collections_with_limit(collection_names):
+            async with semaphore:
+                return await search_collections(collection_names)
+
+        search_results = await asyncio.gather(
+            *[
+                search_collections_with_limit(collection_names)
+                for _, _, collection_names in collection_searches
+            ]
+        )
+
+        for (idx, item, _), query_result in zip(collection_searches, search_results):
+            if query_result:
+                if "data" in item:
+                    del item["data"]
+                query_results[idx] = {**query_result, "file": item}
+
     sources = []
     for query_result in query_results:
+        if query_result is None:
+            continue
         try:
             if "documents" in query_result:
                 if "metadatas" in query_result:
@@ -140,6 +140,22 @@ class ChromaClient(VectorDBBase):
             )
         return None
 
+    def count(self, collection_name: str) -> Optional[int]:
+        try:
+            collection = self.client.get_collection(name=collection_name)
+        except Exception:
+            # Raised for missing collections
+            return 0
+        return collection.count()
+
+    def get_ids(self, collection_name: str) -> Optional[list[str]]:
+        try:
+            collection = self.client.get_collection(name=collection_name)
+        except Exception:
+            # Raised for missing collections
+            return []
+        return collection.get(include=[])["ids"]
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         collection = self.client.get_or_create_collection(
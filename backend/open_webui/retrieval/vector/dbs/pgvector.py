@@ -748,6 +748,35 @@ class PgvectorClient(VectorDBBase):
             log.exception(f"Error checking collection existence: {e}")
             return False
 
+    def count(self, collection_name: str) -> Optional[int]:
+        try:
+            count = (
+                self.session.query(DocumentChunk)
+                .filter(DocumentChunk.collection_name == collection_name)
+                .count()
+            )
+            self.session.rollback()  # read-only transaction
+            return count
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error counting collection items: {e}")
+            return None
+
+    def get_ids(self, collection_name: str) -> Optional[List[str]]:
+        try:
+            ids = [
+                row.id
+                for row in self.session.query(DocumentChunk.id).filter(
+                    DocumentChunk.collection_name == collection_name
+                )
+            ]
+            self.session.rollback()  # read-only transaction
+            return ids
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error listing collection ids: {e}")
+            return None
+
     def delete_collection(self, collection_name: str) -> None:
         self.delete(collection_name)
         log.info(f"Collection '{collection_name}' deleted.")
@@ -139,6 +139,24 @@ class QdrantClient(VectorDBBase):
             f"{self.collection_prefix}_{collection_name}"
         )
 
+    def count(self, collection_name: str) -> Optional[int]:
+        if not self.has_collection(collection_name):
+            return 0
+        return self.client.count(
+            collection_name=f"{self.collection_prefix}_{collection_name}", exact=True
+        ).count
+
+    def get_ids(self, collection_name: str) -> Optional[list[str]]:
+        if not self.has_collection(collection_name):
+            return []
+        points, _ = self.client.scroll(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            limit=NO_LIMIT,
+            with_payload=False,
+            with_vectors=False,
+        )
+        return [str(point.id) for point in points]
+
     def delete_collection(self, collection_name: str):
         return self.client.delete_collection(
             collection_name=f"{self.collection_prefix}_{collection_name}"
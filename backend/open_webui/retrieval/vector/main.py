@@ -74,6 +74,20 @@ class VectorDBBase(ABC):
         """Retrieve all vectors from a collection."""
         pass
 
+    def count(self, collection_name: str) -> Optional[int]:
+        """
+        Return the number of vectors in a collection, or None if the backend
+        cannot count them without fetching the whole collection.
+        """
+        return None
+
+    def get_ids(self, collection_name: str) -> Optional[List[str]]:
+        """
+        Return the ids of all vectors in a collection, or None if the backend
+        cannot list them without fetching the whole collection.
+        """
+        return None
+
     @abstractmethod
     def delete(
         self,
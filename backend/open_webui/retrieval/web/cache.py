@@ -0,0 +1,303 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Optional, Sequence
+
+from langchain_core.documents import Document
+
+from open_webui.config import (
+    RAG_WEB_CACHE_DIR,
+    WEB_LOADER_CACHE_MAX_ENTRIES,
+    WEB_LOADER_CACHE_TTL,
+    WEB_SEARCH_CACHE_TTL,
+)
+from open_webui.constants import ERROR_MESSAGES
+from open_webui.retrieval.web.main import SearchResult
+from open_webui.retrieval.web.utils import get_web_loader, safe_validate_urls
+
+log = logging.getLogger(__name__)
+
+# SQLite limits the number of parameters per statement
+LOOKUP_BATCH_SIZE = 500
+
+
+class WebCache:
+    """
+    Search engine responses keyed by engine, query and search parameters, and
+    loaded page documents keyed by URL together with the ETag/Last-Modified
+    validators they were served with, stored in SQLite.
+    """
+
+    def __init__(self, path: str, max_pages: int = 0):
+        self.path = path
+        self.max_pages = max_pages
+
+    @contextmanager
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS search_result (
+                        engine TEXT NOT NULL,
+                        query TEXT NOT NULL,
+                        params_hash TEXT NOT NULL,
+                        results TEXT NOT NULL,
+                        created_at INTEGER NOT NULL,
+                        PRIMARY KEY (engine, query, params_hash)
+                    ) WITHOUT ROWID
+                    """
+                )
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS page (
+                        url TEXT PRIMARY KEY,
+                        docs TEXT NOT NULL,
+                        etag TEXT,
+                        last_modified TEXT,
+                        fetched_at INTEGER NOT NULL
+                    ) WITHOUT ROWID
+                    """
+                )
+                yield conn
+        finally:
+            conn.close()
+
+    def get_search_results(
+        self, engine: str, query: str, params_hash: str, ttl: int
+    ) -> Optional[list[SearchResult]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT results FROM search_result "
+                "WHERE engine = ? AND query = ? AND params_hash = ? AND created_at > ?",
+                (engine, query, params_hash, int(time.time()) - ttl),
+            ).fetchone()
+
+        if row is None:
+            return None
+        return [SearchResult(**result) for result in json.loads(row[0])]
+
+    def set_search_results(
+        self,
+        engine: str,
+        query: str,
+        params_hash: str,
+        results: list[SearchResult],
+        ttl: int,
+    ):
+        now = int(time.time())
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO search_result "
+                "(engine, query, params_hash, results, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    engine,
+                    query,
+                    params_hash,
+                    json.dumps([result.model_dump() for result in results]),
+                    now,
+                ),
+            )
+            conn.execute(
+                "DELETE FROM search_result WHERE created_at <= ?", (now - ttl,)
+            )
+
+    def get_pages(self, urls: Sequence[str]) -> dict[str, dict]:
+        pages = {}
+        with self._connect() as conn:
+            for i in range(0, len(urls), LOOKUP_BATCH_SIZE):
+                batch = urls[i : i + LOOKUP_BATCH_SIZE]
+                for url, docs, etag, last_modified, fetched_at in conn.execute(
+                    "SELECT url, docs, etag, last_modified, fetched_at FROM page "
+                    f"WHERE url IN ({','.join('?' * len(batch))})",
+                    batch,
+                ):
+                    pages[url] = {
+                        "docs": json.loads(docs),
+                        "etag": etag,
+                        "last_modified": last_modified,
+                        "fetched_at": fetched_at,
+                    }
+        return pages
+
+    def set_pages(self, pages: dict[str, dict]):
+        if not pages:
+            return
+
+        now = int(time.time())
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO page "
+                "(url, docs, etag, last_modified, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        url,
+                        json.dumps(page["docs"]),
+                        page.get("etag"),
+                        page.get("last_modified"),
+                        now,
+                    )
+                    for url, page in pages.items()
+                ],
+            )
+
+            if self.max_pages > 0:
+                overflow = (
+                    conn.execute("SELECT COUNT(*) FROM page").fetchone()[0]
+                    - self.max_pages
+                )
+                if overflow > 0:
+                    # Least recently fetched pages go first
+                    conn.execute(
+                        "DELETE FROM page WHERE url IN "
+                        "(SELECT url FROM page ORDER BY fetched_at LIMIT ?)",
+                        (overflow,),
+                    )
+
+    def touch_pages(self, urls: list[str]):
+        """Mark pages as fresh again after the server confirmed they are unchanged."""
+        if not urls:
+            return
+
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE page SET fetched_at = ? WHERE url = ?",
+                [(int(time.time()), url) for url in urls],
+            )
+
+
+WEB_CACHE = WebCache(
+    os.path.join(RAG_WEB_CACHE_DIR, "web.db"),
+    max_pages=WEB_LOADER_CACHE_MAX_ENTRIES,
+)
+
+
+def get_search_params_hash(params: dict) -> str:
+    return hashlib.sha256(
+        json.dumps(params, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def get_cached_search_results(
+    engine: str, query: str, params: dict
+) -> Optional[list[SearchResult]]:
+    if WEB_SEARCH_CACHE_TTL <= 0:
+        return None
+
+    try:
+        return WEB_CACHE.get_search_results(
+            engine, query, get_search_params_hash(params), WEB_SEARCH_CACHE_TTL
+        )
+    except Exception as e:
+        log.warning(f"Failed to read web search cache: {e}")
+        return None
+
+
+def set_cached_search_results(
+    engine: str, query: str, params: dict, results: list[SearchResult]
+):
+    if WEB_SEARCH_CACHE_TTL <= 0 or not results:
+        return
+
+    try:
+        WEB_CACHE.set_search_results(
+            engine, query, get_search_params_hash(params), results, WEB_SEARCH_CACHE_TTL
+        )
+    except Exception as e:
+        log.warning(f"Failed to write web search cache: {e}")
+
+
+async def aload_web_documents(
+    urls: Sequence[str],
+    verify_ssl: bool = True,
+    requests_per_second: int = 2,
+    trust_env: bool = False,
+) -> list[Document]:
+    """
+    Load the documents of the given URLs with the configured web loader. Pages
+    loaded within WEB_LOADER_CACHE_TTL are served from WEB_CACHE; older pages
+    are revalidated with their ETag/Last-Modified where the loader supports it.
+    """
+    loader_args = {
+        "verify_ssl": verify_ssl,
+        "requests_per_second": requests_per_second,
+        "trust_env": trust_env,
+    }
+    if WEB_LOADER_CACHE_TTL <= 0:
+        return await get_web_loader(urls, **loader_args).aload()
+
+    safe_urls = list(dict.fromkeys(safe_validate_urls(urls)))
+    if not safe_urls:
+        log.warning(f"All provided URLs were blocked or invalid: {urls}")
+        raise ValueError(ERROR_MESSAGES.INVALID_URL)
+
+    try:
+        cached = await asyncio.to_thread(WEB_CACHE.get_pages, safe_urls)
+    except Exception as e:
+        log.warning(f"Failed to read web loader cache: {e}")
+        cached = {}
+
+    now = time.time()
+    docs_by_url = {
+        url: [Document(**doc) for doc in page["docs"]]
+        for url, page in cached.items()
+        if now - page["fetched_at"] < WEB_LOADER_CACHE_TTL
+    }
+
+    stale_urls = [url for url in safe_urls if url not in docs_by_url]
+    if stale_urls:
+        log.debug(
+            f"Web loader cache: {len(docs_by_url)} cached, {len(stale_urls)} to load"
+        )
+        loader = get_web_loader(
+            stale_urls,
+            **loader_args,
+            cached_pages={url: cached[url] for url in stale_urls if url in cached},
+        )
+        loaded_docs = await loader.aload()
+
+        pages = {}
+        for doc in loaded_docs:
+            url = doc.metadata.get("source")
+            if url not in stale_urls:
+                # e.g. a redirect; returned, but not cached under another URL
+                docs_by_url.setdefault(url, []).append(doc)
+                continue
+            docs_by_url.setdefault(url, []).append(doc)
+            if not doc.page_content.strip():
+                # Failed loads are retried next time
+                continue
+            pages.setdefault(
+                url, {"docs": [], **getattr(loader, "validators", {}).get(url, {})}
+            )["docs"].append(
+                {"page_content": doc.page_content, "metadata": doc.metadata}
+            )
+
+        not_modified = list(getattr(loader, "not_modified", []))
+        for url in not_modified:
+            docs_by_url[url] = [Document(**doc) for doc in cached[url]["docs"]]
+
+        try:
+            await asyncio.to_thread(WEB_CACHE.set_pages, pages)
+            await asyncio.to_thread(WEB_CACHE.touch_pages, not_modified)
+        except Exception as e:
+            log.warning(f"Failed to write web loader cache: {e}")
+
+    # In the order of the given URLs
+    urls_order = {url: idx for idx, url in enumerate(safe_urls)}
+    return [
+        doc
+        for url in sorted(
+            docs_by_url, key=lambda url: urls_order.get(url, len(urls_order))
+        )
+        for doc in docs_by_url[url]
+    ]
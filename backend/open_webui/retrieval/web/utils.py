@@ -551,14 +551,26 @@ class SafePlaywrightURLLoader(PlaywrightURLLoader, RateLimitMixin, URLProcessing
 class SafeWebBaseLoader(WebBaseLoader):
     """WebBaseLoader with enhanced error handling for URLs."""
 
-    def __init__(self, trust_env: bool = False, *args, **kwargs):
+    def __init__(
+        self,
+        trust_env: bool = False,
+        cached_pages: Optional[Dict[str, dict]] = None,
+        *args,
+        **kwargs,
+    ):
         """Initialize SafeWebBaseLoader
         Args:
             trust_env (bool, optional): set to True if using proxy to make web requests, for example
                 using http(s)_proxy environment variables. Defaults to False.
+            cached_pages (dict, optional): previously loaded pages by URL, with the "etag" and
+                "last_modified" they were served with, to send conditional requests for.
         """
         super().__init__(*args, **kwargs)
         self.trust_env = trust_env
+        self.cached_pages = cached_pages or {}
+        # Validators of fetched pages, and URLs that answered 304 Not Modified
+        self.validators: Dict[str, dict] = {}
+        self.not_modified: set[str] = set()
 
     async def _fetch(
         self, url: str, retries: int = 3, cooldown: int = 2, backoff: float = 1.5
@@ -573,13 +585,34 @@ class SafeWebBaseLoader(WebBaseLoader):
                     if not self.session.verify:
                         kwargs["ssl"] = False
 
+                    cached_page = self.cached_pages.get(url, {})
+                    conditional_headers = {}
+                    if cached_page.get("etag"):
+                        conditional_headers["If-None-Match"] = cached_page["etag"]
+                    if cached_page.get("last_modified"):
+                        conditional_headers["If-Modified-Since"] = cached_page[
+                            "last_modified"
+                        ]
+                    if conditional_headers:
+                        kwargs["headers"] = {
+                            **(kwargs["headers"] or {}),
+                            **conditional_headers,
+                        }
+
                     async with session.get(
                         url,
                         **(self.requests_kwargs | kwargs),
                         allow_redirects=False,
                     ) as response:
+                        if response.status == 304 and conditional_headers:
+                            self.not_modified.add(url)
+                            return ""
                         if self.raise_for_status:
                             response.raise_for_status()
+                        self.validators[url] = {
+                            "etag": response.headers.get("ETag"),
+                            "last_modified": response.headers.get("Last-Modified"),
+                        }
                         return await response.text()
                 except aiohttp.ClientConnectionError as e:
                     if i == retries - 1:
@@ -636,6 +669,9 @@ class SafeWebBaseLoader(WebBaseLoader):
         """Async lazy load text from the url(s) in web_path."""
         results = await self.ascrape_all(self.web_paths)
         for path, soup in zip(self.web_paths, results):
+            if path in self.not_modified:
+                # Served from the cache by the caller
+                continue
             text = soup.get_text(**self.bs_get_text_kwargs)
             metadata = {"source": path}
             if title := soup.find("title"):
@@ -658,6 +694,7 @@ def get_web_loader(
     verify_ssl: bool = True,
     requests_per_second: int = 2,
     trust_env: bool = False,
+    cached_pages: Optional[Dict[str, dict]] = None,
 ):
     # Check if the URLs are valid
     safe_urls = safe_validate_urls([urls] if isinstance(urls, str) else urls)
@@ -690,6 +727,10 @@ def get_web_loader(
         if request_kwargs:
             web_loader_args["requests_kwargs"] = request_kwargs
 
+        # Only this loader fetches pages itself and can revalidate them
+        if cached_pages:
+            web_loader_args["cached_pages"] = cached_pages
+
     if WEB_LOADER_ENGINE.value == "playwright":
         WebLoaderClass = SafePlaywrightURLLoader
         web_loader_args["playwright_timeout"] = PLAYWRIGHT_TIMEOUT.value
@@ -2,12 +2,15 @@ import hashlib
 import json
 import logging
 import os
+import shutil
+import subprocess
 import uuid
 import html
 import base64
 from functools import lru_cache
 from pydub import AudioSegment
 from pydub.silence import split_on_silence
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
@@ -29,7 +32,7 @@ from fastapi import (
     APIRouter,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 
 
@@ -37,6 +40,8 @@ from open_webui.utils.misc import strict_match_mime_type
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_permission
 from open_webui.utils.headers import include_user_info_headers
+from open_webui.utils.session_pool import client_session
+from open_webui.utils.speech_cache import SPEECH_CACHE
 from open_webui.config import (
     WHISPER_MODEL_AUTO_UPDATE,
     WHISPER_COMPUTE_TYPE,
@@ -46,6 +51,8 @@ from open_webui.config import (
     WHISPER_LANGUAGE,
     WHISPER_MULTILINGUAL,
     ELEVENLABS_API_BASE_URL,
+    AUDIO_STT_STREAM_CHUNK_SECONDS,
+    AUDIO_STT_STREAM_CONCURRENCY,
 )
 
 from open_webui.constants import ERROR_MESSAGES
@@ -65,12 +72,10 @@ MAX_FILE_SIZE_MB = 20
 MAX_FILE_SIZE = MAX_FILE_SIZE_MB * 1024 * 1024  # Convert MB to bytes
 AZURE_MAX_FILE_SIZE_MB = 200
 AZURE_MAX_FILE_SIZE = AZURE_MAX_FILE_SIZE_MB * 1024 * 1024  # Convert MB to bytes
+STREAM_SAMPLE_RATE = 16000  # Streaming transcriptions decode to 16 kHz mono
 
 log = logging.getLogger(__name__)
 
-SPEECH_CACHE_DIR = CACHE_DIR / "audio" / "speech"
-SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-
 
 ##########################################
 #
@@ -353,13 +358,19 @@ async def speech(request: Request, user=Depends(get_verified_user)):
         + str(request.app.state.config.TTS_MODEL).encode("utf-8")
     ).hexdigest()
 
-    file_path = SPEECH_CACHE_DIR.joinpath(f"{name}.mp3")
-    file_body_path = SPEECH_CACHE_DIR.joinpath(f"{name}.json")
+    file_path = await SPEECH_CACHE.get_or_create(
+        name,
+        lambda file_path, file_body_path: generate_speech(
+            request, body, file_path, file_body_path, user
+        ),
+    )
+    return FileResponse(file_path)
 
-    # Check if the file already exists in the cache
-    if file_path.is_file():
-        return FileResponse(file_path)
 
+async def generate_speech(
+    request: Request, body: bytes, file_path, file_body_path, user
+):
+    """Synthesize speech for a request body into file_path, and save the body."""
     payload = None
     try:
         payload = json.loads(body.decode("utf-8"))
@@ -373,8 +384,8 @@ async def speech(request: Request, user=Depends(get_verified_user)):
 
         try:
             timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(
-                timeout=timeout, trust_env=True
+            async with client_session(
+                request.app.state.config.TTS_OPENAI_API_BASE_URL
             ) as session:
                 payload = {
                     **payload,
@@ -393,6 +404,7 @@ async def speech(request: Request, user=Depends(get_verified_user)):
                     json=payload,
                     headers=headers,
                     ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                    timeout=timeout,
                 )
 
                 r.raise_for_status()
@@ -403,8 +415,6 @@ async def speech(request: Request, user=Depends(get_verified_user)):
                 async with aiofiles.open(file_body_path, "w") as f:
                     await f.write(json.dumps(payload))
 
-            return FileResponse(file_path)
-
         except Exception as e:
             log.exception(e)
             detail = None
@@ -438,9 +448,7 @@ async def speech(request: Request, user=Depends(get_verified_user)):
 
         try:
             timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(
-                timeout=timeout, trust_env=True
-            ) as session:
+            async with client_session(ELEVENLABS_API_BASE_URL) as session:
                 async with session.post(
                     f"{ELEVENLABS_API_BASE_URL}/v1/text-to-speech/{voice_id}",
                     json={
@@ -454,6 +462,7 @@ async def speech(request: Request, user=Depends(get_verified_user)):
                         "xi-api-key": request.app.state.config.TTS_API_KEY,
                     },
                     ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                    timeout=timeout,
                 ) as r:
                     r.raise_for_status()
 
@@ -463,8 +472,6 @@ async def speech(request: Request, user=Depends(get_verified_user)):
                     async with aiofiles.open(file_body_path, "w") as f:
                         await f.write(json.dumps(payload))
 
-            return FileResponse(file_path)
-
         except Exception as e:
             log.exception(e)
             detail = None
@@ -500,12 +507,12 @@ async def speech(request: Request, user=Depends(get_verified_user)):
                 <voice name="{language}">{html.escape(payload["input"])}</voice>
             </speak>"""
             timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-            async with aiohttp.ClientSession(
-                timeout=timeout, trust_env=True
-            ) as session:
+            tts_url = (
+                base_url or f"https://{region}.tts.speech.microsoft.com"
+            ) + "/cognitiveservices/v1"
+            async with client_session(tts_url) as session:
                 async with session.post(
-                    (base_url or f"https://{region}.tts.speech.microsoft.com")
-                    + "/cognitiveservices/v1",
+                    tts_url,
                     headers={
                         "Ocp-Apim-Subscription-Key": request.app.state.config.TTS_API_KEY,
                         "Content-Type": "application/ssml+xml",
@@ -513,6 +520,7 @@ async def speech(request: Request, user=Depends(get_verified_user)):
                     },
                     data=data,
                     ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                    timeout=timeout,
                 ) as r:
                     r.raise_for_status()
 
@@ -522,8 +530,6 @@ async def speech(request: Request, user=Depends(get_verified_user)):
                     async with aiofiles.open(file_body_path, "w") as f:
                         await f.write(json.dumps(payload))
 
-                    return FileResponse(file_path)
-
         except Exception as e:
             log.exception(e)
             detail = None
@@ -578,8 +584,6 @@ async def speech(request: Request, user=Depends(get_verified_user)):
         async with aiofiles.open(file_body_path, "w") as f:
             await f.write(json.dumps(payload))
 
-        return FileResponse(file_path)
-
 
 def transcription_handler(request, file_path, metadata, user=None):
     filename = os.path.basename(file_path)
@@ -1100,6 +1104,97 @@ def transcribe(
     }
 
 
+def transcribe_stream(
+    request: Request, file_path: str, metadata: Optional[dict] = None, user=None
+):
+    """
+    Transcribe an audio file while it is being decoded, yielding the text of each
+    chunk in order as soon as it and the chunks before it are done.
+
+    ffmpeg decodes the file to 16 kHz mono PCM, which is cut into chunks of
+    AUDIO_STT_STREAM_CHUNK_SECONDS. At most AUDIO_STT_STREAM_CONCURRENCY chunks
+    are transcribed at a time and decoding waits for them, so memory and temporary
+    disk use do not grow with the length of the file.
+    """
+    log.info(f"transcribe_stream: {file_path} {metadata}")
+
+    base, _ = os.path.splitext(file_path)
+    chunk_bytes = AUDIO_STT_STREAM_CHUNK_SECONDS * STREAM_SAMPLE_RATE * 2  # 16-bit
+
+    process = subprocess.Popen(
+        [
+            AudioSegment.converter,
+            "-nostdin",
+            "-v",
+            "error",
+            "-i",
+            file_path,
+            "-f",
+            "s16le",
+            "-ac",
+            "1",
+            "-ar",
+            str(STREAM_SAMPLE_RATE),
+            "-",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    executor = ThreadPoolExecutor(max_workers=AUDIO_STT_STREAM_CONCURRENCY)
+    chunk_paths = []
+    pending = deque()
+
+    def transcribe_chunk(chunk_path):
+        try:
+            return transcription_handler(request, chunk_path, metadata, user)
+        finally:
+            if os.path.isfile(chunk_path):
+                os.remove(chunk_path)
+
+    try:
+        index = 0
+        while True:
+            data = process.stdout.read(chunk_bytes)
+            if data:
+                chunk_path = f"{base}_stream_{len(chunk_paths)}.mp3"
+                chunk_paths.append(chunk_path)
+                AudioSegment(
+                    data=data,
+                    sample_width=2,
+                    frame_rate=STREAM_SAMPLE_RATE,
+                    channels=1,
+                ).export(chunk_path, format="mp3", bitrate="32k")
+                pending.append(executor.submit(transcribe_chunk, chunk_path))
+
+            # Emit finished chunks in order, and wait for the oldest one while
+            # the pool is full or the whole file has been decoded
+            while pending and (
+                pending[0].done()
+                or len(pending) > AUDIO_STT_STREAM_CONCURRENCY
+                or not data
+            ):
+                result = pending.popleft().result()
+                yield {"index": index, "text": result.get("text", "").strip()}
+                index += 1
+
+            if not data:
+                break
+
+        if process.wait() != 0:
+            raise Exception("Error decoding audio file")
+    finally:
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        executor.shutdown(wait=False, cancel_futures=True)
+        for chunk_path in chunk_paths:
+            if os.path.isfile(chunk_path):
+                try:
+                    os.remove(chunk_path)
+                except Exception:
+                    pass
+
+
 def compress_audio(file_path):
     if os.path.getsize(file_path) > MAX_FILE_SIZE:
         id = os.path.splitext(os.path.basename(file_path))[
@@ -1167,6 +1262,7 @@ def transcription(
     request: Request,
     file: UploadFile = File(...),
     language: Optional[str] = Form(None),
+    stream: bool = Form(False),
     user=Depends(get_verified_user),
 ):
     if user.role != "admin" and not has_permission(
@@ -1192,14 +1288,14 @@ def transcription(
         id = uuid.uuid4()
 
         filename = f"{id}.{ext}"
-        contents = file.file.read()
 
         file_dir = f"{CACHE_DIR}/audio/transcriptions"
         os.makedirs(file_dir, exist_ok=True)
         file_path = f"{file_dir}/{filename}"
 
+        # Copied in chunks, so long recordings are never held in memory
         with open(file_path, "wb") as f:
-            f.write(contents)
+            shutil.copyfileobj(file.file, f)
 
         try:
             metadata = None
@@ -1207,6 +1303,25 @@ def transcription(
             if language:
                 metadata = {"language": language}
 
+            if stream:
+                # Partial text per chunk as server-sent events, then the full text
+                def event_stream():
+                    texts = []
+                    try:
+                        for chunk in transcribe_stream(
+                            request, file_path, metadata, user
+                        ):
+                            texts.append(chunk["text"])
+                            yield f"data: {json.dumps({**chunk, 'done': False})}\n\n"
+
+                        yield f"data: {json.dumps({'text': ' '.join(texts), 'filename': os.path.basename(file_path), 'done': True})}\n\n"
+                    except Exception as e:
+                        log.exception(e)
+                        error = getattr(e, "detail", None) or ERROR_MESSAGES.DEFAULT(e)
+                        yield f"data: {json.dumps({'error': error, 'done': True})}\n\n"
+
+                return StreamingResponse(event_stream(), media_type="text/event-stream")
+
             result = transcribe(request, file_path, metadata, user)
 
             return {
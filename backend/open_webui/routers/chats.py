@@ -978,21 +978,21 @@ async def update_chat_message_by_id(
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
-    chat = Chats.get_chat_by_id(id, db=db)
+    chat_user_id = Chats.get_chat_user_id_by_id(id, db=db)
 
-    if not chat:
+    if not chat_user_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
-    if chat.user_id != user.id and user.role != "admin":
+    if chat_user_id != user.id and user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
-    chat = Chats.upsert_message_to_chat_by_id_and_message_id(
+    Chats.upsert_message_to_chat_by_id_and_message_id(
         id,
         message_id,
         {
@@ -1022,6 +1022,7 @@ async def update_chat_message_by_id(
             }
         )
 
+    chat = Chats.get_chat_by_id(id, db=db)
     return ChatResponse(**chat.model_dump())
 
 
@@ -1041,15 +1042,15 @@ async def send_chat_message_event_by_id(
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
-    chat = Chats.get_chat_by_id(id, db=db)
+    chat_user_id = Chats.get_chat_user_id_by_id(id, db=db)
 
-    if not chat:
+    if not chat_user_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
-    if chat.user_id != user.id and user.role != "admin":
+    if chat_user_id != user.id and user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
@@ -1149,8 +1150,7 @@ async def get_pinned_status_by_id(
 async def pin_chat_by_id(
     id: str, user=Depends(get_verified_user), db: Session = Depends(get_session)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id, db=db)
-    if chat:
+    if Chats.is_chat_owned_by_user(id, user.id, db=db):
         chat = Chats.toggle_chat_pinned_by_id(id, db=db)
         return chat
     else:
@@ -1274,8 +1274,7 @@ async def clone_shared_chat_by_id(
 async def archive_chat_by_id(
     id: str, user=Depends(get_verified_user), db: Session = Depends(get_session)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id, db=db)
-    if chat:
+    if Chats.is_chat_owned_by_user(id, user.id, db=db):
         chat = Chats.toggle_chat_archive_by_id(id, db=db)
 
         # Delete tags if chat is archived
@@ -1386,8 +1385,7 @@ async def update_chat_folder_id_by_id(
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id, db=db)
-    if chat:
+    if Chats.is_chat_owned_by_user(id, user.id, db=db):
         chat = Chats.update_chat_folder_id_by_id_and_user_id(
             id, user.id, form_data.folder_id, db=db
         )
@@ -1,5 +1,9 @@
+from collections import Counter, OrderedDict
 from typing import Optional
 import logging
+import os
+import threading
+import time
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
@@ -19,6 +23,7 @@ from open_webui.models.feedbacks import (
 )
 
 from open_webui.constants import ERROR_MESSAGES
+from open_webui.retrieval.embedding_cache import EMBEDDING_CACHE, get_text_hash
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.internal.db import get_session
 from sqlalchemy.orm import Session
@@ -49,11 +54,10 @@ router = APIRouter()
 #    4. Feedbacks about unrelated topics (e.g., "cooking") contribute less
 #    This gives topic-specific leaderboards without needing separate data.
 
-import os
-
 EMBEDDING_MODEL_NAME = os.environ.get(
     "AUXILIARY_EMBEDDING_MODEL", "TaylorAI/bge-micro-v2"
 )
+TAG_EMBEDDING_ENGINE = "sentence_transformers"
 _embedding_model = None
 
 
@@ -69,15 +73,18 @@ def _get_embedding_model():
     return _embedding_model
 
 
-def _calculate_elo(
-    feedbacks: list[LeaderboardFeedbackData], similarities: dict = None
+def _update_elo(
+    model_stats: dict,
+    feedbacks: list[LeaderboardFeedbackData],
+    similarities: dict = None,
 ) -> dict:
     """
-    Calculate Elo ratings for models based on user feedback.
+    Update Elo ratings for models based on user feedback.
 
     Each feedback represents a comparison where a user rated one model
     against its opponents (sibling_model_ids). Rating=1 means the model won,
-    rating=-1 means it lost.
+    rating=-1 means it lost. Feedbacks are applied in order on top of the
+    given model_stats, so ratings can be updated as new feedback comes in.
 
     The Elo system adjusts ratings based on:
     - Current rating difference (upsets cause bigger swings)
@@ -86,7 +93,6 @@ def _calculate_elo(
     Returns: {model_id: {"rating": float, "won": int, "lost": int}}
     """
     K_FACTOR = 32  # Standard Elo K-factor for rating volatility
-    model_stats = {}
 
     def get_or_create_stats(model_id):
         if model_id not in model_stats:
@@ -123,91 +129,337 @@ def _calculate_elo(
     return model_stats
 
 
-def _get_top_tags(feedbacks: list[LeaderboardFeedbackData], limit: int = 5) -> dict:
+def _update_tag_counts(
+    tag_counts: dict, feedbacks: list[LeaderboardFeedbackData]
+) -> dict:
     """
-    Count tag occurrences per model and return the most frequent ones.
+    Count tag occurrences per model.
 
     Each feedback can have tags describing the conversation topic.
     This aggregates those tags per model to show what topics each model
     is commonly used for.
 
-    Returns: {model_id: [{"tag": str, "count": int}, ...]}
+    Returns: {model_id: Counter({tag: count})}
     """
-    from collections import defaultdict
-
-    tag_counts = defaultdict(lambda: defaultdict(int))
-
     for feedback in feedbacks:
         data = feedback.data or {}
         model_id = data.get("model_id")
         if model_id:
-            for tag in data.get("tags", []):
-                tag_counts[model_id][tag] += 1
+            tag_counts.setdefault(model_id, Counter()).update(data.get("tags", []))
 
+    return tag_counts
+
+
+def _get_top_tags(tag_counts: dict, limit: int = 5) -> dict:
+    """
+    Return the most frequent tags per model.
+
+    Returns: {model_id: [{"tag": str, "count": int}, ...]}
+    """
     return {
         model_id: [
-            {"tag": tag, "count": count}
-            for tag, count in sorted(tags.items(), key=lambda x: -x[1])[:limit]
+            {"tag": tag, "count": count} for tag, count in tags.most_common(limit)
         ]
         for model_id, tags in tag_counts.items()
     }
 
 
-def _compute_similarities(feedbacks: list[LeaderboardFeedbackData], query: str) -> dict:
-    """
-    Compute how relevant each feedback is to a search query.
+def _get_tags(feedbacks: list[LeaderboardFeedbackData]) -> set[str]:
+    return {
+        tag
+        for feedback in feedbacks
+        if feedback.data
+        for tag in feedback.data.get("tags", [])
+    }
 
-    Uses embeddings to find semantic similarity between the query and
-    each feedback's tags. Higher similarity means the feedback is more
-    relevant to what the user searched for.
 
-    This is used to weight Elo calculations - feedbacks matching the
-    query have more influence on the final rankings.
+# Tag embeddings, in front of the persistent EMBEDDING_CACHE
+_tag_embeddings = {}
 
-    Returns: {feedback_id: similarity_score (0-1)}
+
+def _get_tag_embeddings(tags: list[str]) -> Optional[dict]:
+    """
+    Embed tags with the auxiliary embedding model. Tags embedded before are
+    read from memory or from EMBEDDING_CACHE, so they survive restarts.
+
+    Returns: {tag: embedding}, or None if the model is unavailable or fails
     """
     import numpy as np
 
+    missing = [tag for tag in tags if tag not in _tag_embeddings]
+    if missing:
+        hashes = {get_text_hash(tag): tag for tag in missing}
+        try:
+            cached = EMBEDDING_CACHE.get_many(
+                TAG_EMBEDDING_ENGINE, EMBEDDING_MODEL_NAME, None, list(hashes)
+            )
+        except Exception as e:
+            log.warning(f"Failed to read embedding cache: {e}")
+            cached = {}
+
+        for text_hash, vector in cached.items():
+            _tag_embeddings[hashes[text_hash]] = np.array(vector)
+        missing = [tag for tag in missing if tag not in _tag_embeddings]
+
+    if missing:
+        embedding_model = _get_embedding_model()
+        if not embedding_model:
+            return None
+
+        try:
+            vectors = embedding_model.encode(missing)
+        except Exception as e:
+            log.error(f"Embedding error: {e}")
+            return None
+
+        _tag_embeddings.update(zip(missing, vectors))
+        try:
+            EMBEDDING_CACHE.set_many(
+                TAG_EMBEDDING_ENGINE,
+                EMBEDDING_MODEL_NAME,
+                None,
+                {
+                    get_text_hash(tag): vector.tolist()
+                    for tag, vector in zip(missing, vectors)
+                },
+            )
+        except Exception as e:
+            log.warning(f"Failed to write embedding cache: {e}")
+
+    return {tag: _tag_embeddings[tag] for tag in tags}
+
+
+def _embed_query(query: str):
     embedding_model = _get_embedding_model()
     if not embedding_model:
-        return {}
-
-    all_tags = list(
-        {
-            tag
-            for feedback in feedbacks
-            if feedback.data
-            for tag in feedback.data.get("tags", [])
-        }
-    )
-    if not all_tags:
-        return {}
+        return None
 
     try:
-        tag_embeddings = embedding_model.encode(all_tags)
-        query_embedding = embedding_model.encode([query])[0]
+        return embedding_model.encode([query])[0]
     except Exception as e:
         log.error(f"Embedding error: {e}")
-        return {}
+        return None
+
+
+def _compute_tag_similarities(tags: list[str], query_embedding) -> Optional[dict]:
+    """
+    Compute how relevant each tag is to a search query.
+
+    Uses embeddings to find semantic similarity between the query and
+    each tag. A feedback is as relevant as its most similar tag.
+
+    This is used to weight Elo calculations - feedbacks matching the
+    query have more influence on the final rankings.
+
+    Returns: {tag: similarity_score (0-1)}, or None if tags can't be embedded
+    """
+    import numpy as np
+
+    embeddings = _get_tag_embeddings(tags)
+    if embeddings is None:
+        return None
 
     # Vectorized cosine similarity
+    tag_embeddings = np.array([embeddings[tag] for tag in tags])
     tag_norms = np.linalg.norm(tag_embeddings, axis=1)
     query_norm = np.linalg.norm(query_embedding)
     similarities = np.dot(tag_embeddings, query_embedding) / (
         tag_norms * query_norm + 1e-9
     )
-    tag_similarity_map = dict(zip(all_tags, similarities.tolist()))
+    return dict(zip(tags, similarities.tolist()))
 
-    return {
-        feedback.id: max(
-            (
-                tag_similarity_map.get(tag, 0)
-                for tag in (feedback.data or {}).get("tags", [])
-            ),
-            default=0,
+
+def _get_feedback_key(feedback: LeaderboardFeedbackData) -> tuple:
+    # Feedbacks are applied in creation order
+    return (feedback.created_at or 0, feedback.id)
+
+
+# Seconds after which feedback written in the second of the latest change is
+# assumed to be committed
+LEADERBOARD_SETTLE_TIME = 2
+
+
+class _Leaderboard:
+    """
+    Elo ratings and tag counts materialized from all feedback, optionally
+    weighted by similarity to a query.
+
+    sync() compares the feedback count and latest updated_at with the ones
+    last applied. Feedback created since then is applied on top of the current
+    ratings, which gives the same result as replaying everything in creation
+    order; updated or deleted feedback triggers a full recompute.
+
+    updated_at is in whole seconds, so an edit in the same second as the
+    latest applied change leaves the version as it was. Until that second has
+    settled, sync() keeps checking feedback from it against the data applied.
+    """
+
+    def __init__(self, query: Optional[str] = None):
+        self.query = query
+        self.lock = threading.Lock()
+
+        self.version = None  # (count, latest updated_at) of applied feedback
+        self.checked_at = 0  # When the version was last read
+        self.last_key = None  # Key of the last applied feedback
+        # id -> data of applied feedback last updated in the second of the version
+        self.latest_data = {}
+        self.model_stats = {}
+        self.tag_counts = {}
+
+        self.query_embedding = None
+        self.tag_similarities = None  # None when not weighted by the query
+
+    def _get_similarities(self, feedbacks: list[LeaderboardFeedbackData]) -> dict:
+        new_tags = [
+            tag for tag in _get_tags(feedbacks) if tag not in self.tag_similarities
+        ]
+        if new_tags:
+            similarities = _compute_tag_similarities(new_tags, self.query_embedding)
+            if similarities is None:
+                raise ValueError("Tag embeddings unavailable")
+            self.tag_similarities.update(similarities)
+
+        return {
+            feedback.id: max(
+                (
+                    self.tag_similarities[tag]
+                    for tag in (feedback.data or {}).get("tags", [])
+                ),
+                default=0,
+            )
+            for feedback in feedbacks
+        }
+
+    def _apply(self, feedbacks: list[LeaderboardFeedbackData]):
+        similarities = (
+            self._get_similarities(feedbacks)
+            if self.tag_similarities is not None
+            else None
         )
-        for feedback in feedbacks
-    }
+        _update_elo(self.model_stats, feedbacks, similarities)
+        if self.query is None:
+            _update_tag_counts(self.tag_counts, feedbacks)
+
+        if feedbacks:
+            self.last_key = max(self.last_key, _get_feedback_key(feedbacks[-1]))
+
+    def _compute(self, version: tuple, db: Optional[Session] = None):
+        feedbacks = Feedbacks.get_feedbacks_for_leaderboard(db=db)
+
+        self.model_stats = {}
+        self.tag_counts = {}
+        self.tag_similarities = None
+        self.last_key = (0, "")
+
+        if self.query:
+            if self.query_embedding is None:
+                self.query_embedding = _embed_query(self.query)
+
+            tags = list(_get_tags(feedbacks))
+            if self.query_embedding is not None and tags:
+                # Unweighted, as before, if the tags can't be embedded
+                self.tag_similarities = _compute_tag_similarities(
+                    tags, self.query_embedding
+                )
+
+        self._apply(feedbacks)
+        self._set_version(version, feedbacks)
+
+    def _set_version(self, version: tuple, feedbacks: list[LeaderboardFeedbackData]):
+        self.version = version
+        self.latest_data = {
+            feedback.id: feedback.data
+            for feedback in feedbacks
+            if feedback.updated_at == version[1]
+        }
+
+    def _update(self, version: tuple, db: Optional[Session] = None) -> bool:
+        """Apply feedback created since the last sync, if that is all that changed."""
+        feedbacks = Feedbacks.get_feedbacks_for_leaderboard(
+            updated_since=self.version[1], db=db
+        )
+
+        new_feedbacks = []
+        for feedback in feedbacks:
+            if _get_feedback_key(feedback) > self.last_key:
+                new_feedbacks.append(feedback)
+            elif feedback.updated_at > self.version[1] or (
+                feedback.data != self.latest_data.get(feedback.id)
+            ):
+                # Applied before, then updated
+                return False
+
+        # Anything else missing was deleted, or committed out of order
+        if len(new_feedbacks) != version[0] - self.version[0]:
+            return False
+
+        if self.query and self.tag_similarities is None and _get_tags(new_feedbacks):
+            # Tags may make this leaderboard weighted now
+            return False
+
+        try:
+            self._apply(new_feedbacks)
+        except Exception as e:
+            log.warning(f"Leaderboard update failed, recomputing: {e}")
+            return False
+
+        self._set_version(version, feedbacks)
+        return True
+
+    def sync(self, db: Optional[Session] = None):
+        # Read before the feedbacks, so changes in between are picked up next time
+        now = time.time()
+        version = Feedbacks.get_feedbacks_version(db=db)
+        if (
+            version == self.version
+            and self.checked_at - version[1] > LEADERBOARD_SETTLE_TIME
+        ):
+            return
+
+        if self.version is None or not self._update(version, db=db):
+            self._compute(version, db=db)
+        self.checked_at = now
+
+
+LEADERBOARD_QUERY_CACHE_SIZE = 16
+
+_leaderboard = _Leaderboard()
+_query_leaderboards = OrderedDict()
+_query_leaderboards_lock = threading.Lock()
+
+
+def _get_query_leaderboard(query: str) -> _Leaderboard:
+    """Leaderboard weighted by query, kept for the most recent queries."""
+    with _query_leaderboards_lock:
+        leaderboard = _query_leaderboards.get(query)
+        if leaderboard is None:
+            leaderboard = _query_leaderboards[query] = _Leaderboard(query)
+            while len(_query_leaderboards) > LEADERBOARD_QUERY_CACHE_SIZE:
+                _query_leaderboards.popitem(last=False)
+        _query_leaderboards.move_to_end(query)
+        return leaderboard
+
+
+def _get_leaderboard_stats(
+    query: Optional[str] = None, db: Optional[Session] = None
+) -> tuple[dict, dict]:
+    """
+    Sync the materialized leaderboards with the feedback table.
+
+    Returns: ({model_id: {"rating", "won", "lost"}}, {model_id: top_tags})
+    """
+    with _leaderboard.lock:
+        _leaderboard.sync(db=db)
+        elo_stats = {mid: dict(s) for mid, s in _leaderboard.model_stats.items()}
+        tags_by_model = _get_top_tags(_leaderboard.tag_counts)
+
+    if query:
+        leaderboard = _get_query_leaderboard(query)
+        with leaderboard.lock:
+            leaderboard.sync(db=db)
+            elo_stats = {mid: dict(s) for mid, s in leaderboard.model_stats.items()}
+
+    return elo_stats, tags_by_model
 
 
 class LeaderboardEntry(BaseModel):
@@ -230,16 +482,9 @@ async def get_leaderboard(
     db: Session = Depends(get_session),
 ):
     """Get model leaderboard with Elo ratings. Query filters by tag similarity."""
-    feedbacks = Feedbacks.get_feedbacks_for_leaderboard(db=db)
-
-    similarities = None
-    if query and query.strip():
-        similarities = await run_in_threadpool(
-            _compute_similarities, feedbacks, query.strip()
-        )
-
-    elo_stats = _calculate_elo(feedbacks, similarities)
-    tags_by_model = _get_top_tags(feedbacks)
+    elo_stats, tags_by_model = await run_in_threadpool(
+        _get_leaderboard_stats, query.strip() if query else None, db
+    )
 
     entries = sorted(
         [
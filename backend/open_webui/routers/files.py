@@ -26,6 +26,7 @@ from open_webui.internal.db import get_session, SessionLocal
 
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import delete_bm25_index, reset_bm25_indexes
 
 from open_webui.models.channels import Channels
 from open_webui.models.users import Users
@@ -427,6 +428,7 @@ async def delete_all_files(
         try:
             Storage.delete_all_files()
             VECTOR_DB_CLIENT.reset()
+            reset_bm25_indexes()
         except Exception as e:
             log.exception(e)
             log.error("Error deleting files")
@@ -830,6 +832,7 @@ async def delete_file_by_id(
             try:
                 Storage.delete_file(file.path)
                 VECTOR_DB_CLIENT.delete(collection_name=f"file-{id}")
+                delete_bm25_index(f"file-{id}")
             except Exception as e:
                 log.exception(e)
                 log.error("Error deleting files")
@@ -19,6 +19,8 @@ from open_webui.utils.plugin import (
     load_function_module_by_id,
     replace_imports,
     get_function_module_from_cache,
+    invalidate_plugin_module_cache,
+    set_plugin_module_cache,
 )
 from open_webui.config import CACHE_DIR
 from open_webui.constants import ERROR_MESSAGES
@@ -180,7 +182,9 @@ async def sync_functions(
                     )
                     raise e
 
-        return Functions.sync_functions(user.id, form_data.functions, db=db)
+        functions = Functions.sync_functions(user.id, form_data.functions, db=db)
+        await invalidate_plugin_module_cache(request, "function")
+        return functions
     except Exception as e:
         log.exception(f"Failed to load a function: {e}")
         raise HTTPException(
@@ -226,6 +230,17 @@ async def create_new_function(
                 user.id, function_type, form_data, db=db
             )
 
+            if function:
+                await invalidate_plugin_module_cache(request, "function", form_data.id)
+                set_plugin_module_cache(
+                    request.app,
+                    "function",
+                    form_data.id,
+                    function_module,
+                    function.updated_at,
+                    form_data.content,
+                )
+
             function_cache_dir = CACHE_DIR / "functions" / form_data.id
             function_cache_dir.mkdir(parents=True, exist_ok=True)
 
@@ -281,7 +296,10 @@ async def get_function_by_id(
 
 @router.post("/id/{id}/toggle", response_model=Optional[FunctionModel])
 async def toggle_function_by_id(
-    id: str, user=Depends(get_admin_user), db: Session = Depends(get_session)
+    request: Request,
+    id: str,
+    user=Depends(get_admin_user),
+    db: Session = Depends(get_session),
 ):
     function = Functions.get_function_by_id(id, db=db)
     if function:
@@ -290,6 +308,9 @@ async def toggle_function_by_id(
         )
 
         if function:
+            await invalidate_plugin_module_cache(
+                request, "function", id, include_modules=False
+            )
             return function
         else:
             raise HTTPException(
@@ -310,7 +331,10 @@ async def toggle_function_by_id(
 
 @router.post("/id/{id}/toggle/global", response_model=Optional[FunctionModel])
 async def toggle_global_by_id(
-    id: str, user=Depends(get_admin_user), db: Session = Depends(get_session)
+    request: Request,
+    id: str,
+    user=Depends(get_admin_user),
+    db: Session = Depends(get_session),
 ):
     function = Functions.get_function_by_id(id, db=db)
     if function:
@@ -319,6 +343,9 @@ async def toggle_global_by_id(
         )
 
         if function:
+            await invalidate_plugin_module_cache(
+                request, "function", id, include_modules=False
+            )
             return function
         else:
             raise HTTPException(
@@ -360,6 +387,17 @@ async def update_function_by_id(
 
         function = Functions.update_function_by_id(id, updated, db=db)
 
+        if function:
+            await invalidate_plugin_module_cache(request, "function", id)
+            set_plugin_module_cache(
+                request.app,
+                "function",
+                id,
+                function_module,
+                function.updated_at,
+                function.content,
+            )
+
         if function_type == "filter" and getattr(function_module, "toggle", None):
             Functions.update_function_metadata_by_id(id, {"toggle": True}, db=db)
 
@@ -393,9 +431,7 @@ async def delete_function_by_id(
     result = Functions.delete_function_by_id(id, db=db)
 
     if result:
-        FUNCTIONS = request.app.state.FUNCTIONS
-        if id in FUNCTIONS:
-            del FUNCTIONS[id]
+        await invalidate_plugin_module_cache(request, "function", id)
 
     return result
 
@@ -483,6 +519,9 @@ async def update_function_valves_by_id(
 
                 valves_dict = valves.model_dump(exclude_unset=True)
                 Functions.update_function_valves_by_id(id, valves_dict, db=db)
+                await invalidate_plugin_module_cache(
+                    request, "function", id, include_modules=False
+                )
                 return valves_dict
             except Exception as e:
                 log.exception(f"Error updating function values by id {id}: {e}")
@@ -8,7 +8,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFi
 from pydantic import BaseModel
 from fastapi.responses import StreamingResponse
 
-from open_webui.socket.main import sio
+from open_webui.socket.main import sio, NOTE_REVISION_BUFFER
 
 from open_webui.models.groups import Groups
 from open_webui.models.users import Users, UserResponse
@@ -306,11 +306,22 @@ async def update_note_by_id(
 async def get_note_revisions(
     request: Request,
     id: str,
+    page: Optional[int] = None,
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
     _ensure_note_access(request, id, user, db, access_type="read")
-    return Notes.get_note_revisions(id, db=db)
+    await NOTE_REVISION_BUFFER.flush(id)
+
+    skip = None
+    limit = None
+
+    if page is not None:
+        page = max(1, page)
+        limit = 60
+        skip = (page - 1) * limit
+
+    return Notes.get_note_revisions(id, skip=skip, limit=limit, db=db)
 
 
 @router.post("/{id}/revisions/{revision_id}/{action}", response_model=dict)
@@ -328,6 +339,7 @@ async def review_note_revision(
         raise HTTPException(status_code=400, detail=ERROR_MESSAGES.INVALID_INPUT)
 
     status_value = "accepted" if action == "accept" else "rejected"
+    await NOTE_REVISION_BUFFER.flush(id)
     revision = Notes.update_revision_status(id, revision_id, status_value, db=db)
     if not revision:
         raise HTTPException(status_code=404, detail=ERROR_MESSAGES.NOT_FOUND)
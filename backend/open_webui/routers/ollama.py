@@ -1,12 +1,10 @@
-# TODO: Implement a more intelligent load balancing mechanism for distributing requests among multiple backend instances.
-# Current implementation uses a simple round-robin approach (random.choice). Consider incorporating algorithms like weighted round-robin,
-# least connections, or least response time for better resource utilization and performance optimization.
+# Requests for a model served by several backend instances are spread among them by
+# OLLAMA_LOAD_BALANCER (see open_webui.utils.load_balancer and OLLAMA_LOAD_BALANCING_POLICY).
 
 import asyncio
 import json
 import logging
 import os
-import random
 import re
 import time
 from datetime import datetime
@@ -54,10 +52,19 @@ from open_webui.utils.payload import (
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.utils.session_pool import (
+    client_session,
+    get_client_session,
+    release_client_session,
+)
+from open_webui.utils.load_balancer import BackendLoadBalancer, BackendRequest
 
 
 from open_webui.config import (
     UPLOAD_DIR,
+    OLLAMA_LOAD_BALANCING_POLICY,
+    OLLAMA_BACKEND_MAX_FAILURES,
+    OLLAMA_BACKEND_EJECTION_TIME,
 )
 from open_webui.env import (
     ENV,
@@ -71,6 +78,13 @@ from open_webui.constants import ERROR_MESSAGES
 
 log = logging.getLogger(__name__)
 
+OLLAMA_LOAD_BALANCER = BackendLoadBalancer(
+    "ollama",
+    policy=OLLAMA_LOAD_BALANCING_POLICY,
+    max_failures=OLLAMA_BACKEND_MAX_FAILURES,
+    ejection_time=OLLAMA_BACKEND_EJECTION_TIME,
+)
+
 
 ##########################################
 #
@@ -82,7 +96,7 @@ log = logging.getLogger(__name__)
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
+        async with client_session(url) as session:
             headers = {
                 "Content-Type": "application/json",
                 **({"Authorization": f"Bearer {key}"} if key else {}),
@@ -95,6 +109,7 @@ async def send_get_request(url, key=None, user: UserModel = None):
                 url,
                 headers=headers,
                 ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                timeout=timeout,
             ) as response:
                 return await response.json()
     except Exception as e:
@@ -106,11 +121,19 @@ async def send_get_request(url, key=None, user: UserModel = None):
 async def cleanup_response(
     response: Optional[aiohttp.ClientResponse],
     session: Optional[aiohttp.ClientSession],
+    backend_request: Optional[BackendRequest] = None,
 ):
-    if response:
-        response.close()
-    if session:
-        await session.close()
+    await release_client_session(response, session)
+    if backend_request:
+        await backend_request.release()
+
+
+async def select_url_idx(request: Request, url_idxs: list[int]) -> int:
+    return await OLLAMA_LOAD_BALANCER.select(
+        url_idxs,
+        request.app.state.config.OLLAMA_BASE_URLS,
+        request.app.state.config.OLLAMA_API_CONFIGS,
+    )
 
 
 async def send_post_request(
@@ -121,13 +144,19 @@ async def send_post_request(
     content_type: Optional[str] = None,
     user: UserModel = None,
     metadata: Optional[dict] = None,
+    backend_url: Optional[str] = None,
 ):
 
     r = None
+    session = None
+    backend_request = None
+    streaming = False
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
+        if backend_url:
+            # Counts towards the backend's load until the response is consumed
+            backend_request = await OLLAMA_LOAD_BALANCER.acquire(backend_url)
+
+        session = get_client_session(url)
 
         headers = {
             "Content-Type": "application/json",
@@ -144,8 +173,12 @@ async def send_post_request(
             data=payload,
             headers=headers,
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
         )
 
+        if backend_request:
+            backend_request.record(error=r.status >= 500)
+
         if r.ok is False:
             try:
                 res = await r.json()
@@ -168,12 +201,25 @@ async def send_post_request(
             if content_type:
                 response_headers["Content-Type"] = content_type
 
+            async def stream_content(response, backend_request):
+                # The background task does not run if the client disconnects
+                try:
+                    async for chunk in response.content:
+                        yield chunk
+                finally:
+                    if backend_request:
+                        await backend_request.release()
+
+            streaming = True
             return StreamingResponse(
-                r.content,
+                stream_content(r, backend_request),
                 status_code=r.status,
                 headers=response_headers,
                 background=BackgroundTask(
-                    cleanup_response, response=r, session=session
+                    cleanup_response,
+                    response=r,
+                    session=session,
+                    backend_request=backend_request,
                 ),
             )
         else:
@@ -183,6 +229,9 @@ async def send_post_request(
     except HTTPException as e:
         raise e  # Re-raise HTTPException to be handled by FastAPI
     except Exception as e:
+        if backend_request and r is None:
+            backend_request.record(error=True)
+
         detail = f"Ollama: {e}"
 
         raise HTTPException(
@@ -192,6 +241,8 @@ async def send_post_request(
     finally:
         if not stream:
             await cleanup_response(r, session)
+        if backend_request and not streaming:
+            await backend_request.release()
 
 
 def get_api_key(idx, url, configs):
@@ -306,6 +357,16 @@ async def update_config(
     }
 
 
+@router.get("/backends")
+async def get_backends(request: Request, user=Depends(get_admin_user)):
+    return {
+        "policy": OLLAMA_LOAD_BALANCER.policy,
+        "backends": await OLLAMA_LOAD_BALANCER.get_stats(
+            request.app.state.config.OLLAMA_BASE_URLS
+        ),
+    }
+
+
 def merge_ollama_models_lists(model_lists):
     merged_models = {}
 
@@ -936,7 +997,7 @@ async def show_model_info(
             detail=ERROR_MESSAGES.MODEL_NOT_FOUND(model),
         )
 
-    url_idx = random.choice(models[model]["urls"])
+    url_idx = await select_url_idx(request, models[model]["urls"])
 
     url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
     key = get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS)
@@ -1006,7 +1067,7 @@ async def embed(
             model = f"{model}:latest"
 
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = await select_url_idx(request, models[model]["urls"])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1088,7 +1149,7 @@ async def embeddings(
             model = f"{model}:latest"
 
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = await select_url_idx(request, models[model]["urls"])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1176,7 +1237,7 @@ async def generate_completion(
             model = f"{model}:latest"
 
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = await select_url_idx(request, models[model]["urls"])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1198,6 +1259,7 @@ async def generate_completion(
         payload=form_data.model_dump_json(exclude_none=True).encode(),
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
+        backend_url=url,
     )
 
 
@@ -1243,7 +1305,7 @@ async def get_ollama_url(request: Request, model: str, url_idx: Optional[int] =
                 status_code=400,
                 detail=ERROR_MESSAGES.MODEL_NOT_FOUND(model),
             )
-        url_idx = random.choice(models[model].get("urls", []))
+        url_idx = await select_url_idx(request, models[model].get("urls", []))
     url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
     return url, url_idx
 
@@ -1342,6 +1404,7 @@ async def generate_chat_completion(
         content_type="application/x-ndjson",
         user=user,
         metadata=metadata,
+        backend_url=url,
     )
 
 
@@ -1452,6 +1515,7 @@ async def generate_openai_completion(
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
         metadata=metadata,
+        backend_url=url,
     )
 
 
@@ -1538,6 +1602,7 @@ async def generate_openai_chat_completion(
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
         metadata=metadata,
+        backend_url=url,
     )
 
 
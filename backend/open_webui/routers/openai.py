@@ -24,9 +24,6 @@ from sqlalchemy.orm import Session
 from open_webui.internal.db import get_session
 
 from open_webui.models.models import Models
-from open_webui.config import (
-    CACHE_DIR,
-)
 from open_webui.env import (
     MODELS_CACHE_TTL,
     AIOHTTP_CLIENT_SESSION_SSL,
@@ -50,8 +47,14 @@ from open_webui.utils.misc import (
 )
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.speech_cache import SPEECH_CACHE
 from open_webui.utils.access_control import has_access
 from open_webui.utils.headers import include_user_info_headers
+from open_webui.utils.session_pool import (
+    client_session,
+    get_client_session,
+    release_client_session,
+)
 
 
 log = logging.getLogger(__name__)
@@ -67,7 +70,7 @@ log = logging.getLogger(__name__)
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
+        async with client_session(url) as session:
             headers = {
                 **({"Authorization": f"Bearer {key}"} if key else {}),
             }
@@ -79,6 +82,7 @@ async def send_get_request(url, key=None, user: UserModel = None):
                 url,
                 headers=headers,
                 ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                timeout=timeout,
             ) as response:
                 return await response.json()
     except Exception as e:
@@ -91,10 +95,7 @@ async def cleanup_response(
     response: Optional[aiohttp.ClientResponse],
     session: Optional[aiohttp.ClientSession],
 ):
-    if response:
-        response.close()
-    if session:
-        await session.close()
+    await release_client_session(response, session)
 
 
 def openai_reasoning_model_handler(payload):
@@ -279,65 +280,59 @@ async def speech(request: Request, user=Depends(get_verified_user)):
         body = await request.body()
         name = hashlib.sha256(body).hexdigest()
 
-        SPEECH_CACHE_DIR = CACHE_DIR / "audio" / "speech"
-        SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        file_path = SPEECH_CACHE_DIR.joinpath(f"{name}.mp3")
-        file_body_path = SPEECH_CACHE_DIR.joinpath(f"{name}.json")
-
-        # Check if the file already exists in the cache
-        if file_path.is_file():
-            return FileResponse(file_path)
-
-        url = request.app.state.config.OPENAI_API_BASE_URLS[idx]
-        key = request.app.state.config.OPENAI_API_KEYS[idx]
-        api_config = request.app.state.config.OPENAI_API_CONFIGS.get(
-            str(idx),
-            request.app.state.config.OPENAI_API_CONFIGS.get(url, {}),  # Legacy support
-        )
-
-        headers, cookies = await get_headers_and_cookies(
-            request, url, key, api_config, user=user
-        )
+        async def generate_speech(file_path, file_body_path):
+            url = request.app.state.config.OPENAI_API_BASE_URLS[idx]
+            key = request.app.state.config.OPENAI_API_KEYS[idx]
+            api_config = request.app.state.config.OPENAI_API_CONFIGS.get(
+                str(idx),
+                request.app.state.config.OPENAI_API_CONFIGS.get(
+                    url, {}
+                ),  # Legacy support
+            )
 
-        r = None
-        try:
-            r = requests.post(
-                url=f"{url}/audio/speech",
-                data=body,
-                headers=headers,
-                cookies=cookies,
-                stream=True,
+            headers, cookies = await get_headers_and_cookies(
+                request, url, key, api_config, user=user
             )
 
-            r.raise_for_status()
+            r = None
+            try:
+                r = requests.post(
+                    url=f"{url}/audio/speech",
+                    data=body,
+                    headers=headers,
+                    cookies=cookies,
+                    stream=True,
+                )
 
-            # Save the streaming content to a file
-            with open(file_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    f.write(chunk)
+                r.raise_for_status()
 
-            with open(file_body_path, "w") as f:
-                json.dump(json.loads(body.decode("utf-8")), f)
+                # Save the streaming content to a file
+                with open(file_path, "wb") as f:
+                    for chunk in r.iter_content(chunk_size=8192):
+                        f.write(chunk)
 
-            # Return the saved file
-            return FileResponse(file_path)
+                with open(file_body_path, "w") as f:
+                    json.dump(json.loads(body.decode("utf-8")), f)
 
-        except Exception as e:
-            log.exception(e)
+            except Exception as e:
+                log.exception(e)
 
-            detail = None
-            if r is not None:
-                try:
-                    res = r.json()
-                    if "error" in res:
-                        detail = f"External: {res['error']}"
-                except Exception:
-                    detail = f"External: {e}"
+                detail = None
+                if r is not None:
+                    try:
+                        res = r.json()
+                        if "error" in res:
+                            detail = f"External: {res['error']}"
+                    except Exception:
+                        detail = f"External: {e}"
 
-            raise HTTPException(
-                status_code=r.status_code if r else 500,
-                detail=detail if detail else "Open WebUI: Server Connection Error",
-            )
+                raise HTTPException(
+                    status_code=r.status_code if r else 500,
+                    detail=detail if detail else "Open WebUI: Server Connection Error",
+                )
+
+        file_path = await SPEECH_CACHE.get_or_create(name, generate_speech)
+        return FileResponse(file_path)
 
     except ValueError:
         raise HTTPException(status_code=401, detail=ERROR_MESSAGES.OPENAI_NOT_FOUND)
@@ -935,9 +930,7 @@ async def generate_chat_completion(
     response = None
 
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
+        session = get_client_session(request_url)
 
         r = await session.request(
             method="POST",
@@ -946,6 +939,7 @@ async def generate_chat_completion(
             headers=headers,
             cookies=cookies,
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
         )
 
         # Check if response is SSE
@@ -1022,7 +1016,7 @@ async def embeddings(request: Request, form_data: dict, user):
         request, url, key, api_config, user=user
     )
     try:
-        session = aiohttp.ClientSession(trust_env=True)
+        session = get_client_session(url)
         r = await session.request(
             method="POST",
             url=f"{url}/embeddings",
@@ -1112,7 +1106,7 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
         else:
             request_url = f"{url}/{path}"
 
-        session = aiohttp.ClientSession(trust_env=True)
+        session = get_client_session(request_url)
         r = await session.request(
             method=request.method,
             url=request_url,
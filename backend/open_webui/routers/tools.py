@@ -25,6 +25,8 @@ from open_webui.utils.plugin import (
     load_tool_module_by_id,
     replace_imports,
     get_tool_module_from_cache,
+    invalidate_plugin_module_cache,
+    set_plugin_module_cache,
 )
 from open_webui.utils.tools import get_tool_specs
 from open_webui.utils.auth import get_admin_user, get_verified_user
@@ -343,6 +345,17 @@ async def create_new_tools(
             specs = get_tool_specs(TOOLS[form_data.id])
             tools = Tools.insert_new_tool(user.id, form_data, specs, db=db)
 
+            if tools:
+                await invalidate_plugin_module_cache(request, "tool", form_data.id)
+                set_plugin_module_cache(
+                    request.app,
+                    "tool",
+                    form_data.id,
+                    tool_module,
+                    tools.updated_at,
+                    form_data.content,
+                )
+
             tool_cache_dir = CACHE_DIR / "tools" / form_data.id
             tool_cache_dir.mkdir(parents=True, exist_ok=True)
 
@@ -453,6 +466,10 @@ async def update_tools_by_id(
         tools = Tools.update_tool_by_id(id, updated, db=db)
 
         if tools:
+            await invalidate_plugin_module_cache(request, "tool", id)
+            set_plugin_module_cache(
+                request.app, "tool", id, tool_module, tools.updated_at, tools.content
+            )
             return tools
         else:
             raise HTTPException(
@@ -498,9 +515,7 @@ async def delete_tools_by_id(
 
     result = Tools.delete_tool_by_id(id, db=db)
     if result:
-        TOOLS = request.app.state.TOOLS
-        if id in TOOLS:
-            del TOOLS[id]
+        await invalidate_plugin_module_cache(request, "tool", id)
 
     return result
 
@@ -610,6 +625,7 @@ async def update_tools_valves_by_id(
         valves = Valves(**form_data)
         valves_dict = valves.model_dump(exclude_unset=True)
         Tools.update_tool_valves_by_id(id, valves_dict, db=db)
+        await invalidate_plugin_module_cache(request, "tool", id, include_modules=False)
         return valves_dict
     except Exception as e:
         log.exception(f"Failed to update tool valves by id {id}: {e}")
@@ -40,6 +40,7 @@ from open_webui.utils.auth import (
     validate_password,
 )
 from open_webui.utils.access_control import get_permissions, has_permission
+from open_webui.utils.user_cache import invalidate_user_cache
 
 
 log = logging.getLogger(__name__)
@@ -267,6 +268,7 @@ async def update_default_user_permissions(
     request: Request, form_data: UserPermissions, user=Depends(get_admin_user)
 ):
     request.app.state.config.USER_PERMISSIONS = form_data.model_dump()
+    invalidate_user_cache()
     return request.app.state.config.USER_PERMISSIONS
 
 
@@ -452,9 +454,9 @@ async def get_user_by_id(
     # If it is, get the user_id from the chat
     if user_id.startswith("shared-"):
         chat_id = user_id.replace("shared-", "")
-        chat = Chats.get_chat_by_id(chat_id)
-        if chat:
-            user_id = chat.user_id
+        chat_user_id = Chats.get_chat_user_id_by_id(chat_id)
+        if chat_user_id:
+            user_id = chat_user_id
         else:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
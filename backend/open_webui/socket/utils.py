@@ -1,10 +1,19 @@
+import asyncio
+import base64
 import json
+import logging
+import time
 import uuid
+from collections import OrderedDict
+from open_webui.models.chats import Chats
+from open_webui.models.notes import Notes
 from open_webui.utils.redis import get_redis_connection
 from open_webui.env import REDIS_KEY_PREFIX
 from typing import Optional, List, Tuple
 import pycrdt as Y
 
+log = logging.getLogger(__name__)
+
 
 class RedisLock:
     def __init__(
@@ -117,43 +126,343 @@ class RedisDict:
         return self[key]
 
 
+class SessionPool:
+    """
+    Registry of socket sessions and their users. With Redis, sessions are
+    stored in a hash shared by all workers and read through a near-cache:
+    sessions connected to this worker are served from memory, and sessions
+    of other workers are cached for cache_ttl seconds. Bulk lookups fetch
+    all cache misses with a single HMGET.
+    """
+
+    def __init__(
+        self,
+        redis=None,
+        name: str = f"{REDIS_KEY_PREFIX}:session_pool",
+        cache_ttl: float = 30,
+        max_cached: int = 10000,
+    ):
+        self._redis = redis
+        self._name = name
+        self._cache_ttl = cache_ttl
+        self._max_cached = max_cached
+        self._local = {}
+        # sid -> (expires_at, user) for sessions of other workers
+        self._cache = OrderedDict()
+
+    def _get_cached(self, sid: str) -> Optional[dict]:
+        user = self._local.get(sid)
+        if user is not None:
+            return user
+
+        cached = self._cache.get(sid)
+        if cached is not None:
+            expires_at, user = cached
+            if expires_at > time.monotonic():
+                return user
+            del self._cache[sid]
+        return None
+
+    def _set_cached(self, sid: str, user: dict):
+        if self._cache_ttl <= 0:
+            return
+
+        self._cache[sid] = (time.monotonic() + self._cache_ttl, user)
+        self._cache.move_to_end(sid)
+        while len(self._cache) > self._max_cached:
+            self._cache.popitem(last=False)
+
+    async def get(self, sid: str, default=None) -> Optional[dict]:
+        user = self._get_cached(sid)
+        if user is None and self._redis:
+            value = await self._redis.hget(self._name, sid)
+            if value is not None:
+                user = json.loads(value)
+                self._set_cached(sid, user)
+        return user if user is not None else default
+
+    async def get_many(self, sids: List[str]) -> dict:
+        """Users by sid for the given sessions; unknown sessions are left out."""
+        users = {}
+        missing = []
+        for sid in dict.fromkeys(sids):
+            user = self._get_cached(sid)
+            if user is not None:
+                users[sid] = user
+            else:
+                missing.append(sid)
+
+        if missing and self._redis:
+            values = await self._redis.hmget(self._name, missing)
+            for sid, value in zip(missing, values):
+                if value is not None:
+                    users[sid] = json.loads(value)
+                    self._set_cached(sid, users[sid])
+
+        return users
+
+    async def contains(self, sid: str) -> bool:
+        return await self.get(sid) is not None
+
+    async def set(self, sid: str, user: dict):
+        self._local[sid] = user
+        self._cache.pop(sid, None)
+        if self._redis:
+            await self._redis.hset(self._name, sid, json.dumps(user))
+
+    async def pop(self, sid: str, default=None) -> Optional[dict]:
+        user = self._local.pop(sid, None)
+        self._cache.pop(sid, None)
+        if self._redis:
+            pipe = self._redis.pipeline()
+            pipe.hget(self._name, sid)
+            pipe.hdel(self._name, sid)
+            value, _ = await pipe.execute()
+            if user is None and value is not None:
+                user = json.loads(value)
+        return user if user is not None else default
+
+
+class UsagePool:
+    """
+    Tracks which sessions are using which models. With Redis, each model has
+    a sorted set of sids scored by their last heartbeat, plus one sorted set
+    of models scored by their latest heartbeat, so recording a heartbeat is
+    two ZADDs and expiring is a range delete. Without Redis, the same is kept
+    in insertion-ordered dicts, oldest heartbeat first.
+    """
+
+    def __init__(self, redis=None, redis_key_prefix: str = f"{REDIS_KEY_PREFIX}:usage"):
+        self._redis = redis
+        self._redis_key_prefix = redis_key_prefix
+        self._models = OrderedDict()
+        self._sessions = {}
+
+    def _get_models_key(self) -> str:
+        return f"{self._redis_key_prefix}:models"
+
+    def _get_sessions_key(self, model_id: str) -> str:
+        return f"{self._redis_key_prefix}:models:{model_id}"
+
+    async def add(self, model_id: str, sid: str, timestamp: int):
+        if self._redis:
+            pipe = self._redis.pipeline()
+            pipe.zadd(self._get_sessions_key(model_id), {sid: timestamp})
+            pipe.zadd(self._get_models_key(), {model_id: timestamp})
+            await pipe.execute()
+        else:
+            # Keep heartbeats in order if the clock steps back
+            if self._models:
+                timestamp = max(timestamp, next(reversed(self._models.values())))
+
+            sessions = self._sessions.setdefault(model_id, OrderedDict())
+            sessions[sid] = timestamp
+            sessions.move_to_end(sid)
+            self._models[model_id] = timestamp
+            self._models.move_to_end(model_id)
+
+    async def get_models(self, since: int) -> List[str]:
+        """Models with a heartbeat at or after since."""
+        if self._redis:
+            return await self._redis.zrangebyscore(
+                self._get_models_key(), since, "+inf"
+            )
+
+        models = []
+        for model_id, timestamp in reversed(self._models.items()):
+            if timestamp < since:
+                break
+            models.append(model_id)
+        return models
+
+    async def expire(self, before: int):
+        """Remove heartbeats older than before, and models left without any."""
+        if self._redis:
+            models_key = self._get_models_key()
+            model_ids = await self._redis.zrangebyscore(models_key, "-inf", "+inf")
+            pipe = self._redis.pipeline()
+            for model_id in model_ids:
+                pipe.zremrangebyscore(
+                    self._get_sessions_key(model_id), "-inf", f"({before}"
+                )
+            # Scores only move forward, so a concurrent heartbeat is never removed
+            pipe.zremrangebyscore(models_key, "-inf", f"({before}")
+            await pipe.execute()
+            return
+
+        for model_id, sessions in list(self._sessions.items()):
+            while sessions and next(iter(sessions.values())) < before:
+                sessions.popitem(last=False)
+            if not sessions:
+                log.debug(f"Cleaning up model {model_id} from usage pool")
+                del self._sessions[model_id]
+
+        while self._models and next(iter(self._models.values())) < before:
+            self._models.popitem(last=False)
+
+
 class YdocManager:
+    """
+    Stores Yjs document updates as a compacted snapshot plus a short tail of
+    recent updates, so a joining session reads one snapshot instead of
+    replaying the full update log.
+    """
+
     def __init__(
         self,
         redis=None,
         redis_key_prefix: str = f"{REDIS_KEY_PREFIX}:ydoc:documents",
+        compaction_threshold: int = 100,
     ):
         self._updates = {}
         self._users = {}
         self._redis = redis
         self._redis_key_prefix = redis_key_prefix
+        self._compaction_threshold = compaction_threshold
+        # Documents being compacted in this process (without Redis)
+        self._compacting = set()
+
+    @staticmethod
+    def _encode_update(update: bytes) -> str:
+        return base64.b64encode(bytes(update)).decode("ascii")
+
+    @staticmethod
+    def _decode_update(value: str) -> bytes:
+        # Updates written by older versions are JSON arrays of ints
+        if value.startswith("["):
+            return bytes(json.loads(value))
+        return base64.b64decode(value)
+
+    @staticmethod
+    def _merge_updates(updates: List[bytes]) -> bytes:
+        ydoc = Y.Doc()
+        for update in updates:
+            ydoc.apply_update(bytes(update))
+        return ydoc.get_update()
 
     async def append_to_updates(self, document_id: str, update: bytes):
         document_id = document_id.replace(":", "_")
         if self._redis:
             redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            await self._redis.rpush(redis_key, json.dumps(list(update)))
+            length = await self._redis.rpush(redis_key, self._encode_update(update))
+
+            if length >= self._compaction_threshold:
+                await self.compact_document(document_id)
         else:
             if document_id not in self._updates:
                 self._updates[document_id] = []
-            self._updates[document_id].append(update)
+            self._updates[document_id].append(bytes(update))
+
+            if len(self._updates[document_id]) >= self._compaction_threshold:
+                await self.compact_document(document_id)
+
+    async def compact_document(self, document_id: str) -> Optional[bytes]:
+        """
+        Merge the snapshot and the pending updates into a new snapshot. Returns
+        the merged state, or None if there was nothing to compact or another
+        compaction of the document is in progress.
+        """
+        document_id = document_id.replace(":", "_")
+
+        if not self._redis:
+            updates = self._updates.get(document_id, [])
+            if len(updates) <= 1 or document_id in self._compacting:
+                return None
+
+            self._compacting.add(document_id)
+            try:
+                count = len(updates)
+                merged = await asyncio.to_thread(self._merge_updates, updates[:count])
+                # Keep anything appended while the snapshot was being built
+                if self._updates.get(document_id) is updates:
+                    updates[:count] = [merged]
+                return merged
+            finally:
+                self._compacting.discard(document_id)
+
+        lock_key = f"{self._redis_key_prefix}:{document_id}:compaction_lock"
+        if not await self._redis.set(lock_key, "1", nx=True, ex=30):
+            # Another worker is already compacting this document
+            return None
+
+        try:
+            snapshot, tail = await self._get_snapshot_and_tail(document_id)
+            if not tail:
+                return snapshot
+
+            merged = await asyncio.to_thread(
+                self._merge_updates, ([snapshot] if snapshot else []) + tail
+            )
+
+            pipe = self._redis.pipeline()
+            pipe.set(
+                f"{self._redis_key_prefix}:{document_id}:snapshot",
+                self._encode_update(merged),
+            )
+            # Keep anything appended while the snapshot was being built
+            pipe.ltrim(f"{self._redis_key_prefix}:{document_id}:updates", len(tail), -1)
+            await pipe.execute()
+            return merged
+        except Exception as e:
+            log.error(f"Error compacting document {document_id}: {e}")
+            return None
+        finally:
+            await self._redis.delete(lock_key)
+
+    async def _get_snapshot_and_tail(
+        self, document_id: str
+    ) -> Tuple[Optional[bytes], List[bytes]]:
+        pipe = self._redis.pipeline()
+        pipe.get(f"{self._redis_key_prefix}:{document_id}:snapshot")
+        pipe.lrange(f"{self._redis_key_prefix}:{document_id}:updates", 0, -1)
+        snapshot, updates = await pipe.execute()
+
+        return (
+            self._decode_update(snapshot) if snapshot else None,
+            [self._decode_update(update) for update in updates],
+        )
 
     async def get_updates(self, document_id: str) -> List[bytes]:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            updates = await self._redis.lrange(redis_key, 0, -1)
-            return [bytes(json.loads(update)) for update in updates]
+            snapshot, tail = await self._get_snapshot_and_tail(document_id)
+            return ([snapshot] if snapshot else []) + tail
         else:
             return self._updates.get(document_id, [])
 
+    async def get_state(self, document_id: str) -> bytes:
+        """
+        Return the full document state encoded as a single update. Pending
+        updates are compacted first, so later joins read a single snapshot.
+        """
+        document_id = document_id.replace(":", "_")
+
+        if self._redis:
+            snapshot, tail = await self._get_snapshot_and_tail(document_id)
+            if snapshot and not tail:
+                return snapshot
+            updates = ([snapshot] if snapshot else []) + tail
+        else:
+            updates = list(self._updates.get(document_id, []))
+            if len(updates) == 1:
+                return updates[0]
+
+        state = await self.compact_document(document_id)
+        if state is None:
+            state = await asyncio.to_thread(self._merge_updates, updates)
+        return state
+
     async def document_exists(self, document_id: str) -> bool:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
             redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            return await self._redis.exists(redis_key) > 0
+            snapshot_key = f"{self._redis_key_prefix}:{document_id}:snapshot"
+            return (
+                await self._redis.exists(redis_key) > 0
+                or await self._redis.exists(snapshot_key) > 0
+            )
         else:
             return document_id in self._updates
 
@@ -218,6 +527,8 @@ class YdocManager:
         if self._redis:
             redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
             await self._redis.delete(redis_key)
+            redis_snapshot_key = f"{self._redis_key_prefix}:{document_id}:snapshot"
+            await self._redis.delete(redis_snapshot_key)
             redis_users_key = f"{self._redis_key_prefix}:{document_id}:users"
             await self._redis.delete(redis_users_key)
         else:
@@ -225,3 +536,213 @@ class YdocManager:
                 del self._updates[document_id]
             if document_id in self._users:
                 del self._users[document_id]
+
+
+class ChatMessageEventBuffer:
+    """
+    Write-behind buffer for event emitter persistence. Events for the same
+    (chat_id, message_id) are merged in memory and written with a single
+    message read and upsert per flush.
+    """
+
+    def __init__(self, flush_interval: float = 1.0, max_events: int = 100):
+        self.flush_interval = flush_interval
+        self.max_events = max_events
+        self._pending = {}
+        self._flush_tasks = {}
+
+    async def add(self, chat_id: str, message_id: str, event_data: dict):
+        event_type = event_data.get("type")
+        data = event_data.get("data", {})
+
+        key = (chat_id, message_id)
+        pending = self._pending.setdefault(key, {"count": 0, "updates": {}})
+        updates = pending["updates"]
+
+        if event_type == "status":
+            updates.setdefault("statusHistory", []).append(data)
+        elif event_type == "message":
+            updates["content_delta"] = updates.get("content_delta", "") + data.get(
+                "content", ""
+            )
+        elif event_type == "replace":
+            updates["content"] = data.get("content", "")
+            updates["content_delta"] = ""
+        elif event_type in ["embeds", "files"]:
+            # Newer items come first, matching how they are prepended to the message
+            updates[event_type] = data.get(event_type, []) + updates.get(event_type, [])
+        elif event_type in ["source", "citation"] and data.get("type") == None:
+            updates.setdefault("sources", []).append(data)
+        else:
+            if not updates:
+                del self._pending[key]
+            return
+
+        pending["count"] += 1
+
+        if self.flush_interval <= 0 or pending["count"] >= self.max_events:
+            self._write(key)
+        elif key not in self._flush_tasks:
+            self._flush_tasks[key] = asyncio.create_task(self._flush_later(key))
+
+    async def flush(self, chat_id: str, message_id: str):
+        self._write((chat_id, message_id))
+
+    async def flush_all(self):
+        for key in list(self._pending.keys()):
+            self._write(key)
+
+    async def _flush_later(self, key: Tuple[str, str]):
+        await asyncio.sleep(self.flush_interval)
+        self._flush_tasks.pop(key, None)
+        self._write(key)
+
+    def _write(self, key: Tuple[str, str]):
+        task = self._flush_tasks.pop(key, None)
+        if task:
+            task.cancel()
+
+        pending = self._pending.pop(key, None)
+        if not pending:
+            return
+
+        chat_id, message_id = key
+        updates = pending["updates"]
+
+        try:
+            message = Chats.get_message_by_id_and_message_id(chat_id, message_id)
+            if message is None:
+                return
+
+            message_update = {}
+
+            if "content" in updates:
+                message_update["content"] = updates["content"] + updates.get(
+                    "content_delta", ""
+                )
+            elif "content_delta" in updates and message:
+                message_update["content"] = (
+                    message.get("content", "") + updates["content_delta"]
+                )
+
+            if "statusHistory" in updates and message:
+                message_update["statusHistory"] = (
+                    message.get("statusHistory", []) + updates["statusHistory"]
+                )
+
+            for field in ["embeds", "files"]:
+                if field in updates:
+                    message_update[field] = updates[field] + message.get(field, [])
+
+            if "sources" in updates:
+                message_update["sources"] = (
+                    message.get("sources", []) + updates["sources"]
+                )
+
+            if message_update:
+                Chats.upsert_message_to_chat_by_id_and_message_id(
+                    chat_id, message_id, message_update
+                )
+        except Exception as e:
+            log.exception(
+                f"Error flushing events for chat {chat_id} message {message_id}: {e}"
+            )
+
+
+class NoteRevisionBuffer:
+    """
+    Batches note revisions from collaborative edits into bulk inserts. With a
+    coalesce window, consecutive edits by the same author on the same note are
+    merged into a single revision until the window closes.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 1.0,
+        max_revisions: int = 100,
+        coalesce_window: float = 0,
+    ):
+        self.flush_interval = flush_interval
+        self.max_revisions = max_revisions
+        self.coalesce_window = coalesce_window
+        self._pending = []
+        self._open = {}
+        self._flush_task = None
+
+    async def add(
+        self,
+        note_id: str,
+        user_id: str,
+        user_name: str,
+        update: list[int],
+        content: Optional[dict] = None,
+    ):
+        now = time.time_ns()
+        key = (note_id, user_id)
+
+        revision = self._open.get(key)
+        if revision and now - revision["timestamp"] < self.coalesce_window * 1e9:
+            revision["update"] = Y.merge_updates(revision["update"], bytes(update))
+            revision["content"] = content or {}
+            return
+
+        revision = {
+            "id": str(uuid.uuid4()),
+            "note_id": note_id,
+            "author_id": user_id,
+            "author_name": user_name,
+            "timestamp": now,
+            "update": bytes(update),
+            "content": content or {},
+            "status": "pending",
+        }
+        self._pending.append(revision)
+        if self.coalesce_window > 0:
+            self._open[key] = revision
+
+        if self.flush_interval <= 0 or len(self._pending) >= self.max_revisions:
+            self._write()
+
+        if self._pending and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def flush(self, note_id: Optional[str] = None):
+        """Write pending revisions now, closing any open coalesce windows."""
+        self._write(note_id=note_id, force=True)
+
+    async def flush_all(self):
+        self._write(force=True)
+
+    async def _flush_loop(self):
+        try:
+            while self._pending:
+                await asyncio.sleep(max(self.flush_interval, 0.1))
+                self._write()
+        finally:
+            self._flush_task = None
+
+    def _write(self, note_id: Optional[str] = None, force: bool = False):
+        now = time.time_ns()
+
+        ready, held = [], []
+        for revision in self._pending:
+            if (note_id is None or revision["note_id"] == note_id) and (
+                force or now - revision["timestamp"] >= self.coalesce_window * 1e9
+            ):
+                ready.append(revision)
+            else:
+                held.append(revision)
+
+        if not ready:
+            return
+
+        self._pending = held
+        for revision in ready:
+            key = (revision["note_id"], revision["author_id"])
+            if self._open.get(key) is revision:
+                del self._open[key]
+
+        try:
+            Notes.insert_revision_events(ready)
+        except Exception as e:
+            log.exception(f"Error writing {len(ready)} note revisions: {e}")
@@ -0,0 +1,163 @@
+from unittest.mock import patch
+
+from open_webui.models.feedbacks import LeaderboardFeedbackData
+from open_webui.routers.evaluations import _Leaderboard
+
+
+class FakeFeedbacks:
+    """In-memory stand-in for the feedback table's leaderboard queries"""
+
+    def __init__(self):
+        self.feedbacks = {}
+
+    def add(self, id, model_id, opponent_id, rating, timestamp, tags=None):
+        self.feedbacks[id] = LeaderboardFeedbackData(
+            id=id,
+            data={
+                "model_id": model_id,
+                "sibling_model_ids": [opponent_id],
+                "rating": rating,
+                "tags": tags or [],
+            },
+            created_at=timestamp,
+            updated_at=timestamp,
+        )
+
+    def update(self, id, rating, timestamp):
+        feedback = self.feedbacks[id]
+        feedback.data = {**feedback.data, "rating": rating}
+        feedback.updated_at = timestamp
+
+    def delete(self, id):
+        del self.feedbacks[id]
+
+    def get_feedbacks_for_leaderboard(self, updated_since=None, db=None):
+        return [
+            feedback.model_copy(deep=True)
+            for feedback in sorted(
+                self.feedbacks.values(), key=lambda f: (f.created_at, f.id)
+            )
+            if updated_since is None or feedback.updated_at >= updated_since
+        ]
+
+    def get_feedbacks_version(self, db=None):
+        return len(self.feedbacks), max(
+            (feedback.updated_at for feedback in self.feedbacks.values()), default=0
+        )
+
+
+def replay() -> _Leaderboard:
+    """A leaderboard computed from scratch over the current feedback"""
+    leaderboard = _Leaderboard()
+    leaderboard.sync()
+    return leaderboard
+
+
+class TestLeaderboard:
+    """Test incremental leaderboard sync against a full replay"""
+
+    def setup_method(self):
+        self.feedbacks = FakeFeedbacks()
+        self.feedbacks.add("f1", "a", "b", 1, 100, ["code"])
+        self.feedbacks.add("f2", "b", "c", -1, 101, ["math"])
+        self.feedbacks.add("f3", "c", "a", 1, 102)
+
+        self.patcher = patch("open_webui.routers.evaluations.Feedbacks", self.feedbacks)
+        self.patcher.start()
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def test_inserts_match_full_replay(self):
+        leaderboard = _Leaderboard()
+        leaderboard.sync()
+
+        self.feedbacks.add("f4", "a", "c", -1, 103, ["code"])
+        self.feedbacks.add("f5", "b", "a", 1, 103)
+        with patch.object(
+            _Leaderboard, "_compute", side_effect=AssertionError
+        ) as compute:
+            leaderboard.sync()
+        compute.assert_not_called()
+
+        expected = replay()
+        assert leaderboard.model_stats == expected.model_stats
+        assert leaderboard.tag_counts == expected.tag_counts
+        assert leaderboard.version == expected.version
+
+    def test_unchanged_version_skips_queries(self):
+        leaderboard = _Leaderboard()
+        leaderboard.sync()
+
+        with patch.object(
+            self.feedbacks, "get_feedbacks_for_leaderboard"
+        ) as get_feedbacks:
+            leaderboard.sync()
+        get_feedbacks.assert_not_called()
+
+    def test_update_triggers_recompute(self):
+        leaderboard = _Leaderboard()
+        leaderboard.sync()
+
+        self.feedbacks.update("f1", -1, 110)
+        with patch.object(
+            _Leaderboard, "_compute", autospec=True, side_effect=_Leaderboard._compute
+        ) as compute:
+            leaderboard.sync()
+        compute.assert_called_once()
+
+        expected = replay()
+        assert leaderboard.model_stats == expected.model_stats
+        assert leaderboard.model_stats["a"]["lost"] == 2
+
+    def test_delete_triggers_recompute(self):
+        leaderboard = _Leaderboard()
+        leaderboard.sync()
+
+        self.feedbacks.delete("f2")
+        self.feedbacks.add("f4", "a", "c", 1, 103)
+        with patch.object(
+            _Leaderboard, "_compute", autospec=True, side_effect=_Leaderboard._compute
+        ) as compute:
+            leaderboard.sync()
+        compute.assert_called_once()
+
+        expected = replay()
+        assert leaderboard.model_stats == expected.model_stats
+        assert leaderboard.tag_counts == expected.tag_counts
+        assert "math" not in leaderboard.tag_counts.get("b", {})
+
+    def test_update_in_same_second_triggers_recompute(self):
+        """An edit in the second of the last sync leaves the version unchanged"""
+        leaderboard = _Leaderboard()
+        with patch("open_webui.routers.evaluations.time.time", return_value=102.5):
+            leaderboard.sync()
+
+        version = self.feedbacks.get_feedbacks_version()
+        self.feedbacks.update("f3", -1, 102)
+        assert self.feedbacks.get_feedbacks_version() == version
+
+        with patch("open_webui.routers.evaluations.time.time", return_value=110):
+            leaderboard.sync()
+
+        expected = replay()
+        assert leaderboard.model_stats == expected.model_stats
+        assert leaderboard.model_stats["a"]["won"] == 2
+
+    def test_settled_version_skips_queries(self):
+        leaderboard = _Leaderboard()
+        with patch("open_webui.routers.evaluations.time.time", return_value=102.5):
+            leaderboard.sync()
+
+        with patch("open_webui.routers.evaluations.time.time", return_value=110):
+            with patch.object(
+                _Leaderboard, "_compute", side_effect=AssertionError
+            ) as compute:
+                leaderboard.sync()
+            compute.assert_not_called()
+
+            with patch.object(
+                self.feedbacks, "get_feedbacks_for_leaderboard"
+            ) as get_feedbacks:
+                leaderboard.sync()
+            get_feedbacks.assert_not_called()
@@ -0,0 +1,122 @@
+import asyncio
+from unittest.mock import patch
+
+from open_webui.storage.provider import LocalStorageProvider
+from open_webui.utils.speech_cache import SpeechCache
+
+
+def write_entry(cache: SpeechCache, name: str, size: int):
+    file_path, body_path = cache.get_paths(name)
+    file_path.write_bytes(b"0" * size)
+    body_path.write_text("{}")
+
+
+class FakeRemoteStorage:
+    """Uploads like the S3/GCS/Azure providers: a local copy plus a remote URI"""
+
+    def __init__(self, upload_dir):
+        self.upload_dir = upload_dir
+
+    def upload_file(self, file, filename, tags):
+        contents = file.read()
+        (self.upload_dir / filename).write_bytes(contents)
+        return contents, f"s3://bucket/{filename}"
+
+    def get_file_path(self, filename):
+        return f"s3://bucket/{filename}"
+
+
+class TestSpeechCache:
+    """Test the bounded speech cache"""
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = SpeechCache(tmp_path, max_bytes=250)
+        for name in ["a", "b"]:
+            write_entry(cache, name, 100)
+            cache.add(name)
+        cache.get("a")
+
+        write_entry(cache, "c", 100)
+        cache.add("c")
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+    def test_evicts_least_frequently_used(self, tmp_path):
+        cache = SpeechCache(tmp_path, max_bytes=25, eviction="lfu")
+        for name in ["a", "b"]:
+            write_entry(cache, name, 10)
+            cache.add(name)
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+
+        async def create(file_path, body_path):
+            file_path.write_bytes(b"0" * 10)
+            body_path.write_text("{}")
+
+        # The new entry has no hits yet, but is never the one evicted
+        file_path = asyncio.run(cache.get_or_create("c", create))
+
+        assert file_path.exists()
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+
+    def test_concurrent_requests_share_one_synthesis(self, tmp_path):
+        cache = SpeechCache(tmp_path)
+        calls = []
+
+        async def create(file_path, body_path):
+            calls.append(file_path)
+            await asyncio.sleep(0.01)
+            file_path.write_bytes(b"mp3")
+            body_path.write_text("{}")
+
+        async def main():
+            return await asyncio.gather(
+                *[cache.get_or_create("a", create) for _ in range(3)]
+            )
+
+        paths = asyncio.run(main())
+
+        assert len(calls) == 1
+        assert len(set(paths)) == 1
+
+    def test_shared_upload_removes_local_copy(self, tmp_path):
+        cache_dir = tmp_path / "cache"
+        upload_dir = tmp_path / "uploads"
+        cache_dir.mkdir()
+        upload_dir.mkdir()
+
+        cache = SpeechCache(cache_dir, shared=True)
+        write_entry(cache, "a", 100)
+
+        with (
+            patch(
+                "open_webui.utils.speech_cache.Storage", FakeRemoteStorage(upload_dir)
+            ),
+            patch("open_webui.storage.provider.UPLOAD_DIR", str(upload_dir)),
+        ):
+            cache.add("a")
+
+        assert not (upload_dir / "speech-a.mp3").exists()
+        assert cache.get_paths("a")[0].exists()
+
+    def test_shared_upload_keeps_local_storage_file(self, tmp_path):
+        cache_dir = tmp_path / "cache"
+        upload_dir = tmp_path / "uploads"
+        cache_dir.mkdir()
+        upload_dir.mkdir()
+
+        cache = SpeechCache(cache_dir, shared=True)
+        write_entry(cache, "a", 100)
+
+        with (
+            patch("open_webui.utils.speech_cache.Storage", LocalStorageProvider()),
+            patch("open_webui.storage.provider.UPLOAD_DIR", str(upload_dir)),
+        ):
+            cache.add("a")
+
+        # With local storage the uploaded file is the shared copy
+        assert (upload_dir / "speech-a.mp3").exists()
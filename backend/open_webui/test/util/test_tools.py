@@ -0,0 +1,121 @@
+import asyncio
+from types import ModuleType, SimpleNamespace
+from unittest.mock import patch
+
+from pydantic import BaseModel
+
+from open_webui.utils.tools import ResolvedTool, ToolServerSpecRegistry, get_tools
+
+
+SPEC = {
+    "name": "lookup",
+    "parameters": {"type": "object", "properties": {"__user__": {}}},
+}
+
+
+def lookup(__user__: dict) -> dict:
+    return __user__
+
+
+def get_module(valves: bool = False, user_valves: bool = False) -> ModuleType:
+    module = ModuleType("tool")
+    module.lookup = lookup
+    if valves:
+
+        class Valves(BaseModel):
+            api_key: str = ""
+
+        module.Valves = Valves
+        module.valves = Valves()
+    if user_valves:
+
+        class UserValves(BaseModel):
+            units: str = "metric"
+
+        module.UserValves = UserValves
+    return module
+
+
+def call_tool(module: ModuleType, valves=None, user_valves=None):
+    tool = SimpleNamespace(
+        id="t1", user_id="u1", access_control=None, updated_at=0, specs=[SPEC]
+    )
+    user = SimpleNamespace(
+        id="u1",
+        role="user",
+        settings=SimpleNamespace(
+            model_dump=lambda: {"tools": {"valves": {"t1": user_valves}}}
+        ),
+    )
+
+    with (
+        patch(
+            "open_webui.utils.tools.get_resolved_tools",
+            return_value={"t1": ResolvedTool(tool, module, valves)},
+        ),
+        patch("open_webui.utils.models.MODEL_ACCESS_INDEX"),
+    ):
+        tools = asyncio.run(get_tools(None, ["t1"], user, {"__user__": {"id": "u1"}}))
+
+    return asyncio.run(tools["lookup"]["callable"]())
+
+
+class TestGetTools:
+    """Test binding tool valves and user valves"""
+
+    def test_valves_only(self):
+        module = get_module(valves=True)
+        __user__ = call_tool(module, valves={"api_key": "sk-1"})
+
+        assert module.valves.api_key == "sk-1"
+        assert "valves" not in __user__
+
+    def test_user_valves_only(self):
+        module = get_module(user_valves=True)
+        __user__ = call_tool(module, user_valves={"units": "imperial"})
+
+        assert __user__["valves"].units == "imperial"
+        assert not hasattr(module, "valves")
+
+    def test_valves_and_user_valves(self):
+        module = get_module(valves=True, user_valves=True)
+        __user__ = call_tool(module, valves={"api_key": "sk-1"})
+
+        assert module.valves.api_key == "sk-1"
+        assert __user__["valves"].units == "metric"
+
+
+class TestToolServerSpecRegistry:
+    """Test when tool server specs are reloaded"""
+
+    def test_failed_spec_is_retried_with_backoff(self):
+        registry = ToolServerSpecRegistry(
+            refresh_interval=300, retry_interval=5, max_retry_interval=30
+        )
+        source = {"spec": "not json"}
+
+        with patch("open_webui.utils.tools.time.time", return_value=1000):
+            asyncio.run(registry._load("k", source))
+        assert not registry._is_stale("k", 1004)
+        assert registry._is_stale("k", 1005)
+
+        with patch("open_webui.utils.tools.time.time", return_value=1005):
+            asyncio.run(registry._load("k", source))
+        assert not registry._is_stale("k", 1014)
+        assert registry._is_stale("k", 1015)
+
+        registry._failures["k"] = (1000, 10)
+        assert not registry._is_stale("k", 1029)
+        assert registry._is_stale("k", 1030)
+
+    def test_loaded_spec_is_revalidated_after_refresh_interval(self):
+        registry = ToolServerSpecRegistry(refresh_interval=300, retry_interval=5)
+        source = {"spec": '{"openapi": "3.0.0", "paths": {}}'}
+
+        registry._failures["k"] = (900, 1)
+        with patch("open_webui.utils.tools.time.time", return_value=1000):
+            asyncio.run(registry._load("k", source))
+
+        assert "k" not in registry._failures
+        assert not registry._is_stale("k", 1299)
+        assert registry._is_stale("k", 1300)
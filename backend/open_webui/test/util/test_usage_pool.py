@@ -0,0 +1,57 @@
+import asyncio
+
+from open_webui.socket.utils import UsagePool
+
+
+def add_heartbeats(pool: UsagePool, heartbeats: list[tuple]):
+    async def main():
+        for model_id, sid, timestamp in heartbeats:
+            await pool.add(model_id, sid, timestamp)
+
+    asyncio.run(main())
+
+
+class TestUsagePool:
+    """Test model usage tracking without Redis"""
+
+    def test_get_models_since(self):
+        pool = UsagePool()
+        add_heartbeats(pool, [("a", "s1", 100), ("b", "s2", 110), ("c", "s3", 120)])
+
+        assert sorted(asyncio.run(pool.get_models(110))) == ["b", "c"]
+        assert asyncio.run(pool.get_models(121)) == []
+
+    def test_heartbeat_moves_model_forward(self):
+        pool = UsagePool()
+        add_heartbeats(pool, [("a", "s1", 100), ("b", "s2", 110), ("a", "s3", 120)])
+
+        assert asyncio.run(pool.get_models(115)) == ["a"]
+        assert sorted(asyncio.run(pool.get_models(100))) == ["a", "b"]
+
+    def test_expire_removes_old_heartbeats(self):
+        pool = UsagePool()
+        add_heartbeats(pool, [("a", "s1", 100), ("b", "s3", 105), ("a", "s2", 120)])
+
+        asyncio.run(pool.expire(110))
+
+        assert asyncio.run(pool.get_models(0)) == ["a"]
+        assert list(pool._sessions) == ["a"]
+        assert list(pool._sessions["a"]) == ["s2"]
+
+    def test_expire_keeps_renewed_session(self):
+        pool = UsagePool()
+        add_heartbeats(pool, [("a", "s1", 100), ("a", "s2", 105), ("a", "s1", 120)])
+
+        asyncio.run(pool.expire(110))
+
+        assert list(pool._sessions["a"]) == ["s1"]
+        assert asyncio.run(pool.get_models(110)) == ["a"]
+
+    def test_clock_step_back_keeps_order(self):
+        pool = UsagePool()
+        add_heartbeats(pool, [("a", "s1", 120), ("b", "s2", 105)])
+
+        assert sorted(asyncio.run(pool.get_models(110))) == ["a", "b"]
+
+        asyncio.run(pool.expire(110))
+        assert sorted(asyncio.run(pool.get_models(0))) == ["a", "b"]
@@ -0,0 +1,146 @@
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from open_webui.utils.user_cache import UserActivityBuffer, UserCache
+
+
+class FakeUser(SimpleNamespace):
+    def model_copy(self, deep=False):
+        return FakeUser(**vars(self))
+
+
+def get_cache(**kwargs) -> UserCache:
+    cache = UserCache(**kwargs)
+    cache.enabled = True
+    return cache
+
+
+class TestUserCache:
+    """Test the authentication user cache"""
+
+    def test_set_and_get_user(self):
+        cache = get_cache()
+        cache.set_user(FakeUser(id="u1", name="a"), cache.generation)
+
+        user = cache.get_user("u1")
+        assert user.name == "a"
+
+        # Callers get a copy they can modify
+        user.name = "b"
+        assert cache.get_user("u1").name == "a"
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = UserCache()
+        cache.enabled = False
+        cache.set_user(FakeUser(id="u1"), cache.generation)
+
+        assert cache.get_user("u1") is None
+
+    def test_entries_expire(self):
+        cache = get_cache(ttl=0.01)
+        cache.set_permission("u1", "chat.edit", True, cache.generation)
+        time.sleep(0.02)
+
+        assert cache.get_permission("u1", "chat.edit") is None
+
+    def test_lru_eviction(self):
+        cache = get_cache(maxsize=2)
+        for user_id in ["u1", "u2"]:
+            cache.set_user(FakeUser(id=user_id), cache.generation)
+        cache.get_user("u1")
+        cache.set_user(FakeUser(id="u3"), cache.generation)
+
+        assert cache.get_user("u1") is not None
+        assert cache.get_user("u2") is None
+        assert cache.get_user("u3") is not None
+
+    def test_stale_generation_is_not_stored(self):
+        """Values loaded before an invalidation are dropped"""
+        cache = get_cache()
+        generation = cache.generation
+        cache.clear("u1")
+        cache.set_user(FakeUser(id="u1"), generation)
+
+        assert cache.get_user("u1") is None
+
+    def test_clear_user(self):
+        cache = get_cache()
+        generation = cache.generation
+        cache.set_user(FakeUser(id="u1"), generation)
+        cache.set_user(FakeUser(id="u2"), generation)
+        cache.set_api_key("sk-1", "u1", generation)
+        cache.set_api_key("sk-2", "u2", generation)
+        cache.set_permission("u1", "chat.edit", True, generation)
+        cache.set_permission("u2", "chat.edit", False, generation)
+
+        cache.clear("u1")
+
+        assert cache.get_user("u1") is None
+        assert cache.get_user_id_by_api_key("sk-1") is None
+        assert cache.get_permission("u1", "chat.edit") is None
+        assert cache.get_user("u2") is not None
+        assert cache.get_user_id_by_api_key("sk-2") == "u2"
+        assert cache.get_permission("u2", "chat.edit") is False
+
+    def test_clear_all(self):
+        cache = get_cache()
+        generation = cache.generation
+        cache.set_user(FakeUser(id="u1"), generation)
+        cache.set_api_key("sk-1", "u1", generation)
+
+        cache.clear()
+
+        assert cache.generation == generation + 1
+        assert cache.get_user("u1") is None
+        assert cache.get_user_id_by_api_key("sk-1") is None
+
+
+class TestUserActivityBuffer:
+    """Test batching of last active timestamps"""
+
+    @patch("open_webui.models.users.Users")
+    def test_flush_writes_each_users_timestamp(self, mock_users):
+        buffer = UserActivityBuffer(flush_interval=10)
+        with patch(
+            "open_webui.utils.user_cache.time.time", side_effect=[100, 100, 105]
+        ):
+            buffer.add("u1")
+            buffer.add("u2")
+            buffer.add("u3")
+
+        buffer.flush()
+
+        calls = sorted(
+            (sorted(args[0]), args[1])
+            for args, _ in mock_users.update_last_active_by_ids.call_args_list
+        )
+        assert calls == [(["u1", "u2"], 100), (["u3"], 105)]
+
+    @patch("open_webui.models.users.Users")
+    def test_latest_activity_wins(self, mock_users):
+        buffer = UserActivityBuffer(flush_interval=10)
+        with patch("open_webui.utils.user_cache.time.time", side_effect=[100, 107]):
+            buffer.add("u1")
+            buffer.add("u1")
+
+        buffer.flush()
+
+        mock_users.update_last_active_by_ids.assert_called_once_with(["u1"], 107)
+
+    @patch("open_webui.models.users.Users")
+    def test_flush_empties_buffer(self, mock_users):
+        buffer = UserActivityBuffer(flush_interval=10)
+        buffer.add("u1")
+        buffer.flush()
+        buffer.flush()
+
+        assert mock_users.update_last_active_by_ids.call_count == 1
+
+    @patch("open_webui.models.users.Users")
+    def test_without_interval_writes_immediately(self, mock_users):
+        buffer = UserActivityBuffer(flush_interval=0)
+        buffer.add("u1")
+
+        mock_users.update_last_active_by_id.assert_called_once_with("u1")
+        mock_users.update_last_active_by_ids.assert_not_called()
@@ -0,0 +1,63 @@
+import logging
+import threading
+from typing import Optional
+
+from open_webui.env import (
+    REDIS_CLUSTER,
+    REDIS_KEY_PREFIX,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    REDIS_URL,
+)
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
+
+####################
+# Version counter for caches derived from models, groups and access control.
+# Writers bump it after committing; readers rebuild when it changes. The Redis
+# counter carries changes made on other workers.
+####################
+
+ACCESS_VERSION_KEY = f"{REDIS_KEY_PREFIX}:access:version"
+
+_local_version = 0
+_lock = threading.Lock()
+
+
+def _get_redis():
+    if not REDIS_URL:
+        return None
+
+    return get_redis_connection(
+        REDIS_URL,
+        get_sentinels_from_env(REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT),
+        redis_cluster=REDIS_CLUSTER,
+    )
+
+
+def bump_access_version():
+    global _local_version
+    with _lock:
+        _local_version += 1
+
+    try:
+        redis = _get_redis()
+        if redis is not None:
+            redis.incr(ACCESS_VERSION_KEY)
+    except Exception as e:
+        log.warning(f"Failed to publish access version: {e}")
+
+
+def get_access_version() -> Optional[tuple[int, str]]:
+    """Current version, or None if it cannot be determined."""
+    try:
+        redis = _get_redis()
+        remote_version = (
+            (redis.get(ACCESS_VERSION_KEY) or "0") if redis is not None else ""
+        )
+    except Exception as e:
+        log.warning(f"Failed to read access version: {e}")
+        return None
+
+    return _local_version, remote_version
@@ -25,6 +25,7 @@ from opentelemetry import trace
 from open_webui.utils.access_control import has_permission
 from open_webui.models.users import Users
 from open_webui.models.auths import Auths
+from open_webui.utils.user_cache import USER_CACHE, USER_ACTIVITY_BUFFER
 
 
 from open_webui.constants import ERROR_MESSAGES
@@ -324,7 +325,7 @@ async def get_current_user(
                     detail="Invalid token",
                 )
 
-            user = Users.get_user_by_id(data["id"])
+            user = get_user_by_id_cached(data["id"])
             if user is None:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -349,10 +350,8 @@ async def get_current_user(
                     current_span.set_attribute("client.user.role", user.role)
                     current_span.set_attribute("client.auth.type", "jwt")
 
-                # Refresh the user's last active timestamp asynchronously
-                # to prevent blocking the request
-                if background_tasks:
-                    background_tasks.add_task(Users.update_last_active_by_id, user.id)
+                # Refresh the user's last active timestamp in the next batched write
+                USER_ACTIVITY_BUFFER.add(user.id)
             return user
         else:
             raise HTTPException(
@@ -374,9 +373,47 @@ async def get_current_user(
         raise e
 
 
+def get_user_by_id_cached(user_id: str):
+    user = USER_CACHE.get_user(user_id)
+    if user is None:
+        generation = USER_CACHE.generation
+        user = Users.get_user_by_id(user_id)
+        if user is not None:
+            USER_CACHE.set_user(user, generation)
+    return user
+
+
+def get_user_by_api_key_cached(api_key: str):
+    user_id = USER_CACHE.get_user_id_by_api_key(api_key)
+    if user_id is not None:
+        user = USER_CACHE.get_user(user_id)
+        if user is not None:
+            return user
+
+    generation = USER_CACHE.generation
+    user = Users.get_user_by_api_key(api_key)
+    if user is not None:
+        USER_CACHE.set_user(user, generation)
+        USER_CACHE.set_api_key(api_key, user.id, generation)
+    return user
+
+
+def has_api_key_permission(request, user_id: str) -> bool:
+    permission = USER_CACHE.get_permission(user_id, "features.api_keys")
+    if permission is None:
+        generation = USER_CACHE.generation
+        permission = has_permission(
+            user_id,
+            "features.api_keys",
+            request.app.state.config.USER_PERMISSIONS,
+        )
+        USER_CACHE.set_permission(user_id, "features.api_keys", permission, generation)
+    return permission
+
+
 def get_current_user_by_api_key(request, api_key: str):
     # Each function call manages its own short-lived session internally
-    user = Users.get_user_by_api_key(api_key)
+    user = get_user_by_api_key_cached(api_key)
 
     if user is None:
         raise HTTPException(
@@ -385,12 +422,7 @@ def get_current_user_by_api_key(request, api_key: str):
         )
 
     if not request.state.enable_api_keys or (
-        user.role != "admin"
-        and not has_permission(
-            user.id,
-            "features.api_keys",
-            request.app.state.config.USER_PERMISSIONS,
-        )
+        user.role != "admin" and not has_api_key_permission(request, user.id)
     ):
         raise HTTPException(
             status.HTTP_403_FORBIDDEN, detail=ERROR_MESSAGES.API_KEY_NOT_ALLOWED
@@ -404,7 +436,7 @@ def get_current_user_by_api_key(request, api_key: str):
         current_span.set_attribute("client.user.role", user.role)
         current_span.set_attribute("client.auth.type", "api_key")
 
-    Users.update_last_active_by_id(user.id)
+    USER_ACTIVITY_BUFFER.add(user.id)
     return user
 
 
@@ -1,9 +1,11 @@
 import inspect
 import logging
+from typing import Optional
 
 from open_webui.utils.plugin import (
     load_function_module_by_id,
     get_function_module_from_cache,
+    is_plugin_cache_authoritative,
 )
 from open_webui.models.functions import Functions
 
@@ -20,39 +22,123 @@ def get_function_module(request, function_id, load_from_db=True):
     return function_module
 
 
-def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None):
-    def get_priority(function_id):
-        function = Functions.get_function_by_id(function_id)
-        if function is not None:
-            valves = Functions.get_function_valves_by_id(function_id)
-            return valves.get("priority", 0) if valves else 0
-        return 0
-
-    filter_ids = [function.id for function in Functions.get_global_filter_functions()]
-    if "info" in model and "meta" in model["info"]:
-        filter_ids.extend(model["info"]["meta"].get("filterIds", []))
-        filter_ids = list(set(filter_ids))
-    active_filter_ids = [
-        function.id
-        for function in Functions.get_functions_by_type("filter", active_only=True)
-    ]
+FILTER_TYPES = ("inlet", "outlet", "stream")
 
-    def get_active_status(filter_id):
-        function_module = get_function_module(request, filter_id)
 
-        if getattr(function_module, "toggle", None):
-            return filter_id in (enabled_filter_ids or [])
+class FilterFunction:
+    """
+    An active filter function with its module, handlers and valves resolved,
+    so running it needs no database access.
+    """
 
-        return True
+    def __init__(self, id: str, module, valves: Optional[dict], is_global: bool):
+        self.id = id
+        self.module = module
+        self.valves = valves or {}
+        self.priority = self.valves.get("priority", 0)
+        self.is_global = is_global
+        self.toggle = bool(getattr(module, "toggle", None))
+
+        # filter_type -> (handler, parameter names, is coroutine)
+        self.handlers = {}
+        for filter_type in FILTER_TYPES:
+            handler = getattr(module, filter_type, None)
+            if handler:
+                self.handlers[filter_type] = (
+                    handler,
+                    set(inspect.signature(handler).parameters),
+                    inspect.iscoroutinefunction(handler),
+                )
+
+        self._valves_instance = None
+
+    def get_valves_instance(self):
+        if self._valves_instance is None:
+            self._valves_instance = self.module.Valves(**self.valves)
+        return self._valves_instance
+
+
+class FilterChainCache:
+    """
+    Active filter functions and the sorted filter chains built from them,
+    keyed by a model's filter IDs and the enabled toggleable filters. Cleared
+    through clear_plugin_module_cache when functions or their valves change.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.version = None
+        self.filters = None
+        self.chains = {}
+
+
+FILTER_CHAIN_CACHE_SIZE = 1000
+
+
+def load_filter_functions(request) -> dict[str, FilterFunction]:
+    return {
+        function.id: FilterFunction(
+            function.id,
+            get_function_module(request, function.id),
+            function.valves,
+            function.is_global,
+        )
+        for function in Functions.get_functions_with_valves_by_type(
+            "filter", active_only=True
+        )
+    }
 
-    active_filter_ids = [
-        filter_id for filter_id in active_filter_ids if get_active_status(filter_id)
-    ]
 
-    filter_ids = [fid for fid in filter_ids if fid in active_filter_ids]
-    filter_ids.sort(key=get_priority)
+def get_filter_functions(
+    request, model: dict, enabled_filter_ids: list = None
+) -> list[FilterFunction]:
+    """The active filters that apply to a model, sorted by priority."""
+    cache = request.app.state.FILTER_CHAINS
 
-    return filter_ids
+    if not is_plugin_cache_authoritative(request):
+        # Changes on other workers don't clear this cache, check for them here
+        version = Functions.get_functions_version_by_type("filter")
+        if version != cache.version:
+            cache.clear()
+            cache.version = version
+
+    if cache.filters is None:
+        cache.filters = load_filter_functions(request)
+
+    model_filter_ids = []
+    if "info" in model and "meta" in model["info"]:
+        model_filter_ids = model["info"]["meta"].get("filterIds", [])
+
+    key = (
+        tuple(sorted(set(model_filter_ids))),
+        tuple(sorted(set(enabled_filter_ids or []))),
+    )
+    chain = cache.chains.get(key)
+    if chain is None:
+        filter_ids, enabled_filter_ids = set(key[0]), set(key[1])
+        chain = sorted(
+            (
+                filter
+                for filter in cache.filters.values()
+                if (filter.is_global or filter.id in filter_ids)
+                and (not filter.toggle or filter.id in enabled_filter_ids)
+            ),
+            key=lambda filter: filter.priority,
+        )
+
+        if len(cache.chains) >= FILTER_CHAIN_CACHE_SIZE:
+            cache.chains.clear()
+        cache.chains[key] = chain
+
+    return chain
+
+
+def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None):
+    return [
+        filter.id for filter in get_filter_functions(request, model, enabled_filter_ids)
+    ]
 
 
 async def process_filter_functions(
@@ -60,19 +146,17 @@ async def process_filter_functions(
 ):
     skip_files = None
 
-    for function in filter_functions:
-        filter = function
-        filter_id = function.id
+    for filter in filter_functions:
         if not filter:
             continue
 
-        function_module = get_function_module(
-            request, filter_id, load_from_db=(filter_type != "stream")
-        )
+        filter_id = filter.id
+        function_module = filter.module
+
         # Prepare handler function
-        handler = getattr(function_module, filter_type, None)
-        if not handler:
+        if filter_type not in filter.handlers:
             continue
+        handler, handler_params, is_coroutine = filter.handlers[filter_type]
 
         # Check if the function has a file_handler variable
         if filter_type == "inlet" and hasattr(function_module, "file_handler"):
@@ -80,15 +164,10 @@ async def process_filter_functions(
 
         # Apply valves to the function
         if hasattr(function_module, "valves") and hasattr(function_module, "Valves"):
-            valves = Functions.get_function_valves_by_id(filter_id)
-            function_module.valves = function_module.Valves(
-                **(valves if valves else {})
-            )
+            function_module.valves = filter.get_valves_instance()
 
         try:
             # Prepare parameters
-            sig = inspect.signature(handler)
-
             params = {"body": form_data}
             if filter_type == "stream":
                 params = {"event": form_data}
@@ -99,11 +178,11 @@ async def process_filter_functions(
                     **extra_params,
                     "__id__": filter_id,
                 }.items()
-                if k in sig.parameters
+                if k in handler_params
             }
 
             # Handle user parameters
-            if "__user__" in sig.parameters:
+            if "__user__" in handler_params:
                 if hasattr(function_module, "UserValves"):
                     try:
                         params["__user__"]["valves"] = function_module.UserValves(
@@ -115,7 +194,7 @@ async def process_filter_functions(
                         log.exception(f"Failed to get user values: {e}")
 
             # Execute handler
-            if inspect.iscoroutinefunction(handler):
+            if is_coroutine:
                 form_data = await handler(**params)
             else:
                 form_data = handler(**params)
@@ -0,0 +1,267 @@
+import logging
+import os
+import random
+import time
+from typing import Optional
+
+from open_webui.env import INSTANCE_ID, REDIS_KEY_PREFIX, REDIS_URL
+from open_webui.utils.redis import get_redis_client
+
+log = logging.getLogger(__name__)
+
+LOAD_BALANCING_POLICIES = [
+    "least_outstanding",
+    "weighted_round_robin",
+    "latency",
+    "random",
+]
+
+# Seconds after which the in-flight counts of a worker that stopped reporting
+# (e.g. crashed mid-request) are no longer counted
+IN_FLIGHT_TTL = 120
+
+
+class BackendRequest:
+    """An in-flight request to a backend, released exactly once."""
+
+    def __init__(self, balancer: "BackendLoadBalancer", url: str):
+        self.balancer = balancer
+        self.url = url
+        self.started_at = time.monotonic()
+        self.released = False
+
+    def record(self, error: bool = False):
+        """Record the response time so far, or a failure, for the backend."""
+        self.balancer.record_result(
+            self.url, None if error else time.monotonic() - self.started_at, error
+        )
+
+    async def release(self):
+        if self.released:
+            return
+        self.released = True
+        await self.balancer.release(self.url)
+
+
+class BackendLoadBalancer:
+    """
+    Picks a backend among the connections serving a model.
+
+    Requests in flight are counted per backend URL. With Redis, each worker
+    publishes its own counts under a key that expires unless refreshed, and
+    readers add up the counts of live workers, so all workers see the same
+    load and counts of crashed workers drop out. Response times are kept as an EWMA and
+    backends that fail repeatedly are skipped until their ejection time passes.
+    Latency and health are tracked per worker.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        policy: str = "least_outstanding",
+        max_failures: int = 3,
+        ejection_time: float = 30.0,
+        ewma_alpha: float = 0.3,
+    ):
+        if policy not in LOAD_BALANCING_POLICIES:
+            log.warning(
+                f"Unknown load balancing policy {policy}, using least_outstanding"
+            )
+            policy = "least_outstanding"
+
+        self.policy = policy
+        self.max_failures = max_failures
+        self.ejection_time = ejection_time
+        self.ewma_alpha = ewma_alpha
+        self.redis_key = f"{REDIS_KEY_PREFIX}:load_balancer:{name}:in_flight"
+        self.worker_id = f"{INSTANCE_ID}:{os.getpid()}"
+
+        self._in_flight = {}
+        self._published_at = 0.0
+        self._latency = {}
+        self._failures = {}
+        self._ejected_until = {}
+        self._requests = {}
+        self._errors = {}
+        self._current_weights = {}
+
+    def _get_redis(self):
+        return get_redis_client(async_mode=True) if REDIS_URL else None
+
+    async def get_in_flight(self, urls: list[str]) -> dict[str, int]:
+        redis = self._get_redis()
+        if redis is not None and urls:
+            try:
+                if time.time() - self._published_at > IN_FLIGHT_TTL / 2:
+                    # Keep our counts alive while long requests are running
+                    await self._publish_in_flight(redis)
+
+                workers_key = f"{self.redis_key}:workers"
+                now = time.time()
+                pipe = redis.pipeline()
+                pipe.zremrangebyscore(workers_key, "-inf", now - IN_FLIGHT_TTL)
+                pipe.zrange(workers_key, 0, -1)
+                _, worker_ids = await pipe.execute()
+
+                pipe = redis.pipeline()
+                for worker_id in worker_ids:
+                    pipe.hmget(f"{self.redis_key}:{worker_id}", urls)
+                in_flight = {url: 0 for url in urls}
+                for values in await pipe.execute():
+                    for url, value in zip(urls, values):
+                        in_flight[url] += max(int(value or 0), 0)
+                return in_flight
+            except Exception as e:
+                log.warning(f"Failed to read in-flight requests from Redis: {e}")
+
+        return {url: self._in_flight.get(url, 0) for url in urls}
+
+    async def _publish_in_flight(self, redis, urls: Optional[list[str]] = None):
+        """Write this worker's current counts for urls (default: all)."""
+        worker_key = f"{self.redis_key}:{self.worker_id}"
+        now = time.time()
+
+        pipe = redis.pipeline()
+        mapping = {
+            url: self._in_flight[url]
+            for url in (urls if urls is not None else self._in_flight)
+        }
+        if mapping:
+            pipe.hset(worker_key, mapping=mapping)
+        pipe.expire(worker_key, IN_FLIGHT_TTL)
+        pipe.zadd(f"{self.redis_key}:workers", {self.worker_id: now})
+        await pipe.execute()
+        self._published_at = now
+
+    async def _add_in_flight(self, url: str, amount: int):
+        self._in_flight[url] = max(self._in_flight.get(url, 0) + amount, 0)
+
+        redis = self._get_redis()
+        if redis is not None:
+            try:
+                # Absolute counts, so an expired key is fully restored
+                await self._publish_in_flight(
+                    redis,
+                    (
+                        None
+                        if time.time() - self._published_at > IN_FLIGHT_TTL / 2
+                        else [url]
+                    ),
+                )
+            except Exception as e:
+                log.warning(f"Failed to update in-flight requests in Redis: {e}")
+
+    def is_ejected(self, url: str) -> bool:
+        return self._ejected_until.get(url, 0) > time.monotonic()
+
+    def record_result(
+        self, url: str, latency: Optional[float] = None, error: bool = False
+    ):
+        self._requests[url] = self._requests.get(url, 0) + 1
+
+        if error:
+            self._errors[url] = self._errors.get(url, 0) + 1
+            self._failures[url] = self._failures.get(url, 0) + 1
+            if self._failures[url] >= self.max_failures:
+                log.warning(
+                    f"Backend {url} failed {self._failures[url]} times in a row, "
+                    f"skipping it for {self.ejection_time}s"
+                )
+                self._ejected_until[url] = time.monotonic() + self.ejection_time
+                self._failures[url] = 0
+            return
+
+        self._failures[url] = 0
+        self._ejected_until.pop(url, None)
+        if latency is not None:
+            previous = self._latency.get(url)
+            self._latency[url] = (
+                latency
+                if previous is None
+                else self.ewma_alpha * latency + (1 - self.ewma_alpha) * previous
+            )
+
+    async def select(
+        self, url_idxs: list[int], base_urls: list[str], api_configs: dict
+    ) -> int:
+        """Pick one of url_idxs, indexes into base_urls."""
+        if len(url_idxs) <= 1:
+            return url_idxs[0]
+
+        candidates = [
+            idx for idx in url_idxs if not self.is_ejected(base_urls[idx])
+        ] or url_idxs
+
+        def get_weight(idx):
+            api_config = api_configs.get(
+                str(idx), api_configs.get(base_urls[idx], {})  # Legacy support
+            )
+            try:
+                return max(float(api_config.get("weight", 1)), 0.0)
+            except (TypeError, ValueError):
+                return 1.0
+
+        if self.policy == "random":
+            return random.choice(candidates)
+
+        if self.policy == "weighted_round_robin":
+            # Smooth weighted round-robin
+            weights = {idx: get_weight(idx) for idx in candidates}
+            total = sum(weights.values())
+            if total <= 0:
+                return random.choice(candidates)
+
+            for idx in candidates:
+                url = base_urls[idx]
+                self._current_weights[url] = (
+                    self._current_weights.get(url, 0) + weights[idx]
+                )
+            selected = max(
+                candidates, key=lambda idx: self._current_weights[base_urls[idx]]
+            )
+            self._current_weights[base_urls[selected]] -= total
+            return selected
+
+        in_flight = await self.get_in_flight([base_urls[idx] for idx in candidates])
+
+        if self.policy == "latency":
+            # Backends without a measurement yet score 0 so they get tried
+            def score(idx):
+                url = base_urls[idx]
+                return self._latency.get(url, 0) * (in_flight[url] + 1)
+
+        else:
+
+            def score(idx):
+                weight = get_weight(idx)
+                if weight <= 0:
+                    return float("inf")
+                return in_flight[base_urls[idx]] / weight
+
+        best = min(score(idx) for idx in candidates)
+        return random.choice([idx for idx in candidates if score(idx) == best])
+
+    async def acquire(self, url: str) -> BackendRequest:
+        await self._add_in_flight(url, 1)
+        return BackendRequest(self, url)
+
+    async def release(self, url: str):
+        await self._add_in_flight(url, -1)
+
+    async def get_stats(self, base_urls: list[str]) -> list[dict]:
+        in_flight = await self.get_in_flight(base_urls)
+        now = time.monotonic()
+
+        return [
+            {
+                "url_idx": idx,
+                "url": url,
+                "in_flight": in_flight.get(url, 0),
+                "latency": self._latency.get(url),
+                "requests": self._requests.get(url, 0),
+                "errors": self._errors.get(url, 0),
+                "ejected": self.is_ejected(url),
+                "ejected_for": max(self._ejected_until.get(url, 0) - now, 0),
+            }
+            for idx, url in enumerate(base_urls)
+        ]
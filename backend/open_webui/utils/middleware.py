@@ -32,6 +32,7 @@ from open_webui.models.users import Users
 from open_webui.socket.main import (
     get_event_call,
     get_event_emitter,
+    flush_event_emitter,
 )
 from open_webui.routers.tasks import (
     generate_queries,
@@ -100,7 +101,7 @@ from open_webui.utils.tools import (
 )
 from open_webui.utils.plugin import load_function_module_by_id
 from open_webui.utils.filter import (
-    get_sorted_filter_ids,
+    get_filter_functions,
     process_filter_functions,
 )
 from open_webui.utils.code_interpreter import execute_code_jupyter
@@ -1465,9 +1466,9 @@ async def process_chat_payload(request, form_data, user, metadata, model):
     # Check if the request has chat_id and is inside of a folder
     chat_id = metadata.get("chat_id", None)
     if chat_id and user:
-        chat = Chats.get_chat_by_id_and_user_id(chat_id, user.id)
-        if chat and chat.folder_id:
-            folder = Folders.get_folder_by_id_and_user_id(chat.folder_id, user.id)
+        folder_id = Chats.get_chat_folder_id_by_id_and_user_id(chat_id, user.id)
+        if folder_id:
+            folder = Folders.get_folder_by_id_and_user_id(folder_id, user.id)
 
             if folder and folder.data:
                 if "system_prompt" in folder.data:
@@ -1536,12 +1537,9 @@ async def process_chat_payload(request, form_data, user, metadata, model):
         raise e
 
     try:
-        filter_functions = [
-            Functions.get_function_by_id(filter_id)
-            for filter_id in get_sorted_filter_ids(
-                request, model, metadata.get("filter_ids", [])
-            )
-        ]
+        filter_functions = get_filter_functions(
+            request, model, metadata.get("filter_ids", [])
+        )
 
         form_data, flags = await process_filter_functions(
             request=request,
@@ -2141,6 +2139,10 @@ async def process_chat_response(
         event_emitter = get_event_emitter(metadata)
         event_caller = get_event_call(metadata)
 
+        # Persist events emitted while processing the payload before the
+        # response handlers read or write the message
+        await flush_event_emitter(metadata)
+
     # Non-streaming response
     if not isinstance(response, StreamingResponse):
         if event_emitter:
@@ -2318,12 +2320,9 @@ async def process_chat_response(
         "__request__": request,
         "__model__": model,
     }
-    filter_functions = [
-        Functions.get_function_by_id(filter_id)
-        for filter_id in get_sorted_filter_ids(
-            request, model, metadata.get("filter_ids", [])
-        )
-    ]
+    filter_functions = get_filter_functions(
+        request, model, metadata.get("filter_ids", [])
+    )
 
     # Streaming response
     if event_emitter and event_caller:
@@ -2346,138 +2345,199 @@ async def process_chat_response(
 
         # Handle as a background task
         async def response_handler(response, events):
-            def serialize_content_blocks(content_blocks, raw=False):
-                content = ""
+            def format_reasoning_lines(text):
+                return html.escape(
+                    "\n".join(
+                        (f"> {line}" if not line.startswith(">") else line)
+                        for line in text.splitlines()
+                    )
+                )
 
-                for block in content_blocks:
-                    if block["type"] == "text":
-                        block_content = block["content"].strip()
-                        if block_content:
-                            content = f"{content}{block_content}\n"
-                    elif block["type"] == "tool_calls":
-                        attributes = block.get("attributes", {})
+            # block id -> (block, formatted source text, formatted display text)
+            reasoning_display_cache = {}
+
+            def get_reasoning_display_content(block):
+                """
+                Quote and escape reasoning content for display. Complete lines are
+                kept per block, so a block that is still streaming only formats
+                the lines added since the last call.
+                """
+                text = block["content"]
+
+                source, display = "", ""
+                cached = reasoning_display_cache.get(id(block))
+                if cached and cached[0] is block and text.startswith(cached[1]):
+                    _, source, display = cached
+
+                # Cutting after a "\n" never splits a line break, so the lines
+                # of the prefix are unaffected by anything appended later
+                cut = text.rfind("\n", len(source)) + 1
+                if cut > len(source):
+                    lines = format_reasoning_lines(text[len(source) : cut])
+                    display = f"{display}\n{lines}" if source else lines
+                    source = text[:cut]
+                    reasoning_display_cache[id(block)] = (block, source, display)
+
+                tail = text[len(source) :]
+                if not tail:
+                    return display
+
+                tail = format_reasoning_lines(tail)
+                return f"{display}\n{tail}" if source else tail
+
+            def serialize_content_block(content, block, raw=False):
+                """Append the serialized form of a block to the serialized content before it."""
+                if block["type"] == "text":
+                    block_content = block["content"].strip()
+                    if block_content:
+                        content = f"{content}{block_content}\n"
+                elif block["type"] == "tool_calls":
+                    attributes = block.get("attributes", {})
+
+                    tool_calls = block.get("content", [])
+                    results = block.get("results", [])
+
+                    if content and not content.endswith("\n"):
+                        content += "\n"
+
+                    if results:
+
+                        tool_calls_display_content = ""
+                        for tool_call in tool_calls:
+
+                            tool_call_id = tool_call.get("id", "")
+                            tool_name = tool_call.get("function", {}).get("name", "")
+                            tool_arguments = tool_call.get("function", {}).get(
+                                "arguments", ""
+                            )
 
-                        tool_calls = block.get("content", [])
-                        results = block.get("results", [])
+                            tool_result = None
+                            tool_result_files = None
+                            for result in results:
+                                if tool_call_id == result.get("tool_call_id", ""):
+                                    tool_result = result.get("content", None)
+                                    tool_result_files = result.get("files", None)
+                                    break
+
+                            if tool_result is not None:
+                                tool_result_embeds = result.get("embeds", "")
+                                tool_calls_display_content = f'{tool_calls_display_content}<details type="tool_calls" done="true" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}" result="{html.escape(json.dumps(tool_result, ensure_ascii=False))}" files="{html.escape(json.dumps(tool_result_files)) if tool_result_files else ""}" embeds="{html.escape(json.dumps(tool_result_embeds))}">\n<summary>Tool Executed</summary>\n</details>\n'
+                            else:
+                                tool_calls_display_content = f'{tool_calls_display_content}<details type="tool_calls" done="false" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}">\n<summary>Executing...</summary>\n</details>\n'
 
-                        if content and not content.endswith("\n"):
-                            content += "\n"
+                        if not raw:
+                            content = f"{content}{tool_calls_display_content}"
+                    else:
+                        tool_calls_display_content = ""
 
-                        if results:
+                        for tool_call in tool_calls:
+                            tool_call_id = tool_call.get("id", "")
+                            tool_name = tool_call.get("function", {}).get("name", "")
+                            tool_arguments = tool_call.get("function", {}).get(
+                                "arguments", ""
+                            )
 
-                            tool_calls_display_content = ""
-                            for tool_call in tool_calls:
+                            tool_calls_display_content = f'{tool_calls_display_content}\n<details type="tool_calls" done="false" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}">\n<summary>Executing...</summary>\n</details>\n'
 
-                                tool_call_id = tool_call.get("id", "")
-                                tool_name = tool_call.get("function", {}).get(
-                                    "name", ""
-                                )
-                                tool_arguments = tool_call.get("function", {}).get(
-                                    "arguments", ""
-                                )
+                        if not raw:
+                            content = f"{content}{tool_calls_display_content}"
 
-                                tool_result = None
-                                tool_result_files = None
-                                for result in results:
-                                    if tool_call_id == result.get("tool_call_id", ""):
-                                        tool_result = result.get("content", None)
-                                        tool_result_files = result.get("files", None)
-                                        break
-
-                                if tool_result is not None:
-                                    tool_result_embeds = result.get("embeds", "")
-                                    tool_calls_display_content = f'{tool_calls_display_content}<details type="tool_calls" done="true" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}" result="{html.escape(json.dumps(tool_result, ensure_ascii=False))}" files="{html.escape(json.dumps(tool_result_files)) if tool_result_files else ""}" embeds="{html.escape(json.dumps(tool_result_embeds))}">\n<summary>Tool Executed</summary>\n</details>\n'
-                                else:
-                                    tool_calls_display_content = f'{tool_calls_display_content}<details type="tool_calls" done="false" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}">\n<summary>Executing...</summary>\n</details>\n'
+                elif block["type"] == "reasoning":
+                    reasoning_display_content = get_reasoning_display_content(block)
 
-                            if not raw:
-                                content = f"{content}{tool_calls_display_content}"
-                        else:
-                            tool_calls_display_content = ""
+                    reasoning_duration = block.get("duration", None)
 
-                            for tool_call in tool_calls:
-                                tool_call_id = tool_call.get("id", "")
-                                tool_name = tool_call.get("function", {}).get(
-                                    "name", ""
-                                )
-                                tool_arguments = tool_call.get("function", {}).get(
-                                    "arguments", ""
-                                )
-
-                                tool_calls_display_content = f'{tool_calls_display_content}\n<details type="tool_calls" done="false" id="{tool_call_id}" name="{tool_name}" arguments="{html.escape(json.dumps(tool_arguments))}">\n<summary>Executing...</summary>\n</details>\n'
+                    start_tag = block.get("start_tag", "")
+                    end_tag = block.get("end_tag", "")
 
-                            if not raw:
-                                content = f"{content}{tool_calls_display_content}"
+                    if content and not content.endswith("\n"):
+                        content += "\n"
 
-                    elif block["type"] == "reasoning":
-                        reasoning_display_content = html.escape(
-                            "\n".join(
-                                (f"> {line}" if not line.startswith(">") else line)
-                                for line in block["content"].splitlines()
+                    if reasoning_duration is not None:
+                        if raw:
+                            content = (
+                                f'{content}{start_tag}{block["content"]}{end_tag}\n'
                             )
-                        )
+                        else:
+                            content = f'{content}<details type="reasoning" done="true" duration="{reasoning_duration}">\n<summary>Thought for {reasoning_duration} seconds</summary>\n{reasoning_display_content}\n</details>\n'
+                    else:
+                        if raw:
+                            content = (
+                                f'{content}{start_tag}{block["content"]}{end_tag}\n'
+                            )
+                        else:
+                            content = f'{content}<details type="reasoning" done="false">\n<summary>Thinking…</summary>\n{reasoning_display_content}\n</details>\n'
+
+                elif block["type"] == "code_interpreter":
+                    attributes = block.get("attributes", {})
+                    output = block.get("output", None)
+                    lang = attributes.get("lang", "")
 
-                        reasoning_duration = block.get("duration", None)
+                    content_stripped, original_whitespace = (
+                        split_content_and_whitespace(content)
+                    )
+                    if is_opening_code_block(content_stripped):
+                        # Remove trailing backticks that would open a new block
+                        content = (
+                            content_stripped.rstrip("`").rstrip() + original_whitespace
+                        )
+                    else:
+                        # Keep content as is - either closing backticks or no backticks
+                        content = content_stripped + original_whitespace
 
-                        start_tag = block.get("start_tag", "")
-                        end_tag = block.get("end_tag", "")
+                    if content and not content.endswith("\n"):
+                        content += "\n"
 
-                        if content and not content.endswith("\n"):
-                            content += "\n"
+                    if output:
+                        output = html.escape(json.dumps(output))
 
-                        if reasoning_duration is not None:
-                            if raw:
-                                content = (
-                                    f'{content}{start_tag}{block["content"]}{end_tag}\n'
-                                )
-                            else:
-                                content = f'{content}<details type="reasoning" done="true" duration="{reasoning_duration}">\n<summary>Thought for {reasoning_duration} seconds</summary>\n{reasoning_display_content}\n</details>\n'
+                        if raw:
+                            content = f'{content}<code_interpreter type="code" lang="{lang}">\n{block["content"]}\n</code_interpreter>\n```output\n{output}\n```\n'
                         else:
-                            if raw:
-                                content = (
-                                    f'{content}{start_tag}{block["content"]}{end_tag}\n'
-                                )
-                            else:
-                                content = f'{content}<details type="reasoning" done="false">\n<summary>Thinking…</summary>\n{reasoning_display_content}\n</details>\n'
+                            content = f'{content}<details type="code_interpreter" done="true" output="{output}">\n<summary>Analyzed</summary>\n```{lang}\n{block["content"]}\n```\n</details>\n'
+                    else:
+                        if raw:
+                            content = f'{content}<code_interpreter type="code" lang="{lang}">\n{block["content"]}\n</code_interpreter>\n'
+                        else:
+                            content = f'{content}<details type="code_interpreter" done="false">\n<summary>Analyzing...</summary>\n```{lang}\n{block["content"]}\n```\n</details>\n'
 
-                    elif block["type"] == "code_interpreter":
-                        attributes = block.get("attributes", {})
-                        output = block.get("output", None)
-                        lang = attributes.get("lang", "")
+                else:
+                    block_content = str(block["content"]).strip()
+                    if block_content:
+                        content = f"{content}{block['type']}: {block_content}\n"
 
-                        content_stripped, original_whitespace = (
-                            split_content_and_whitespace(content)
-                        )
-                        if is_opening_code_block(content_stripped):
-                            # Remove trailing backticks that would open a new block
-                            content = (
-                                content_stripped.rstrip("`").rstrip()
-                                + original_whitespace
-                            )
-                        else:
-                            # Keep content as is - either closing backticks or no backticks
-                            content = content_stripped + original_whitespace
+                return content
 
-                        if content and not content.endswith("\n"):
-                            content += "\n"
+            def serialize_content_blocks(content_blocks, raw=False):
+                content = ""
 
-                        if output:
-                            output = html.escape(json.dumps(output))
+                for block in content_blocks:
+                    content = serialize_content_block(content, block, raw)
 
-                            if raw:
-                                content = f'{content}<code_interpreter type="code" lang="{lang}">\n{block["content"]}\n</code_interpreter>\n```output\n{output}\n```\n'
-                            else:
-                                content = f'{content}<details type="code_interpreter" done="true" output="{output}">\n<summary>Analyzed</summary>\n```{lang}\n{block["content"]}\n```\n</details>\n'
-                        else:
-                            if raw:
-                                content = f'{content}<code_interpreter type="code" lang="{lang}">\n{block["content"]}\n</code_interpreter>\n'
-                            else:
-                                content = f'{content}<details type="code_interpreter" done="false">\n<summary>Analyzing...</summary>\n```{lang}\n{block["content"]}\n```\n</details>\n'
+                return content.strip()
 
-                    else:
-                        block_content = str(block["content"]).strip()
-                        if block_content:
-                            content = f"{content}{block['type']}: {block_content}\n"
+            # Serialized content of the blocks before the last one, which stop
+            # changing once a new block is opened while streaming
+            serialized_blocks_cache = {"blocks": [], "content": ""}
+
+            def serialize_streaming_content_blocks(content_blocks, pending_blocks=[]):
+                cached_blocks = serialized_blocks_cache["blocks"]
+                content = serialized_blocks_cache["content"]
+
+                if len(cached_blocks) >= len(content_blocks) or any(
+                    cached is not block
+                    for cached, block in zip(cached_blocks, content_blocks)
+                ):
+                    cached_blocks, content = [], ""
+
+                for block in content_blocks[len(cached_blocks) : -1]:
+                    content = serialize_content_block(content, block)
+
+                serialized_blocks_cache["blocks"] = content_blocks[:-1]
+                serialized_blocks_cache["content"] = content
+
+                for block in content_blocks[-1:] + pending_blocks:
+                    content = serialize_content_block(content, block)
 
                 return content.strip()
 
@@ -2521,6 +2581,19 @@ async def process_chat_response(
 
                 return messages
 
+            # content type -> (block, offset): text before the offset has already
+            # been searched for tags, so each delta is only scanned once
+            tag_scan_offsets = {}
+
+            def get_tag_scan_offset(content_type, block):
+                scanned_block, offset = tag_scan_offsets.get(content_type, (None, 0))
+                if scanned_block is not block or offset > len(block["content"]):
+                    return 0
+                return offset
+
+            def set_tag_scan_offset(content_type, block, offset):
+                tag_scan_offsets[content_type] = (block, max(offset, 0))
+
             def tag_content_handler(content_type, tags, content, content_blocks):
                 end_flag = False
 
@@ -2536,9 +2609,16 @@ async def process_chat_response(
                     return attributes
 
                 if content_blocks[-1]["type"] == "text":
+                    block = content_blocks[-1]
+                    text = block["content"]
+                    scan_offset = get_tag_scan_offset(content_type, block)
+                    next_scan_offset = len(text)
+
                     for start_tag, end_tag in tags:
 
                         start_tag_pattern = rf"{re.escape(start_tag)}"
+                        # A tag split across deltas may start in already scanned text
+                        partial_start_tag_pattern = None
                         if start_tag.startswith("<") and start_tag.endswith(">"):
                             # Match start tag e.g., <tag> or <tag attr="value">
                             # remove both '<' and '>' from start_tag
@@ -2546,61 +2626,73 @@ async def process_chat_response(
                             start_tag_pattern = (
                                 rf"<{re.escape(start_tag[1:-1])}(\s.*?)?>"
                             )
+                            partial_start_tag_pattern = (
+                                rf"<{re.escape(start_tag[1:-1])}\s[^\n>]*\Z"
+                            )
 
-                        match = re.search(start_tag_pattern, content)
-                        if match:
-                            try:
-                                attr_content = (
-                                    match.group(1) if match.group(1) else ""
-                                )  # Ensure it's not None
-                            except:
-                                attr_content = ""
-
-                            attributes = extract_attributes(
-                                attr_content
-                            )  # Extract attributes safely
-
-                            # Capture everything before and after the matched tag
-                            before_tag = content[
-                                : match.start()
-                            ]  # Content before opening tag
-                            after_tag = content[
-                                match.end() :
-                            ]  # Content after opening tag
-
-                            # Remove the start tag and after from the currently handling text block
-                            content_blocks[-1]["content"] = content_blocks[-1][
-                                "content"
-                            ].replace(match.group(0) + after_tag, "")
+                        match = re.compile(start_tag_pattern).search(text, scan_offset)
+                        if not match:
+                            next_scan_offset = min(
+                                next_scan_offset, len(text) - len(start_tag) + 1
+                            )
+                            if partial_start_tag_pattern:
+                                partial_match = re.compile(
+                                    partial_start_tag_pattern
+                                ).search(text, scan_offset)
+                                if partial_match:
+                                    next_scan_offset = min(
+                                        next_scan_offset, partial_match.start()
+                                    )
+                            continue
 
-                            if before_tag:
-                                content_blocks[-1]["content"] = before_tag
+                        try:
+                            attr_content = (
+                                match.group(1) if match.group(1) else ""
+                            )  # Ensure it's not None
+                        except:
+                            attr_content = ""
+
+                        attributes = extract_attributes(
+                            attr_content
+                        )  # Extract attributes safely
+
+                        # Capture everything before and after the matched tag
+                        before_tag = text[: match.start()]  # Content before opening tag
+                        after_tag = text[match.end() :]  # Content after opening tag
+
+                        # Remove the start tag and after from the currently handling text block
+                        block["content"] = before_tag
+                        if not before_tag:
+                            content_blocks.pop()
 
-                            if not content_blocks[-1]["content"]:
-                                content_blocks.pop()
+                        # Append the new block
+                        content_blocks.append(
+                            {
+                                "type": content_type,
+                                "start_tag": start_tag,
+                                "end_tag": end_tag,
+                                "attributes": attributes,
+                                "content": "",
+                                "started_at": time.time(),
+                            }
+                        )
 
-                            # Append the new block
-                            content_blocks.append(
-                                {
-                                    "type": content_type,
-                                    "start_tag": start_tag,
-                                    "end_tag": end_tag,
-                                    "attributes": attributes,
-                                    "content": "",
-                                    "started_at": time.time(),
-                                }
+                        if after_tag:
+                            content_blocks[-1]["content"] = after_tag
+                            _, _, end_flag = tag_content_handler(
+                                content_type, tags, after_tag, content_blocks
                             )
 
-                            if after_tag:
-                                content_blocks[-1]["content"] = after_tag
-                                tag_content_handler(
-                                    content_type, tags, after_tag, content_blocks
-                                )
-
-                            break
+                        break
+                    else:
+                        set_tag_scan_offset(
+                            content_type, block, max(scan_offset, next_scan_offset)
+                        )
                 elif content_blocks[-1]["type"] == content_type:
-                    start_tag = content_blocks[-1]["start_tag"]
-                    end_tag = content_blocks[-1]["end_tag"]
+                    block = content_blocks[-1]
+                    start_tag = block["start_tag"]
+                    end_tag = block["end_tag"]
+                    scan_offset = get_tag_scan_offset(content_type, block)
 
                     if end_tag.startswith("<") and end_tag.endswith(">"):
                         # Match end tag e.g., </tag>
@@ -2610,7 +2702,13 @@ async def process_chat_response(
                         end_tag_pattern = rf"{re.escape(end_tag)}"
 
                     # Check if the content has the end tag
-                    if re.search(end_tag_pattern, content):
+                    if block["content"].find(end_tag, scan_offset) == -1:
+                        set_tag_scan_offset(
+                            content_type,
+                            block,
+                            max(scan_offset, len(block["content"]) - len(end_tag) + 1),
+                        )
+                    else:
                         end_flag = True
 
                         block_content = content_blocks[-1]["content"]
@@ -2765,6 +2863,9 @@ async def process_chat_response(
                     nonlocal content
                     nonlocal content_blocks
 
+                    # Blocks may have been updated in place since the last stream
+                    serialized_blocks_cache.update({"blocks": [], "content": ""})
+
                     response_tool_calls = []
 
                     delta_count = 0
@@ -2971,7 +3072,7 @@ async def process_chat_response(
                                             # Flush any pending text first
                                             await flush_pending_delta_data()
 
-                                            pending_content_blocks = content_blocks + [
+                                            pending_content_blocks = [
                                                 {
                                                     "type": "tool_calls",
                                                     "content": response_tool_calls,
@@ -2982,8 +3083,9 @@ async def process_chat_response(
                                                 {
                                                     "type": "chat:completion",
                                                     "data": {
-                                                        "content": serialize_content_blocks(
-                                                            pending_content_blocks
+                                                        "content": serialize_streaming_content_blocks(
+                                                            content_blocks,
+                                                            pending_content_blocks,
                                                         ),
                                                     },
                                                 }
@@ -3038,7 +3140,7 @@ async def process_chat_response(
                                         reasoning_block["content"] += reasoning_content
 
                                         data = {
-                                            "content": serialize_content_blocks(
+                                            "content": serialize_streaming_content_blocks(
                                                 content_blocks
                                             )
                                         }
@@ -3133,14 +3235,14 @@ async def process_chat_response(
                                                 metadata["chat_id"],
                                                 metadata["message_id"],
                                                 {
-                                                    "content": serialize_content_blocks(
+                                                    "content": serialize_streaming_content_blocks(
                                                         content_blocks
                                                     ),
                                                 },
                                             )
                                         else:
                                             data = {
-                                                "content": serialize_content_blocks(
+                                                "content": serialize_streaming_content_blocks(
                                                     content_blocks
                                                 ),
                                             }
@@ -3616,6 +3718,8 @@ async def process_chat_response(
                             log.debug(e)
                             break
 
+                await flush_event_emitter(metadata)
+
                 title = Chats.get_chat_title_by_id(metadata["chat_id"])
                 data = {
                     "done": True,
@@ -3660,6 +3764,7 @@ async def process_chat_response(
             except asyncio.CancelledError:
                 log.warning("Task was cancelled!")
                 await event_emitter({"type": "chat:tasks:cancel"})
+                await flush_event_emitter(metadata)
 
                 if not ENABLE_REALTIME_CHAT_SAVE:
                     # Save message in the database
@@ -2,6 +2,7 @@ import time
 import logging
 import asyncio
 import sys
+import threading
 
 from aiocache import cached
 from fastapi import Request
@@ -20,7 +21,11 @@ from open_webui.utils.plugin import (
     load_function_module_by_id,
     get_function_module_from_cache,
 )
-from open_webui.utils.access_control import has_access
+from open_webui.utils.access_control import (
+    has_access,
+    get_permitted_group_and_user_ids,
+)
+from open_webui.utils.access_version import get_access_version
 
 
 from open_webui.config import (
@@ -28,7 +33,12 @@ from open_webui.config import (
     DEFAULT_ARENA_MODEL,
 )
 
-from open_webui.env import BYPASS_MODEL_ACCESS_CONTROL, GLOBAL_LOG_LEVEL
+from open_webui.env import (
+    BYPASS_MODEL_ACCESS_CONTROL,
+    GLOBAL_LOG_LEVEL,
+    REDIS_URL,
+    UVICORN_WORKERS,
+)
 from open_webui.models.users import UserModel
 
 
@@ -361,22 +371,101 @@ def check_model_access(user, model, db=None):
             raise Exception("Model not found")
 
 
+class ModelAccessIndex:
+    """
+    Precomputed read access for workspace models. Model ids are indexed by
+    owner, permitted user and permitted group, so resolving what a user can
+    see is a few set unions. The index and the per-user results are rebuilt
+    only when the access version changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._public_ids = set()
+        self._ids_by_user = {}
+        self._ids_by_group = {}
+        self._user_group_ids = {}
+        self._allowed_ids = {}
+
+    def _refresh(self, db=None):
+        version = get_access_version()
+        if version is not None and not REDIS_URL and UVICORN_WORKERS > 1:
+            # Changes on other workers don't reach the version counter, check
+            # the tables it covers instead
+            version = (
+                version,
+                Models.get_models_version(db=db),
+                Groups.get_groups_version(db=db),
+            )
+        if version is not None and version == self._version:
+            return
+
+        public_ids = set()
+        ids_by_user = {}
+        ids_by_group = {}
+
+        for model in Models.get_all_models(db=db):
+            ids_by_user.setdefault(model.user_id, set()).add(model.id)
+
+            if model.access_control is None:
+                public_ids.add(model.id)
+                continue
+
+            permitted_ids = get_permitted_group_and_user_ids(
+                "read", model.access_control
+            )
+            for user_id in permitted_ids.get("user_ids", []):
+                ids_by_user.setdefault(user_id, set()).add(model.id)
+            for group_id in permitted_ids.get("group_ids", []):
+                ids_by_group.setdefault(group_id, set()).add(model.id)
+
+        self._public_ids = public_ids
+        self._ids_by_user = ids_by_user
+        self._ids_by_group = ids_by_group
+        self._user_group_ids = {}
+        self._allowed_ids = {}
+        self._version = version
+
+    def get_user_group_ids(self, user_id: str, db=None) -> frozenset[str]:
+        with self._lock:
+            self._refresh(db=db)
+
+            user_group_ids = self._user_group_ids.get(user_id)
+            if user_group_ids is None:
+                user_group_ids = frozenset(
+                    group.id for group in Groups.get_groups_by_member_id(user_id, db=db)
+                )
+                self._user_group_ids[user_id] = user_group_ids
+            return user_group_ids
+
+    def get_allowed_model_ids(self, user_id: str, db=None) -> set[str]:
+        user_group_ids = self.get_user_group_ids(user_id, db=db)
+
+        with self._lock:
+            key = (user_id, user_group_ids)
+            allowed_ids = self._allowed_ids.get(key)
+            if allowed_ids is None:
+                allowed_ids = self._public_ids | self._ids_by_user.get(user_id, set())
+                for group_id in user_group_ids:
+                    allowed_ids = allowed_ids | self._ids_by_group.get(group_id, set())
+                self._allowed_ids[key] = allowed_ids
+            return allowed_ids
+
+
+MODEL_ACCESS_INDEX = ModelAccessIndex()
+
+
 def get_filtered_models(models, user, db=None):
     # Filter out models that the user does not have access to
     if (
         user.role == "user"
         or (user.role == "admin" and not BYPASS_ADMIN_ACCESS_CONTROL)
     ) and not BYPASS_MODEL_ACCESS_CONTROL:
-        model_ids = [model["id"] for model in models if not model.get("arena")]
-        model_infos = {
-            model_info.id: model_info
-            for model_info in Models.get_models_by_ids(model_ids)
-        }
+        user_group_ids = MODEL_ACCESS_INDEX.get_user_group_ids(user.id, db=db)
+        allowed_model_ids = MODEL_ACCESS_INDEX.get_allowed_model_ids(user.id, db=db)
 
         filtered_models = []
-        user_group_ids = {
-            group.id for group in Groups.get_groups_by_member_id(user.id, db=db)
-        }
         for model in models:
             if model.get("arena"):
                 if has_access(
@@ -388,21 +477,8 @@ def get_filtered_models(models, user, db=None):
                     user_group_ids=user_group_ids,
                 ):
                     filtered_models.append(model)
-                continue
-
-            model_info = model_infos.get(model["id"], None)
-            if model_info:
-                if (
-                    (user.role == "admin" and BYPASS_ADMIN_ACCESS_CONTROL)
-                    or user.id == model_info.user_id
-                    or has_access(
-                        user.id,
-                        type="read",
-                        access_control=model_info.access_control,
-                        user_group_ids=user_group_ids,
-                    )
-                ):
-                    filtered_models.append(model)
+            elif model["id"] in allowed_model_ids:
+                filtered_models.append(model)
 
         return filtered_models
     else:
@@ -2,12 +2,21 @@ import os
 import re
 import subprocess
 import sys
+import hashlib
+import json
+import uuid
 from importlib import util
 import types
 import tempfile
 import logging
 
-from open_webui.env import PIP_OPTIONS, PIP_PACKAGE_INDEX_OPTIONS, OFFLINE_MODE
+from open_webui.env import (
+    PIP_OPTIONS,
+    PIP_PACKAGE_INDEX_OPTIONS,
+    OFFLINE_MODE,
+    REDIS_KEY_PREFIX,
+    UVICORN_WORKERS,
+)
 from open_webui.models.functions import Functions
 from open_webui.models.tools import Tools
 
@@ -165,9 +174,135 @@ def load_function_module_by_id(function_id: str, content: str | None = None):
         os.unlink(temp_file.name)
 
 
+PLUGIN_UPDATES_CHANNEL = f"{REDIS_KEY_PREFIX}:plugins:updates"
+
+# Identifies this worker so it can ignore its own invalidation messages
+PLUGIN_CACHE_INSTANCE_ID = str(uuid.uuid4())
+
+
+def get_plugin_cache_key(updated_at: int, content: str) -> tuple[int, str]:
+    return updated_at, hashlib.sha256(content.encode()).hexdigest()
+
+
+def is_plugin_cache_authoritative(request) -> bool:
+    # Saves invalidate the local cache directly and reach other workers through
+    # Redis, so cached modules stay valid until they are invalidated
+    return getattr(request.app.state, "redis", None) is not None or UVICORN_WORKERS == 1
+
+
+def clear_plugin_module_cache(
+    app, plugin_type: str, plugin_id: str | None = None, include_modules: bool = True
+):
+    if plugin_type == "tool":
+        # Resolved tools also depend on their valves and access control
+        resolved_tools = getattr(app.state, "RESOLVED_TOOLS", None)
+        if resolved_tools is not None:
+            if plugin_id is None:
+                resolved_tools.clear()
+            else:
+                resolved_tools.pop(plugin_id, None)
+    else:
+        # Filter chains also depend on whether functions are active, global or
+        # toggleable, and on their valves
+        filter_chains = getattr(app.state, "FILTER_CHAINS", None)
+        if filter_chains is not None:
+            filter_chains.clear()
+
+    if not include_modules:
+        return
+
+    modules, cache_keys = (
+        (app.state.TOOLS, app.state.TOOL_CACHE_KEYS)
+        if plugin_type == "tool"
+        else (app.state.FUNCTIONS, app.state.FUNCTION_CACHE_KEYS)
+    )
+
+    if plugin_id is None:
+        modules.clear()
+        cache_keys.clear()
+    else:
+        modules.pop(plugin_id, None)
+        cache_keys.pop(plugin_id, None)
+
+
+def set_plugin_module_cache(
+    app, plugin_type: str, plugin_id: str, module, updated_at: int, content: str
+):
+    modules, cache_keys = (
+        (app.state.TOOLS, app.state.TOOL_CACHE_KEYS)
+        if plugin_type == "tool"
+        else (app.state.FUNCTIONS, app.state.FUNCTION_CACHE_KEYS)
+    )
+
+    modules[plugin_id] = module
+    cache_keys[plugin_id] = get_plugin_cache_key(updated_at, content)
+
+
+async def invalidate_plugin_module_cache(
+    request,
+    plugin_type: str,
+    plugin_id: str | None = None,
+    include_modules: bool = True,
+):
+    """
+    Drop a saved tool or function from the module cache on every worker. With
+    include_modules=False, only caches derived from its settings are dropped.
+    """
+    clear_plugin_module_cache(request.app, plugin_type, plugin_id, include_modules)
+
+    redis = getattr(request.app.state, "redis", None)
+    if redis is not None:
+        try:
+            await redis.publish(
+                PLUGIN_UPDATES_CHANNEL,
+                json.dumps(
+                    {
+                        "instance_id": PLUGIN_CACHE_INSTANCE_ID,
+                        "type": plugin_type,
+                        "id": plugin_id,
+                        "include_modules": include_modules,
+                    }
+                ),
+            )
+        except Exception as e:
+            log.warning(f"Failed to publish {plugin_type} cache invalidation: {e}")
+
+
+async def redis_plugin_update_listener(app):
+    pubsub = app.state.redis.pubsub()
+    await pubsub.subscribe(PLUGIN_UPDATES_CHANNEL)
+
+    async for message in pubsub.listen():
+        if message["type"] != "message":
+            continue
+        try:
+            update = json.loads(message["data"])
+            if update.get("instance_id") != PLUGIN_CACHE_INSTANCE_ID:
+                clear_plugin_module_cache(
+                    app,
+                    update["type"],
+                    update.get("id"),
+                    update.get("include_modules", True),
+                )
+        except Exception as e:
+            log.exception(f"Error handling plugin cache invalidation: {e}")
+
+
 def get_tool_module_from_cache(request, tool_id, load_from_db=True):
+    TOOLS = request.app.state.TOOLS
+    TOOL_CACHE_KEYS = request.app.state.TOOL_CACHE_KEYS
+
     if load_from_db:
-        # Always load from the database by default
+        cache_key = TOOL_CACHE_KEYS.get(tool_id)
+        if tool_id in TOOLS and cache_key:
+            if is_plugin_cache_authoritative(request):
+                return TOOLS[tool_id], None
+
+            # Without invalidation messages, a cheap updated_at check avoids
+            # fetching and comparing the full source
+            if Tools.get_tool_updated_at_by_id(tool_id) == cache_key[0]:
+                return TOOLS[tool_id], None
+
         tool = Tools.get_tool_by_id(tool_id)
         if not tool:
             raise Exception(f"Tool not found: {tool_id}")
@@ -177,42 +312,45 @@ def get_tool_module_from_cache(request, tool_id, load_from_db=True):
         if new_content != content:
             content = new_content
             # Update the tool content in the database
-            Tools.update_tool_by_id(tool_id, {"content": content})
+            tool = Tools.update_tool_by_id(tool_id, {"content": content}) or tool
 
-        if (
-            hasattr(request.app.state, "TOOL_CONTENTS")
-            and tool_id in request.app.state.TOOL_CONTENTS
-        ) and (
-            hasattr(request.app.state, "TOOLS") and tool_id in request.app.state.TOOLS
-        ):
-            if request.app.state.TOOL_CONTENTS[tool_id] == content:
-                return request.app.state.TOOLS[tool_id], None
+        new_cache_key = get_plugin_cache_key(tool.updated_at, content)
+        if tool_id in TOOLS and cache_key and cache_key[1] == new_cache_key[1]:
+            # Only metadata changed, keep the compiled module
+            TOOL_CACHE_KEYS[tool_id] = new_cache_key
+            return TOOLS[tool_id], None
 
         tool_module, frontmatter = load_tool_module_by_id(tool_id, content)
     else:
-        if hasattr(request.app.state, "TOOLS") and tool_id in request.app.state.TOOLS:
-            return request.app.state.TOOLS[tool_id], None
+        if tool_id in TOOLS:
+            return TOOLS[tool_id], None
 
         tool_module, frontmatter = load_tool_module_by_id(tool_id)
+        new_cache_key = None
 
-    if not hasattr(request.app.state, "TOOLS"):
-        request.app.state.TOOLS = {}
-
-    if not hasattr(request.app.state, "TOOL_CONTENTS"):
-        request.app.state.TOOL_CONTENTS = {}
-
-    request.app.state.TOOLS[tool_id] = tool_module
-    request.app.state.TOOL_CONTENTS[tool_id] = content
+    TOOLS[tool_id] = tool_module
+    TOOL_CACHE_KEYS[tool_id] = new_cache_key
 
     return tool_module, frontmatter
 
 
 def get_function_module_from_cache(request, function_id, load_from_db=True):
+    FUNCTIONS = request.app.state.FUNCTIONS
+    FUNCTION_CACHE_KEYS = request.app.state.FUNCTION_CACHE_KEYS
+
     if load_from_db:
-        # Always load from the database by default
+        # Load the latest content by default
         # This is useful for hooks like "inlet" or "outlet" where the content might change
         # and we want to ensure the latest content is used.
 
+        cache_key = FUNCTION_CACHE_KEYS.get(function_id)
+        if function_id in FUNCTIONS and cache_key:
+            if is_plugin_cache_authoritative(request):
+                return FUNCTIONS[function_id], None, None
+
+            if Functions.get_function_updated_at_by_id(function_id) == cache_key[0]:
+                return FUNCTIONS[function_id], None, None
+
         function = Functions.get_function_by_id(function_id)
         if not function:
             raise Exception(f"Function not found: {function_id}")
@@ -222,17 +360,16 @@ def get_function_module_from_cache(request, function_id, load_from_db=True):
         if new_content != content:
             content = new_content
             # Update the function content in the database
-            Functions.update_function_by_id(function_id, {"content": content})
-
-        if (
-            hasattr(request.app.state, "FUNCTION_CONTENTS")
-            and function_id in request.app.state.FUNCTION_CONTENTS
-        ) and (
-            hasattr(request.app.state, "FUNCTIONS")
-            and function_id in request.app.state.FUNCTIONS
-        ):
-            if request.app.state.FUNCTION_CONTENTS[function_id] == content:
-                return request.app.state.FUNCTIONS[function_id], None, None
+            function = (
+                Functions.update_function_by_id(function_id, {"content": content})
+                or function
+            )
+
+        new_cache_key = get_plugin_cache_key(function.updated_at, content)
+        if function_id in FUNCTIONS and cache_key and cache_key[1] == new_cache_key[1]:
+            # Only metadata changed, keep the compiled module
+            FUNCTION_CACHE_KEYS[function_id] = new_cache_key
+            return FUNCTIONS[function_id], None, None
 
         function_module, function_type, frontmatter = load_function_module_by_id(
             function_id, content
@@ -241,24 +378,16 @@ def get_function_module_from_cache(request, function_id, load_from_db=True):
         # Load from cache (e.g. "stream" hook)
         # This is useful for performance reasons
 
-        if (
-            hasattr(request.app.state, "FUNCTIONS")
-            and function_id in request.app.state.FUNCTIONS
-        ):
-            return request.app.state.FUNCTIONS[function_id], None, None
+        if function_id in FUNCTIONS:
+            return FUNCTIONS[function_id], None, None
 
         function_module, function_type, frontmatter = load_function_module_by_id(
             function_id
         )
+        new_cache_key = None
 
-    if not hasattr(request.app.state, "FUNCTIONS"):
-        request.app.state.FUNCTIONS = {}
-
-    if not hasattr(request.app.state, "FUNCTION_CONTENTS"):
-        request.app.state.FUNCTION_CONTENTS = {}
-
-    request.app.state.FUNCTIONS[function_id] = function_module
-    request.app.state.FUNCTION_CONTENTS[function_id] = content
+    FUNCTIONS[function_id] = function_module
+    FUNCTION_CACHE_KEYS[function_id] = new_cache_key
 
     return function_module, function_type, frontmatter
 
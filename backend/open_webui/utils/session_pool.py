@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from open_webui.env import (
+    ENABLE_AIOHTTP_CLIENT_SESSION_POOL,
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT,
+    AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL,
+)
+
+log = logging.getLogger(__name__)
+
+
+class ClientSessionPool:
+    """
+    Long-lived aiohttp sessions, one per upstream base URL, so requests to model
+    backends reuse kept-alive connections instead of opening a new connection
+    for every call.
+
+    Sessions are shared between users, so they never store cookies; requests
+    pass their own cookies and timeouts.
+    """
+
+    def __init__(
+        self,
+        limit_per_host: int = 100,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: int = 300,
+    ):
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self._sessions = {}
+
+    @staticmethod
+    def _get_key(url: str) -> str:
+        parsed_url = urlparse(url)
+        return f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+    def get(self, url: str) -> aiohttp.ClientSession:
+        key = self._get_key(url)
+        loop = asyncio.get_running_loop()
+
+        session_loop, session = self._sessions.get(key, (None, None))
+        if session is None or session.closed or session_loop is not loop:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=0,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=self.dns_cache_ttl,
+                ),
+                cookie_jar=aiohttp.DummyCookieJar(),
+                trust_env=True,
+            )
+            self._sessions[key] = (loop, session)
+            log.debug(f"Created pooled client session for {key}")
+
+        return session
+
+    def owns(self, session: Optional[aiohttp.ClientSession]) -> bool:
+        return any(session is pooled for _, pooled in self._sessions.values())
+
+    async def close(self):
+        sessions = list(self._sessions.values())
+        self._sessions = {}
+
+        for _, session in sessions:
+            try:
+                await session.close()
+            except Exception as e:
+                log.warning(f"Error closing client session: {e}")
+
+
+CLIENT_SESSION_POOL = ClientSessionPool(
+    limit_per_host=AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+    keepalive_timeout=AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT,
+    dns_cache_ttl=AIOHTTP_CLIENT_POOL_DNS_CACHE_TTL,
+)
+
+
+def get_client_session(url: str) -> aiohttp.ClientSession:
+    """
+    Session for requests to url. Pass the result to release_client_session
+    when done; it is only closed if it is not a pooled session.
+    """
+    if ENABLE_AIOHTTP_CLIENT_SESSION_POOL:
+        return CLIENT_SESSION_POOL.get(url)
+    return aiohttp.ClientSession(trust_env=True)
+
+
+async def release_client_session(
+    response: Optional[aiohttp.ClientResponse],
+    session: Optional[aiohttp.ClientSession],
+):
+    pooled = CLIENT_SESSION_POOL.owns(session)
+
+    if response:
+        if pooled:
+            # Returns the connection to the pool if the body was fully read
+            response.release()
+        else:
+            response.close()
+    if session and not pooled:
+        await session.close()
+
+
+@asynccontextmanager
+async def client_session(url: str):
+    session = get_client_session(url)
+    try:
+        yield session
+    finally:
+        await release_client_session(None, session)
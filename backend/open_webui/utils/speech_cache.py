@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from open_webui.config import (
+    AUDIO_TTS_CACHE_EVICTION,
+    AUDIO_TTS_CACHE_MAX_BYTES,
+    AUDIO_TTS_CACHE_SHARED,
+    CACHE_DIR,
+)
+from open_webui.storage.provider import LocalStorageProvider, Storage
+
+log = logging.getLogger(__name__)
+
+SPEECH_CACHE_DIR = CACHE_DIR / "audio" / "speech"
+SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+
+class SpeechCache:
+    """
+    Generated speech on disk, one "{name}.mp3" with its "{name}.json" request
+    body per entry. An in-memory index of entry sizes, use order and hit counts
+    keeps the directory within max_bytes by evicting the least recently ("lru")
+    or least frequently ("lfu") used entries.
+
+    Concurrent requests for the same entry in this worker share one synthesis.
+    With shared enabled, entries are uploaded to the storage provider and
+    downloaded from it on a local miss. Evicting only removes local copies.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = 0,
+        eviction: str = "lru",
+        shared: bool = False,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.eviction = eviction
+        self.shared = shared
+
+        # name -> [size, hits], least recently used first
+        self._entries: Optional[OrderedDict] = None
+        self._size = 0
+        self._lock = threading.Lock()
+        self._pending: dict[str, asyncio.Future] = {}
+
+    def get_paths(self, name: str) -> tuple[Path, Path]:
+        return (
+            self.directory.joinpath(f"{name}.mp3"),
+            self.directory.joinpath(f"{name}.json"),
+        )
+
+    def _get_entry_size(self, name: str) -> int:
+        return sum(
+            path.stat().st_size for path in self.get_paths(name) if path.is_file()
+        )
+
+    def _load(self):
+        """Index the entries already on disk, oldest first."""
+        if self._entries is not None:
+            return
+
+        self._entries = OrderedDict()
+        files = sorted(
+            self.directory.glob("*.mp3"), key=lambda path: path.stat().st_mtime
+        )
+        for path in files:
+            size = self._get_entry_size(path.stem)
+            self._entries[path.stem] = [size, 0]
+            self._size += size
+
+    def _remove(self, name: str):
+        size, _ = self._entries.pop(name)
+        self._size -= size
+        for path in self.get_paths(name):
+            try:
+                path.unlink(missing_ok=True)
+            except Exception as e:
+                log.warning(f"Error removing cached speech {path}: {e}")
+
+    def _evict(self, keep: str):
+        """Evict entries until within max_bytes, other than keep."""
+        while self.max_bytes > 0 and self._size > self.max_bytes:
+            names = (name for name in self._entries if name != keep)
+            if self.eviction == "lfu":
+                # Least recently used first, so ties go to the older entry
+                name = min(names, key=lambda name: self._entries[name][1], default=None)
+            else:
+                name = next(names, None)
+            if name is None:
+                break
+
+            log.debug(f"Evicting cached speech {name}")
+            self._remove(name)
+
+    def _add(self, name: str):
+        size = self._get_entry_size(name)
+        with self._lock:
+            self._load()
+            if name in self._entries:
+                self._size -= self._entries[name][0]
+            self._entries[name] = [size, 0]
+            self._entries.move_to_end(name)
+            self._size += size
+            # Not the new entry, whose path is about to be returned
+            self._evict(keep=name)
+
+    def _download(self, name: str) -> bool:
+        file_path, _ = self.get_paths(name)
+        try:
+            local_path = Storage.get_file(Storage.get_file_path(f"speech-{name}.mp3"))
+            shutil.move(local_path, file_path)
+        except Exception:
+            return False
+
+        self._add(name)
+        return True
+
+    def _upload(self, name: str):
+        file_path, _ = self.get_paths(name)
+        filename = f"speech-{name}.mp3"
+        try:
+            with open(file_path, "rb") as f:
+                _, storage_path = Storage.upload_file(f, filename, {})
+            # Remote providers leave a local copy in the upload directory
+            local_path = LocalStorageProvider.get_file_path(filename)
+            if local_path != storage_path and os.path.isfile(local_path):
+                os.remove(local_path)
+        except Exception as e:
+            log.warning(f"Error uploading cached speech {name}: {e}")
+
+    def get(self, name: str) -> Optional[Path]:
+        file_path, _ = self.get_paths(name)
+        with self._lock:
+            self._load()
+            entry = self._entries.get(name)
+            if entry is not None:
+                if file_path.is_file():
+                    entry[1] += 1
+                    self._entries.move_to_end(name)
+                    return file_path
+
+                # Removed by another worker
+                self._size -= entry[0]
+                del self._entries[name]
+
+        if file_path.is_file():
+            # Written by another worker sharing the directory
+            self._add(name)
+            return file_path
+
+        if self.shared and self._download(name):
+            return file_path
+        return None
+
+    def add(self, name: str):
+        """Index an entry after its files have been written."""
+        self._add(name)
+        if self.shared:
+            self._upload(name)
+
+    async def get_or_create(
+        self, name: str, create: Callable[[Path, Path], Awaitable]
+    ) -> Path:
+        """
+        Cached speech for name, or the result of create(file_path, body_path),
+        which writes both files. Concurrent calls for a missing entry wait for
+        the first one instead of calling create again.
+        """
+        file_path = await asyncio.to_thread(self.get, name)
+        if file_path is not None:
+            return file_path
+
+        if name in self._pending:
+            return await asyncio.shield(self._pending[name])
+
+        future = asyncio.get_running_loop().create_future()
+        # Waiters see the error; don't warn when there are none
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._pending[name] = future
+        try:
+            file_path, body_path = self.get_paths(name)
+            await create(file_path, body_path)
+            await asyncio.to_thread(self.add, name)
+            future.set_result(file_path)
+            return file_path
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._pending.pop(name, None)
+
+
+SPEECH_CACHE = SpeechCache(
+    SPEECH_CACHE_DIR,
+    max_bytes=AUDIO_TTS_CACHE_MAX_BYTES,
+    eviction=AUDIO_TTS_CACHE_EVICTION,
+    shared=AUDIO_TTS_CACHE_SHARED,
+)
@@ -6,6 +6,8 @@ import aiohttp
 import asyncio
 import yaml
 import json
+import hashlib
+import time
 
 from pydantic import BaseModel
 from pydantic.fields import FieldInfo
@@ -17,7 +19,6 @@ from typing import (
     get_args,
     get_origin,
     Dict,
-    List,
     Tuple,
     Union,
     Optional,
@@ -35,11 +36,15 @@ from langchain_core.utils.function_calling import (
 
 
 from open_webui.utils.misc import is_string_allowed
-from open_webui.models.tools import Tools
+from open_webui.models.tools import ToolModel, Tools
 from open_webui.models.users import UserModel
 from open_webui.models.groups import Groups
-from open_webui.utils.plugin import load_tool_module_by_id
+from open_webui.utils.plugin import (
+    get_tool_module_from_cache,
+    is_plugin_cache_authoritative,
+)
 from open_webui.utils.access_control import has_access
+from open_webui.utils.session_pool import client_session
 from open_webui.config import BYPASS_ADMIN_ACCESS_CONTROL
 from open_webui.env import (
     AIOHTTP_CLIENT_TIMEOUT,
@@ -148,17 +153,127 @@ def has_tool_server_access(
     return has_access(user.id, "read", access_control, user_group_ids)
 
 
+class ResolvedTool:
+    """
+    A local tool with its module loaded, its specs normalized for the model
+    API and its valves bound. Cached in app.state.RESOLVED_TOOLS until the
+    tool, its valves or its access control change.
+    """
+
+    def __init__(self, tool: ToolModel, module, valves: Optional[dict]):
+        self.id = tool.id
+        self.user_id = tool.user_id
+        self.access_control = tool.access_control
+        self.updated_at = tool.updated_at
+        self.module = module
+
+        self.valves = None
+        if hasattr(module, "valves") and hasattr(module, "Valves"):
+            self.valves = module.Valves(**(valves or {}))
+        # user_id -> (valves, UserValves)
+        self._user_valves = {}
+
+        self.metadata = {
+            "file_handler": hasattr(module, "file_handler") and module.file_handler,
+            "citation": hasattr(module, "citation") and module.citation,
+        }
+
+        # (function_name, function, spec)
+        self.functions = []
+        for spec in copy.deepcopy(tool.specs):
+            # TODO: Fix hack for OpenAI API
+            # Some times breaks OpenAI but others don't. Leaving the comment
+            for val in spec.get("parameters", {}).get("properties", {}).values():
+                if val.get("type") == "str":
+                    val["type"] = "string"
+
+            # Remove internal reserved parameters (e.g. __id__, __user__)
+            spec["parameters"]["properties"] = {
+                key: val
+                for key, val in spec["parameters"]["properties"].items()
+                if not key.startswith("__")
+            }
+
+            function_name = spec["name"]
+            function = getattr(module, function_name)
+
+            # TODO: Support Pydantic models as parameters
+            if function.__doc__ and function.__doc__.strip() != "":
+                s = re.split(":(param|return)", function.__doc__, 1)
+                spec["description"] = s[0]
+            else:
+                spec["description"] = function_name
+
+            self.functions.append((function_name, function, spec))
+
+    def get_user_valves(self, user_id: str, valves: dict):
+        cached = self._user_valves.get(user_id)
+        if cached is None or cached[0] != valves:
+            if len(self._user_valves) >= RESOLVED_TOOL_USER_VALVES_SIZE:
+                self._user_valves.clear()
+            cached = (valves, self.module.UserValves(**valves))
+            self._user_valves[user_id] = cached
+        return cached[1]
+
+
+RESOLVED_TOOL_USER_VALVES_SIZE = 1000
+
+
+def get_resolved_tools(
+    request: Request, tool_ids: list[str]
+) -> dict[str, ResolvedTool]:
+    RESOLVED_TOOLS = request.app.state.RESOLVED_TOOLS
+
+    tool_ids = [
+        tool_id
+        for tool_id in dict.fromkeys(tool_ids)
+        if not tool_id.startswith("server:")
+    ]
+
+    if tool_ids and not is_plugin_cache_authoritative(request):
+        # Changes on other workers don't clear this cache, check for them here
+        updated_at = Tools.get_tool_updated_at_by_ids(tool_ids)
+        for tool_id in tool_ids:
+            resolved_tool = RESOLVED_TOOLS.get(tool_id)
+            if resolved_tool and resolved_tool.updated_at != updated_at.get(tool_id):
+                del RESOLVED_TOOLS[tool_id]
+
+    for tool_id in tool_ids:
+        if tool_id in RESOLVED_TOOLS:
+            continue
+
+        tool = Tools.get_tool_by_id(tool_id)
+        if tool:
+            module, _ = get_tool_module_from_cache(request, tool_id)
+            RESOLVED_TOOLS[tool_id] = ResolvedTool(
+                tool, module, Tools.get_tool_valves_by_id(tool_id)
+            )
+
+    return {
+        tool_id: RESOLVED_TOOLS[tool_id]
+        for tool_id in tool_ids
+        if tool_id in RESOLVED_TOOLS
+    }
+
+
 async def get_tools(
     request: Request, tool_ids: list[str], user: UserModel, extra_params: dict
 ) -> dict[str, dict]:
     """Load tools for the given tool_ids, checking access control."""
+    from open_webui.utils.models import MODEL_ACCESS_INDEX
+
     tools_dict = {}
 
     # Get user's group memberships for access control checks
-    user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+    user_group_ids = MODEL_ACCESS_INDEX.get_user_group_ids(user.id)
+
+    resolved_tools = get_resolved_tools(request, tool_ids)
+    user_tool_valves = (
+        (user.settings.model_dump() if user.settings else {}).get("tools") or {}
+    ).get("valves") or {}
 
     for tool_id in tool_ids:
-        tool = Tools.get_tool_by_id(tool_id)
+        tool = resolved_tools.get(tool_id)
         if tool:
             # Check access control for local tools
             if (
@@ -169,41 +284,22 @@ async def get_tools(
                 log.warning(f"Access denied to tool {tool_id} for user {user.id}")
                 continue
 
-            module = request.app.state.TOOLS.get(tool_id, None)
-            if module is None:
-                module, _ = load_tool_module_by_id(tool_id)
-                request.app.state.TOOLS[tool_id] = module
+            module = tool.module
 
             __user__ = {
                 **extra_params["__user__"],
             }
 
             # Set valves for the tool
-            if hasattr(module, "valves") and hasattr(module, "Valves"):
-                valves = Tools.get_tool_valves_by_id(tool_id) or {}
-                module.valves = module.Valves(**valves)
+            if tool.valves is not None:
+                module.valves = tool.valves
             if hasattr(module, "UserValves"):
-                __user__["valves"] = module.UserValves(  # type: ignore
-                    **Tools.get_user_valves_by_id_and_user_id(tool_id, user.id)
+                __user__["valves"] = tool.get_user_valves(  # type: ignore
+                    user.id, user_tool_valves.get(tool_id) or {}
                 )
 
-            for spec in tool.specs:
-                # TODO: Fix hack for OpenAI API
-                # Some times breaks OpenAI but others don't. Leaving the comment
-                for val in spec.get("parameters", {}).get("properties", {}).values():
-                    if val.get("type") == "str":
-                        val["type"] = "string"
-
-                # Remove internal reserved parameters (e.g. __id__, __user__)
-                spec["parameters"]["properties"] = {
-                    key: val
-                    for key, val in spec["parameters"]["properties"].items()
-                    if not key.startswith("__")
-                }
-
+            for function_name, tool_function, spec in tool.functions:
                 # convert to function that takes only model params and inserts custom params
-                function_name = spec["name"]
-                tool_function = getattr(module, function_name)
                 callable = get_async_tool_function_and_apply_extra_params(
                     tool_function,
                     {
@@ -213,23 +309,12 @@ async def get_tools(
                     },
                 )
 
-                # TODO: Support Pydantic models as parameters
-                if callable.__doc__ and callable.__doc__.strip() != "":
-                    s = re.split(":(param|return)", callable.__doc__, 1)
-                    spec["description"] = s[0]
-                else:
-                    spec["description"] = function_name
-
                 tool_dict = {
                     "tool_id": tool_id,
                     "callable": callable,
                     "spec": spec,
                     # Misc info
-                    "metadata": {
-                        "file_handler": hasattr(module, "file_handler")
-                        and module.file_handler,
-                        "citation": hasattr(module, "citation") and module.citation,
-                    },
+                    "metadata": tool.metadata,
                 }
 
                 # Handle function name collisions
@@ -730,35 +815,24 @@ def convert_openapi_to_tool_payload(openapi_spec):
     return tool_payload
 
 
-async def set_tool_servers(request: Request):
-    request.app.state.TOOL_SERVERS = await get_tool_servers_data(
-        request.app.state.config.TOOL_SERVER_CONNECTIONS
-    )
-
-    if request.app.state.redis is not None:
-        await request.app.state.redis.set(
-            "tool_servers", json.dumps(request.app.state.TOOL_SERVERS)
-        )
-
-    return request.app.state.TOOL_SERVERS
-
-
-async def get_tool_servers(request: Request):
-    tool_servers = []
-    if request.app.state.redis is not None:
-        try:
-            tool_servers = json.loads(await request.app.state.redis.get("tool_servers"))
-            request.app.state.TOOL_SERVERS = tool_servers
-        except Exception as e:
-            log.error(f"Error fetching tool_servers from Redis: {e}")
-
-    if not tool_servers:
-        tool_servers = await set_tool_servers(request)
-
-    return tool_servers
+def parse_tool_server_spec(text: str) -> dict:
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return yaml.safe_load(text)
 
 
-async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, Any]:
+async def fetch_tool_server_spec(
+    url: str,
+    headers: Optional[dict],
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+) -> Tuple[Optional[str], dict]:
+    """
+    Fetch the raw OpenAPI spec at url along with its ETag/Last-Modified
+    validators. Returns None instead of the spec when the server confirms that
+    the spec with the given validators is unchanged.
+    """
     _headers = {
         "Accept": "application/json",
         "Content-Type": "application/json",
@@ -767,34 +841,39 @@ async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, A
     if headers:
         _headers.update(headers)
 
-    error = None
-    try:
-        timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA)
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            async with session.get(
-                url, headers=_headers, ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL
-            ) as response:
-                if response.status != 200:
-                    error_body = await response.json()
-                    raise Exception(error_body)
-
-                text_content = None
-
-                # Check if URL ends with .yaml or .yml to determine format
-                if url.lower().endswith((".yaml", ".yml")):
-                    text_content = await response.text()
-                    res = yaml.safe_load(text_content)
-                else:
-                    text_content = await response.text()
+    if etag:
+        _headers["If-None-Match"] = etag
+    if last_modified:
+        _headers["If-Modified-Since"] = last_modified
+
+    timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA)
+    async with client_session(url) as session:
+        async with session.get(
+            url,
+            headers=_headers,
+            ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
+            timeout=timeout,
+        ) as response:
+            validators = {
+                "etag": response.headers.get("ETag", etag),
+                "last_modified": response.headers.get("Last-Modified", last_modified),
+            }
 
-                try:
-                    res = json.loads(text_content)
-                except json.JSONDecodeError:
-                    try:
-                        res = yaml.safe_load(text_content)
-                    except Exception as e:
-                        raise e
+            if response.status == 304:
+                return None, validators
 
+            if response.status != 200:
+                error_body = await response.json()
+                raise Exception(error_body)
+
+            return await response.text(), validators
+
+
+async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, Any]:
+    error = None
+    try:
+        text_content, _ = await fetch_tool_server_spec(url, headers)
+        res = await asyncio.to_thread(parse_tool_server_spec, text_content)
     except Exception as err:
         log.exception(f"Could not fetch tool server spec from {url}")
         if isinstance(err, dict) and "detail" in err:
@@ -807,101 +886,225 @@ async def get_tool_server_data(url: str, headers: Optional[dict]) -> Dict[str, A
     return res
 
 
-async def get_tool_servers_data(servers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    # Prepare list of enabled servers along with their original index
+def get_tool_server_source(server: dict) -> Optional[dict]:
+    """Where the spec of an enabled OpenAPI tool server is loaded from, if any."""
+    if not (
+        server.get("config", {}).get("enable")
+        and server.get("type", "openapi") == "openapi"
+    ):
+        return None
+
+    auth_type = server.get("auth_type", "bearer")
+    token = None
+
+    if auth_type == "bearer":
+        token = server.get("key", "")
+    elif auth_type == "none":
+        # No authentication
+        pass
+
+    spec_type = server.get("spec_type", "url")
+    if spec_type == "url":
+        # Path (to OpenAPI spec URL) can be either a full URL or a path to append to the base URL
+        openapi_path = server.get("path", "openapi.json")
+        return {
+            "url": get_tool_server_url(server.get("url"), openapi_path),
+            "headers": {"Authorization": f"Bearer {token}"} if token else None,
+        }
+    elif spec_type == "json" and server.get("spec", ""):
+        # Use provided JSON spec
+        return {"spec": server.get("spec", "")}
 
-    tasks = []
-    server_entries = []
-    for idx, server in enumerate(servers):
-        if (
-            server.get("config", {}).get("enable")
-            and server.get("type", "openapi") == "openapi"
-        ):
-            info = server.get("info", {})
+    return None
 
-            auth_type = server.get("auth_type", "bearer")
-            token = None
-
-            if auth_type == "bearer":
-                token = server.get("key", "")
-            elif auth_type == "none":
-                # No authentication
-                pass
-
-            id = info.get("id")
-            if not id:
-                id = str(idx)
-
-            server_url = server.get("url")
-            spec_type = server.get("spec_type", "url")
-
-            # Create async tasks to fetch data
-            task = None
-            if spec_type == "url":
-                # Path (to OpenAPI spec URL) can be either a full URL or a path to append to the base URL
-                openapi_path = server.get("path", "openapi.json")
-                spec_url = get_tool_server_url(server_url, openapi_path)
-                # Fetch from URL
-                task = get_tool_server_data(
-                    spec_url,
-                    {"Authorization": f"Bearer {token}"} if token else None,
-                )
-            elif spec_type == "json" and server.get("spec", ""):
-                # Use provided JSON spec
-                spec_json = None
-                try:
-                    spec_json = json.loads(server.get("spec", ""))
-                except Exception as e:
-                    log.error(f"Error parsing JSON spec for tool server {id}: {e}")
-
-                if spec_json:
-                    task = asyncio.sleep(
-                        0,
-                        result=spec_json,
-                    )
 
-            if task:
-                tasks.append(task)
-                server_entries.append((id, idx, server, server_url, info, token))
+class ToolServerSpecRegistry:
+    """
+    OpenAPI tool server specs and their converted tool payloads, kept in
+    memory per spec source (URL and credentials, or inline JSON spec).
+
+    Specs are fetched and converted in the background and revalidated with
+    their ETag/Last-Modified once older than refresh_interval. Readers only
+    get what is already loaded, so a slow or unreachable server never delays
+    them; a server that fails to refresh keeps serving its last good spec.
+    A spec that was never loaded is retried sooner, backing off from
+    retry_interval up to max_retry_interval.
+    """
 
-    # Execute tasks concurrently
-    responses = await asyncio.gather(*tasks, return_exceptions=True)
+    def __init__(
+        self,
+        refresh_interval: int = 300,
+        retry_interval: int = 5,
+        max_retry_interval: int = 30,
+    ):
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+
+        # key -> {"openapi", "specs", "etag", "last_modified", "checked_at"}
+        self._entries = {}
+        # key -> (time of the last failed load, failures in a row) of a spec
+        # that was never loaded
+        self._failures = {}
+        self._pending: dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def _get_key(source: dict) -> str:
+        return hashlib.sha256(json.dumps(source, sort_keys=True).encode()).hexdigest()
+
+    def _get_sources(self, servers: list[dict]) -> list[tuple]:
+        sources = []
+        for idx, server in enumerate(servers):
+            source = get_tool_server_source(server)
+            if source:
+                sources.append((idx, server, self._get_key(source), source))
+        return sources
+
+    def _is_stale(self, key: str, now: float) -> bool:
+        entry = self._entries.get(key)
+        if entry:
+            return now - entry["checked_at"] >= self.refresh_interval
+
+        failure = self._failures.get(key)
+        if failure is None:
+            return True
+
+        failed_at, failures = failure
+        retry_interval = min(
+            self.retry_interval * 2 ** (failures - 1), self.max_retry_interval
+        )
+        return now - failed_at >= retry_interval
 
-    # Build final results with index and server metadata
-    results = []
-    for (id, idx, server, url, info, _), response in zip(server_entries, responses):
-        if isinstance(response, Exception):
-            log.error(f"Failed to connect to {url} OpenAPI tool server")
-            continue
+    async def _load(self, key: str, source: dict):
+        entry = self._entries.get(key)
+        try:
+            if "url" in source:
+                text_content, validators = await fetch_tool_server_spec(
+                    source["url"],
+                    source["headers"],
+                    **(
+                        {
+                            "etag": entry["etag"],
+                            "last_modified": entry["last_modified"],
+                        }
+                        if entry
+                        else {}
+                    ),
+                )
+                if text_content is None and entry is not None:
+                    entry["checked_at"] = time.time()
+                    return
+
+                openapi = await asyncio.to_thread(parse_tool_server_spec, text_content)
+            else:
+                validators = {"etag": None, "last_modified": None}
+                openapi = await asyncio.to_thread(json.loads, source["spec"])
 
-        response = {
-            "openapi": response,
-            "info": response.get("info", {}),
-            "specs": convert_openapi_to_tool_payload(response),
+            # Large specs take a while to convert, keep it off the event loop
+            specs = await asyncio.to_thread(convert_openapi_to_tool_payload, openapi)
+        except Exception as e:
+            log.error(
+                f"Failed to load OpenAPI tool server spec from {source.get('url', 'JSON spec')}: {e}"
+            )
+            if entry:
+                entry["checked_at"] = time.time()
+            else:
+                _, failures = self._failures.get(key, (None, 0))
+                self._failures[key] = (time.time(), failures + 1)
+            return
+
+        self._failures.pop(key, None)
+        self._entries[key] = {
+            "openapi": openapi,
+            "specs": specs,
+            **validators,
+            "checked_at": time.time(),
         }
 
-        openapi_data = response.get("openapi", {})
-        if info and isinstance(openapi_data, dict):
-            openapi_data["info"] = openapi_data.get("info", {})
+    def _schedule(self, key: str, source: dict) -> asyncio.Task:
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, source))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return task
+
+    def _get_servers(self, sources: list[tuple]) -> list[dict]:
+        # Drop specs of servers that were removed or reconfigured
+        keys = {key for _, _, key, _ in sources}
+        for key in set(self._entries) - keys:
+            del self._entries[key]
+        for key in set(self._failures) - keys:
+            del self._failures[key]
+
+        results = []
+        for idx, server, key, _ in sources:
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
 
-            if "name" in info:
-                openapi_data["info"]["title"] = info.get("name", "Tool Server")
+            info = server.get("info", {})
+            openapi_data = entry["openapi"]
+            if info and isinstance(openapi_data, dict):
+                openapi_data = {
+                    **openapi_data,
+                    "info": {**openapi_data.get("info", {})},
+                }
 
-            if "description" in info:
-                openapi_data["info"]["description"] = info.get("description", "")
+                if "name" in info:
+                    openapi_data["info"]["title"] = info.get("name", "Tool Server")
 
-        results.append(
-            {
-                "id": str(id),
-                "idx": idx,
-                "url": server.get("url"),
-                "openapi": openapi_data,
-                "info": response.get("info"),
-                "specs": response.get("specs"),
-            }
+                if "description" in info:
+                    openapi_data["info"]["description"] = info.get("description", "")
+
+            results.append(
+                {
+                    "id": str(info.get("id") or idx),
+                    "idx": idx,
+                    "url": server.get("url"),
+                    "openapi": openapi_data,
+                    "info": openapi_data.get("info", {}),
+                    "specs": entry["specs"],
+                }
+            )
+
+        return results
+
+    def get_servers(self, servers: list[dict]) -> list[dict]:
+        """
+        The enabled OpenAPI servers whose specs are loaded, without waiting.
+        Missing and stale specs are loaded in the background.
+        """
+        sources = self._get_sources(servers)
+
+        now = time.time()
+        for _, _, key, source in sources:
+            if self._is_stale(key, now):
+                self._schedule(key, source)
+
+        return self._get_servers(sources)
+
+    async def refresh(self, servers: list[dict]) -> list[dict]:
+        """Revalidate the specs of all enabled OpenAPI servers and wait for them."""
+        sources = self._get_sources(servers)
+        await asyncio.gather(
+            *[self._schedule(key, source) for _, _, key, source in sources]
         )
+        return self._get_servers(sources)
 
-    return results
+
+async def set_tool_servers(request: Request):
+    request.app.state.TOOL_SERVERS = await request.app.state.TOOL_SERVER_SPECS.refresh(
+        request.app.state.config.TOOL_SERVER_CONNECTIONS
+    )
+    return request.app.state.TOOL_SERVERS
+
+
+async def get_tool_servers(request: Request):
+    request.app.state.TOOL_SERVERS = request.app.state.TOOL_SERVER_SPECS.get_servers(
+        request.app.state.config.TOOL_SERVER_CONNECTIONS
+    )
+    return request.app.state.TOOL_SERVERS
 
 
 async def execute_tool_server(
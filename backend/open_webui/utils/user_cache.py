@@ -0,0 +1,227 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional
+
+from open_webui.env import (
+    AUTH_USER_CACHE_SIZE,
+    AUTH_USER_CACHE_TTL,
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL,
+    REDIS_CLUSTER,
+    REDIS_KEY_PREFIX,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    REDIS_URL,
+    UVICORN_WORKERS,
+)
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
+
+USER_CACHE_UPDATES_CHANNEL = f"{REDIS_KEY_PREFIX}:users:invalidate"
+
+# Identifies this worker so it can ignore its own invalidation messages
+USER_CACHE_INSTANCE_ID = str(uuid.uuid4())
+
+
+class UserCache:
+    """
+    Bounded LRU cache of users resolved during authentication, the users behind
+    API keys and permission checks. Entries expire after ttl seconds and are
+    evicted through invalidate_user_cache() when users, API keys or groups
+    change.
+    """
+
+    def __init__(self, ttl: float = 30.0, maxsize: int = 10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        # Without invalidation messages other workers would keep stale entries
+        self.enabled = (
+            ttl > 0 and maxsize > 0 and (bool(REDIS_URL) or UVICORN_WORKERS == 1)
+        )
+
+        self._users = OrderedDict()
+        self._api_keys = OrderedDict()
+        self._permissions = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Take before loading from the database and pass to the set methods."""
+        return self._generation
+
+    def _get(self, entries: OrderedDict, key) -> Any:
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del entries[key]
+                return None
+
+            entries.move_to_end(key)
+            return value
+
+    def _set(self, entries: OrderedDict, key, value, generation: int):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            # Skip values loaded before an invalidation, they may be stale
+            if generation != self._generation:
+                return
+
+            entries[key] = (time.monotonic() + self.ttl, value)
+            entries.move_to_end(key)
+            while len(entries) > self.maxsize:
+                entries.popitem(last=False)
+
+    def get_user(self, user_id: str):
+        user = self._get(self._users, user_id)
+        # Callers may modify the user they get back
+        return user.model_copy(deep=True) if user is not None else None
+
+    def set_user(self, user, generation: int):
+        self._set(self._users, user.id, user.model_copy(deep=True), generation)
+
+    def get_user_id_by_api_key(self, api_key: str) -> Optional[str]:
+        return self._get(self._api_keys, api_key)
+
+    def set_api_key(self, api_key: str, user_id: str, generation: int):
+        self._set(self._api_keys, api_key, user_id, generation)
+
+    def get_permission(self, user_id: str, permission_key: str) -> Optional[bool]:
+        return self._get(self._permissions, (user_id, permission_key))
+
+    def set_permission(
+        self, user_id: str, permission_key: str, value: bool, generation: int
+    ):
+        self._set(self._permissions, (user_id, permission_key), value, generation)
+
+    def clear(self, user_id: Optional[str] = None):
+        """Evict one user, including their API keys and permissions, or everything."""
+        with self._lock:
+            self._generation += 1
+
+            if user_id is None:
+                self._users.clear()
+                self._api_keys.clear()
+                self._permissions.clear()
+                return
+
+            self._users.pop(user_id, None)
+            for api_key, (_, key_user_id) in list(self._api_keys.items()):
+                if key_user_id == user_id:
+                    del self._api_keys[api_key]
+            for key in [key for key in self._permissions if key[0] == user_id]:
+                del self._permissions[key]
+
+
+USER_CACHE = UserCache(ttl=AUTH_USER_CACHE_TTL, maxsize=AUTH_USER_CACHE_SIZE)
+
+
+def invalidate_user_cache(user_id: Optional[str] = None):
+    """
+    Evict a user from the cache on every worker after their role, profile, API
+    key or groups change. Without a user id everything is evicted, e.g. after
+    group permissions or default permissions change.
+    """
+    USER_CACHE.clear(user_id)
+
+    if not REDIS_URL:
+        return
+
+    try:
+        redis = get_redis_connection(
+            REDIS_URL,
+            get_sentinels_from_env(REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT),
+            redis_cluster=REDIS_CLUSTER,
+        )
+        redis.publish(
+            USER_CACHE_UPDATES_CHANNEL,
+            json.dumps({"instance_id": USER_CACHE_INSTANCE_ID, "user_id": user_id}),
+        )
+    except Exception as e:
+        log.warning(f"Failed to publish user cache invalidation: {e}")
+
+
+async def redis_user_cache_listener(app):
+    pubsub = app.state.redis.pubsub()
+    await pubsub.subscribe(USER_CACHE_UPDATES_CHANNEL)
+
+    async for message in pubsub.listen():
+        if message["type"] != "message":
+            continue
+        try:
+            update = json.loads(message["data"])
+            if update.get("instance_id") != USER_CACHE_INSTANCE_ID:
+                USER_CACHE.clear(update.get("user_id"))
+        except Exception as e:
+            log.exception(f"Error handling user cache invalidation: {e}")
+
+
+class UserActivityBuffer:
+    """
+    Collects last active timestamps in memory and writes them with a single
+    update per flush instead of one write per authenticated request.
+    """
+
+    def __init__(self, flush_interval: float = 10.0):
+        self.flush_interval = flush_interval
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def add(self, user_id: str):
+        from open_webui.models.users import Users
+
+        if self.flush_interval <= 0:
+            Users.update_last_active_by_id(user_id)
+            return
+
+        with self._lock:
+            self._pending[user_id] = int(time.time())
+
+    def flush(self):
+        from open_webui.models.users import Users
+
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+
+        if not pending:
+            return
+
+        # One update per distinct timestamp, so no user is marked active later
+        # than they were
+        user_ids_by_timestamp = {}
+        for user_id, timestamp in pending.items():
+            user_ids_by_timestamp.setdefault(timestamp, []).append(user_id)
+
+        try:
+            for timestamp, user_ids in user_ids_by_timestamp.items():
+                Users.update_last_active_by_ids(user_ids, timestamp)
+        except Exception as e:
+            log.exception(f"Error writing last active timestamps: {e}")
+
+    async def run(self):
+        if self.flush_interval <= 0:
+            return
+
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await asyncio.to_thread(self.flush)
+
+
+USER_ACTIVITY_BUFFER = UserActivityBuffer(
+    flush_interval=DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL
+)